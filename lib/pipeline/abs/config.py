@@ -4,7 +4,7 @@ from typing import Callable, Dict, List, Self, Tuple, Iterator, Literal, Optiona
 
 from lib.service.database import DatabaseConfig
 from lib.service.static_environment.config import Target
-from lib.utility.df import FieldFormat
+from lib.utility.df import FieldFormat, GeometryEncoding
 
 @dataclass
 class AbsIngestionConfig:
@@ -25,6 +25,7 @@ class AbsWorkerConfig:
     db_connections: int
     enable_logging: bool
     enable_logging_debug: bool
+    geometry_encoding: GeometryEncoding = 'wkt'
 
 @dataclass
 class FieldTransform:
@@ -6,7 +6,7 @@ from typing import List, Self, Type
 import pandas as pd
 
 from lib.service.database import *
-from lib.utility.df import prepare_postgis_insert
+from lib.utility.df import GeometryEncoding, prepare_postgis_insert
 
 from .config import AbsIngestionConfig, AbsWorkerConfig, WorkerArgs, IngestionSource
 from .constants import SCHEMA, GDA2020_CRS
@@ -55,12 +55,15 @@ class AbsIngestionWorker:
     _db: DatabaseService
     _logger = logging.getLogger(f'{__name__}.AbsIngestionWorker')
     root_dir: str
+    geometry_encoding: GeometryEncoding
 
     def __init__(self: Self,
                  db: DatabaseService,
-                 root_dir: str):
+                 root_dir: str,
+                 geometry_encoding: GeometryEncoding = 'wkt'):
         self._db = db
         self.root_dir = root_dir
+        self.geometry_encoding = geometry_encoding
 
     async def consume(self: Self, layer_name: str, source: IngestionSource) -> None:
         table_columns = source.database_column_names_for_dataframe_columns[layer_name]
@@ -83,6 +86,7 @@ class AbsIngestionWorker:
                 c.column_name: c.column_type
                 for c in table_columns.values()
             },
+            geometry_encoding=self.geometry_encoding,
         )
 
         self._logger.debug(f'writing {layer_name}')
@@ -113,7 +117,7 @@ class AbsIngestionWorker:
 
         async def start():
             db = DatabaseServiceImpl.create(worker_c.db_config, worker_c.db_connections)
-            worker = AbsIngestionWorker(db, args.source_root_dir)
+            worker = AbsIngestionWorker(db, args.source_root_dir, worker_c.geometry_encoding)
             try:
                 await db.open()
                 async with asyncio.TaskGroup() as tg:
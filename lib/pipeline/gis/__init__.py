@@ -1,4 +1,5 @@
 from .defaults import *
+from .checkpoint import GisCheckpoint
 from .feature_server_client import FeatureServerClient, FeatureExpBackoff
 from .feature_pagination_sharding import FeaturePaginationSharderFactory
 from .ingestion import GisIngestion, GisIngestionConfig, GisWorkerDbMode
@@ -8,7 +9,9 @@ from .telemetry import GisPipelineTelemetry
 from .cache_cleaner import AbstractCacheCleaner, CacheCleaner, DisabledCacheCleaner
 from .config import (
     FeaturePageDescription,
+    FeatureShardDescription,
     GisSchema,
     GisProjection,
     SchemaField,
+    ShardStrategy,
 )
@@ -27,4 +27,5 @@ def get_page_url_params(
 def get_count_url_params(where_clause: Optional[str]) -> UrlParams:
     return { 'where': where_clause or '1=1', 'returnCountOnly': True, 'f': 'json' }
 
-
+def get_ids_url_params(where_clause: Optional[str]) -> UrlParams:
+    return { 'where': where_clause or '1=1', 'returnIdsOnly': True, 'f': 'json' }
@@ -0,0 +1,122 @@
+import asyncio
+from logging import getLogger
+import json
+from typing import Any, Dict, List, Self, Set, Tuple
+
+from lib.service.io import IoService
+
+from .config import GisProjection, FeaturePageDescription, FeatureShardDescription
+
+_PageKey = Tuple[str, str, int, int]
+
+class GisCheckpoint:
+    """
+    Records the progress of a GIS scrape to an append only
+    file, so a scrape that dies part way through can pick up
+    where it left off. Two things are recorded:
+
+      1. The shards found by the `RequestSharder`. Once all
+         shards for a projection have been found, a restart
+         can replay them without any count queries. Each pass
+         starts with a `shard_start` record, which discards the
+         shards of any earlier pass that didn't finish, as they
+         are found again by the new pass.
+      2. Each page once it's been saved, so a restart can
+         skip refetching & reinserting it.
+    """
+    _logger = getLogger(f'{__name__}.GisCheckpoint')
+
+    def __init__(self: Self, io: IoService, path: str):
+        self._io = io
+        self._path = path
+        self._lock = asyncio.Lock()
+        self._pages: Set[_PageKey] = set()
+        self._shards: Dict[Tuple[str, str], List[FeatureShardDescription]] = {}
+        self._sharded: Set[Tuple[str, str]] = set()
+
+    async def load(self: Self) -> None:
+        if not await self._io.f_exists(self._path):
+            return
+
+        async for line in self._io.f_read_lines(self._path):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                self._logger.warning(f'skipping malformed checkpoint record in {self._path}')
+                continue
+
+            match record['op']:
+                case 'page':
+                    self._pages.add((record['projection'], record['where'],
+                                     record['offset'], record['expected']))
+                case 'shard_start':
+                    key = (record['projection'], record['params'])
+                    self._shards[key] = []
+                    self._sharded.discard(key)
+                case 'shard':
+                    key = (record['projection'], record['params'])
+                    shard = FeatureShardDescription(record['where'], record['count'], record['use_cache'])
+                    self._shards.setdefault(key, []).append(shard)
+                case 'sharded':
+                    self._sharded.add((record['projection'], record['params']))
+                case other:
+                    raise ValueError(f'unknown checkpoint op {other}')
+
+        self._logger.info(f'loaded checkpoint with {len(self._pages)} saved pages')
+
+    async def reset(self: Self) -> None:
+        self._pages, self._shards, self._sharded = set(), {}, set()
+        await self._io.f_write(self._path, '')
+
+    def is_page_saved(self: Self, proj: GisProjection, page: FeaturePageDescription) -> bool:
+        return _page_key(proj, page) in self._pages
+
+    def get_shards(self: Self, proj: GisProjection, params_key: str) -> List[FeatureShardDescription] | None:
+        """
+        Returns the shards for these params if they were all
+        found in an earlier run, otherwise None.
+        """
+        key = (proj.id, params_key)
+        if key not in self._sharded:
+            return None
+        return self._shards.get(key, [])
+
+    async def record_page(self: Self, proj: GisProjection, page: FeaturePageDescription) -> None:
+        self._pages.add(_page_key(proj, page))
+        await self._append({
+            'op': 'page',
+            'projection': proj.id,
+            'where': page.where_clause,
+            'offset': page.offset,
+            'expected': page.expected_results,
+        })
+
+    async def record_shard_start(self: Self, proj: GisProjection, params_key: str) -> None:
+        key = (proj.id, params_key)
+        self._shards[key] = []
+        self._sharded.discard(key)
+        await self._append({ 'op': 'shard_start', 'projection': proj.id, 'params': params_key })
+
+    async def record_shard(self: Self, proj: GisProjection, params_key: str, shard: FeatureShardDescription) -> None:
+        self._shards.setdefault((proj.id, params_key), []).append(shard)
+        await self._append({
+            'op': 'shard',
+            'projection': proj.id,
+            'params': params_key,
+            'where': shard.where_clause,
+            'count': shard.count,
+            'use_cache': shard.use_cache,
+        })
+
+    async def record_sharded(self: Self, proj: GisProjection, params_key: str) -> None:
+        self._sharded.add((proj.id, params_key))
+        await self._append({ 'op': 'sharded', 'projection': proj.id, 'params': params_key })
+
+    async def _append(self: Self, record: Dict[str, Any]) -> None:
+        async with self._lock:
+            await self._io.f_append(self._path, json.dumps(record) + '\n')
+
+def _page_key(proj: GisProjection, page: FeaturePageDescription) -> _PageKey:
+    return (proj.id, page.where_clause, page.offset, page.expected_results)
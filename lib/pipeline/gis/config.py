@@ -9,17 +9,36 @@ from .predicate import YearMonth, PredicateFunction
 
 FieldPriority = str | List[str | Tuple[str, int]]
 
+# How the features of a layer are split into pages.
+#
+#   - predicate: recursively splits the layer with the
+#     schema's `shard_scheme`, counting each split.
+#   - object_id: fetches the layer's object ids once and
+#     splits them into ranges of exactly one page each.
+ShardStrategy = Literal['predicate', 'object_id']
+
 class IngestionTaskDescriptor:
     @dataclass(frozen=True)
     class Fetch:
         projection: 'GisProjection'
         page_desc: 'FeaturePageDescription'
 
+    @dataclass(frozen=True)
+    class Parse:
+        projection: 'GisProjection'
+        page_desc: 'FeaturePageDescription'
+        page: List[Any]
+
     @dataclass(frozen=True)
     class Save:
         projection: 'GisProjection'
         page_desc: 'FeaturePageDescription'
         df: gpd.GeoDataFrame
+        """
+        The dataframe & query prepared for insertion, if
+        this was already done while parsing the page.
+        """
+        prepared: Optional[Tuple[Any, str]] = field(default=None)
 
 @dataclass(frozen=True)
 class FeaturePageDescription:
@@ -28,6 +47,16 @@ class FeaturePageDescription:
     expected_results: int
     use_cache: bool
 
+@dataclass(frozen=True)
+class FeatureShardDescription:
+    """
+    A where clause matching few enough features to page
+    through with offsets, and how many features it matches.
+    """
+    where_clause: str
+    count: int
+    use_cache: bool
+
 @dataclass(frozen=True)
 class SchemaField:
     category: str
@@ -49,6 +78,7 @@ class GisSchema:
     fields: List[SchemaField]
     shard_scheme: List[PredicateFunction]
     debug_field: str
+    shard_strategy: ShardStrategy = field(default='predicate')
 
     @property
     def debug_plot_column(self: Self) -> str:
@@ -10,6 +10,6 @@ BACKOFF_CONFIG = BackoffConfig(
 )
 
 HOST_SEMAPHORE_CONFIG = [
-    HostSemaphoreConfig(host=SPATIAL_NSW_HOST, limit=16),
+    HostSemaphoreConfig(host=SPATIAL_NSW_HOST, limit=16, min_limit=4, max_limit=32),
     HostSemaphoreConfig(host=ENVIRONMENT_NSW_HOST, limit=12),
 ]
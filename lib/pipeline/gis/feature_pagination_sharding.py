@@ -3,12 +3,13 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from logging import getLogger
 import random
-from typing import AsyncIterator, List, Optional, Self, Tuple, Sequence
+from typing import AsyncIterator, Iterator, List, Optional, Self, Tuple, Sequence
 
-from lib.pipeline.gis.config import GisProjection, FeaturePageDescription
+from lib.pipeline.gis.config import GisProjection, FeaturePageDescription, FeatureShardDescription
 from lib.pipeline.gis.feature_server_client import FeatureServerClient
 from lib.pipeline.gis.predicate import PredicateFunction, PredicateParam
 
+from .checkpoint import GisCheckpoint
 from .telemetry import GisPipelineTelemetry
 
 class FeaturePaginationSharderFactory:
@@ -17,13 +18,15 @@ class FeaturePaginationSharderFactory:
         feature_server: FeatureServerClient,
         telemetry: GisPipelineTelemetry,
         shuffle: Callable[[List[PredicateParam]], None] = random.shuffle,
+        checkpoint: Optional[GisCheckpoint] = None,
     ) -> None:
         self._feature_server = feature_server
         self._telemetry = telemetry
         self._shuffle = shuffle
+        self._checkpoint = checkpoint
 
     def create(self: Self, proj: GisProjection):
-        return RequestSharder(proj, self._feature_server, self._telemetry, self._shuffle)
+        return RequestSharder(proj, self._feature_server, self._telemetry, self._shuffle, self._checkpoint)
 
 class RequestSharder:
     _logger = getLogger(f'{__name__}')
@@ -32,23 +35,73 @@ class RequestSharder:
                  projection: GisProjection,
                  feature_server: FeatureServerClient,
                  telemetry: GisPipelineTelemetry,
-                 shuffle: Callable[[List[PredicateParam]], None]):
+                 shuffle: Callable[[List[PredicateParam]], None],
+                 checkpoint: Optional[GisCheckpoint] = None):
         self._projection = projection
         self._feature_server = feature_server
         self._telemetry = telemetry
         self._shuffle = shuffle
+        self._checkpoint = checkpoint
 
     async def shard(self: Self, params: Sequence[PredicateParam]) -> AsyncIterator[FeaturePageDescription]:
         shard_scheme = self._projection.schema.shard_scheme
-        async for c in self._recursive_shard(None, shard_scheme, params, use_cache=True):
-            yield c
+        params_key = ';'.join(p.apply(f.field) for p, f in zip(params, shard_scheme))
+
+        if self._checkpoint is not None:
+            if (shards := self._checkpoint.get_shards(self._projection, params_key)) is not None:
+                self._logger.info(f'replaying {len(shards)} checkpointed shards for {self._projection.id}')
+                for shard in shards:
+                    for page in self._shard_pages(shard):
+                        yield page
+                return
+            await self._checkpoint.record_shard_start(self._projection, params_key)
+
+        match self._projection.schema.shard_strategy:
+            case 'predicate':
+                shards_iter = self._recursive_shard(None, shard_scheme, params, use_cache=True)
+            case 'object_id':
+                shards_iter = self._object_id_shard(shard_scheme, params)
+
+        async for shard in shards_iter:
+            if self._checkpoint is not None:
+                await self._checkpoint.record_shard(self._projection, params_key, shard)
+            for page in self._shard_pages(shard):
+                yield page
+
+        if self._checkpoint is not None:
+            await self._checkpoint.record_sharded(self._projection, params_key)
+
+    async def _object_id_shard(self: Self,
+                               shard_functions: Sequence[PredicateFunction],
+                               params: Sequence[PredicateParam]) -> AsyncIterator[FeatureShardDescription]:
+        """
+        Rather than counting our way down to small enough
+        shards, this fetches every object id matching the
+        params in one request and splits the ids into ranges
+        of `result_limit`. As the ids are known, each range is
+        exactly one page and no counts are needed.
+        """
+        limit = self._projection.schema.result_limit
+        clauses = [p.apply(f.field) for p, f in zip(params, shard_functions)]
+        where_clause = _and_clauses(clauses) if clauses else None
+        use_cache = all(p.can_cache() for p in params)
+
+        id_field, ids = await self._feature_server.get_object_ids(
+            projection=self._projection,
+            where_clause=where_clause,
+            use_cache=use_cache,
+        )
+
+        for start in range(0, len(ids), limit):
+            chunk = ids[start:start + limit]
+            query = _and_clauses([*clauses, f'{id_field} >= {chunk[0]} AND {id_field} <= {chunk[-1]}'])
+            yield FeatureShardDescription(query, len(chunk), use_cache)
 
     async def _recursive_shard(self: Self,
                                where_clause: Optional[str],
                                shard_functions: Sequence[PredicateFunction],
                                params: Sequence[PredicateParam],
-                               use_cache: bool) -> AsyncIterator[FeaturePageDescription]:
-        limit = self._projection.schema.result_limit
+                               use_cache: bool) -> AsyncIterator[FeatureShardDescription]:
         depth = self._projection.schema.result_depth
         shard_f, *shard_fs = shard_functions
         shard_p, *shard_ps = params if params else [shard_f.default_param(where_clause)]
@@ -71,15 +124,7 @@ class RequestSharder:
                 if count == 0:
                     continue
                 elif count <= depth:
-                    self._telemetry.init_clause(self._projection, query, count)
-                    for offset in range(0, count, limit):
-                        expected = min(limit, count - offset)
-                        yield FeaturePageDescription(
-                            where_clause=query,
-                            offset=offset,
-                            expected_results=expected,
-                            use_cache=_use_cache,
-                        )
+                    yield FeatureShardDescription(query, count, _use_cache)
                 elif shard.can_shard():
                     shard_count_queue.extend(list(shard.shard()))
                 else:
@@ -93,6 +138,17 @@ class RequestSharder:
             async for p in self._recursive_shard(query, shard_fs, shard_ps, use_cache=_use_cache):
                 yield p
 
+    def _shard_pages(self: Self, shard: FeatureShardDescription) -> Iterator[FeaturePageDescription]:
+        limit = self._projection.schema.result_limit
+        self._telemetry.init_clause(self._projection, shard.where_clause, shard.count)
+        for offset in range(0, shard.count, limit):
+            yield FeaturePageDescription(
+                where_clause=shard.where_clause,
+                offset=offset,
+                expected_results=min(limit, shard.count - offset),
+                use_cache=shard.use_cache,
+            )
+
     async def _shard_count(self: Self,
                            shard_param: PredicateParam,
                            field: str,
@@ -104,3 +160,12 @@ class RequestSharder:
             where_clause=where_clause,
             use_cache=use_cache,
         ), shard_param
+
+def _and_clauses(clauses: Sequence[str]) -> str:
+    """
+    Each clause is parenthesised, so how it binds doesn't
+    depend on whatever operators are inside it.
+    """
+    if len(clauses) == 1:
+        return clauses[0]
+    return ' AND '.join(f'({clause})' for clause in clauses)
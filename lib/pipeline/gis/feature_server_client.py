@@ -2,7 +2,7 @@ import asyncio
 from dataclasses import dataclass
 from logging import getLogger
 from pprint import pformat
-from typing import Any, Dict, Optional, Self, Set, List
+from typing import Any, Dict, Optional, Self, Set, List, Tuple
 from urllib.parse import urlencode
 
 from lib.service.clock import ClockService
@@ -15,7 +15,7 @@ from lib.service.http import (
 
 from .config import GisProjection, FeaturePageDescription
 from .cache_cleaner import AbstractCacheCleaner
-from ._url import get_count_url_params, get_page_url_params
+from ._url import get_count_url_params, get_ids_url_params, get_page_url_params
 
 @dataclass(frozen=True)
 class FeatureExpBackoff:
@@ -94,6 +94,25 @@ class FeatureServerClient:
         self._logger.debug(f'count for "{where_clause}" is {count}')
         return count
 
+    async def get_object_ids(self: Self,
+                             projection: GisProjection,
+                             where_clause: Optional[str],
+                             use_cache: bool) -> Tuple[str, List[int]]:
+        """
+        Returns the name of the object id field, and the sorted
+        object ids of every feature matching the where clause.
+        """
+        response = await self.get_json(
+            projection.schema.url,
+            get_ids_url_params(where_clause),
+            partition=projection.partition_key(),
+            use_cache=use_cache,
+            cache_name='ids',
+        )
+        ids = sorted(response.get('objectIds') or [])
+        self._logger.debug(f'{len(ids)} object ids for "{where_clause}"')
+        return response['objectIdFieldName'], ids
+
     async def get_json(self: Self,
                        feature_url: str,
                        params: Dict[str, Any],
@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
 import geopandas as gpd
@@ -6,11 +7,15 @@ import numpy
 import pandas as pd
 import warnings
 from logging import getLogger
-from shapely.geometry import shape
 from typing import Any, Dict, List, Literal, Self, Set, Tuple, Optional
 
-from lib.service.database import DatabaseService, PgClientException, log_exception_info_df
-from lib.utility.df import prepare_postgis_insert, FieldFormat, fmt_head
+from lib.service.database import (
+    DbCursorLike,
+    DatabaseService,
+    PgClientException,
+    log_exception_info_df,
+)
+from lib.utility.df import prepare_postgis_insert, FieldFormat, GeometryEncoding, fmt_head
 
 from .config import (
     GisProjection,
@@ -18,10 +23,12 @@ from .config import (
     FeaturePageDescription,
 )
 from .cache_cleaner import AbstractCacheCleaner
+from .checkpoint import GisCheckpoint
 from .feature_server_client import FeatureServerClient
+from .page_decoder import decode_page, page_renames
 from .telemetry import GisPipelineTelemetry
 
-GisWorkerDbMode = Literal['write', 'print_head_then_quit', 'skip']
+GisWorkerDbMode = Literal['write', 'copy', 'print_head_then_quit', 'skip']
 
 @dataclass(frozen=True)
 class GisIngestionConfig:
@@ -30,6 +37,13 @@ class GisIngestionConfig:
     db_mode: GisWorkerDbMode
     db_workers: int
     chunk_size: Optional[int]
+    """
+    Number of processes used to parse pages and prepare them
+    for insertion. When 0 pages are parsed on the event loop
+    by the api worker that fetched them.
+    """
+    parse_workers: int = 0
+    geometry_encoding: GeometryEncoding = 'wkt'
 
 class GisIngestion:
     """
@@ -39,6 +53,7 @@ class GisIngestion:
     _stopped = False
     _listeners = 0
     _fetch_queue: asyncio.Queue[IngestionTaskDescriptor.Fetch]
+    _parse_queue: asyncio.Queue[IngestionTaskDescriptor.Parse]
     _save_queue: asyncio.Queue[IngestionTaskDescriptor.Save]
     """
     These are the tasks spawned by dispatch task.
@@ -51,7 +66,10 @@ class GisIngestion:
                  db: DatabaseService,
                  telemetry: GisPipelineTelemetry,
                  cache_cleaner: AbstractCacheCleaner,
-                 save_queue: asyncio.Queue[IngestionTaskDescriptor.Save]):
+                 save_queue: asyncio.Queue[IngestionTaskDescriptor.Save],
+                 parse_queue: asyncio.Queue[IngestionTaskDescriptor.Parse] | None = None,
+                 parse_executor: Executor | None = None,
+                 checkpoint: GisCheckpoint | None = None):
         self.config = config
         self._db = db
         self._telemetry = telemetry
@@ -60,20 +78,29 @@ class GisIngestion:
         self._cache_cleaner = cache_cleaner
         self._feature_server = feature_server
         self._fetch_queue = asyncio.Queue()
+        self._parse_queue = parse_queue or asyncio.Queue()
         self._save_queue = save_queue
+        self._parse_executor = parse_executor
+        self._checkpoint = checkpoint
 
     @staticmethod
     def create(config: GisIngestionConfig,
                feature_server: FeatureServerClient,
                db: DatabaseService,
                telemetry: GisPipelineTelemetry,
-               cache_cleaner: AbstractCacheCleaner):
+               cache_cleaner: AbstractCacheCleaner,
+               checkpoint: GisCheckpoint | None = None):
         # setting a max queue size here establishes some back
         # pressure to limit how much ends up getting queued
         save_queue = asyncio.Queue[IngestionTaskDescriptor.Save](
             maxsize=config.api_worker_backpressure)
+        parse_queue = asyncio.Queue[IngestionTaskDescriptor.Parse](
+            maxsize=config.api_worker_backpressure)
+        parse_executor = ProcessPoolExecutor(max_workers=config.parse_workers) \
+            if config.parse_workers > 0 else None
         return GisIngestion(config, feature_server, db,
-                            telemetry, cache_cleaner, save_queue)
+                            telemetry, cache_cleaner, save_queue,
+                            parse_queue, parse_executor, checkpoint)
 
     def stop(self: Self):
         self._stopped = True
@@ -81,6 +108,8 @@ class GisIngestion:
             if not t.done():
                 t.cancel()
         self._bg_ts = set()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=False, cancel_futures=True)
 
     def queue_page(self: Self, t_desc: IngestionTaskDescriptor.Fetch) -> None:
         self._bg_ts.add(asyncio.create_task(self._fetch_queue.put(t_desc)))
@@ -106,22 +135,65 @@ class GisIngestion:
                 await self._fetch(t_desc)
                 await asyncio.sleep(0)
 
+        async def ingest_parse_work() -> None:
+            while self.is_consuming():
+                try:
+                    t_desc = await asyncio.wait_for(self._parse_queue.get(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                await self._parse(t_desc)
+                await asyncio.sleep(0)
+
+        parse_workers = self.config.parse_workers if self._parse_executor else 0
+
         try:
             await asyncio.gather(*[
                 *[ingest_db_work() for i in range(0, self.config.db_workers)],
+                *[ingest_parse_work() for i in range(0, parse_workers)],
                 *[ingest_api_work() for i in range(0, self.config.api_workers)],
             ])
         except Exception as e:
             self.stop()
             raise e
+        finally:
+            if self._parse_executor is not None:
+                self._parse_executor.shutdown(wait=False, cancel_futures=True)
 
     async def _fetch(self: Self, t_desc_fetch: IngestionTaskDescriptor.Fetch):
         projection, page_desc = t_desc_fetch.projection, t_desc_fetch.page_desc
         self._telemetry.record_fetch_start(t_desc_fetch)
         page = await self._feature_server.get_page(projection, page_desc)
         self._telemetry.record_fetch_end(t_desc_fetch, len(page))
-        t_desc_save = IngestionTaskDescriptor.Save(
-            projection, page_desc, build_df(projection, page))
+        t_desc_parse = IngestionTaskDescriptor.Parse(projection, page_desc, page)
+
+        if self._parse_executor is None:
+            await self._parse(t_desc_parse)
+        else:
+            await self._parse_queue.put(t_desc_parse)
+
+    async def _parse(self: Self, t_desc_parse: IngestionTaskDescriptor.Parse):
+        """
+        Builds the dataframe for the page, and if we're going to
+        write it, also prepares it for insertion. This is either
+        done here on the event loop, or in the process pool. The
+        projection isn't sent to the pool as it's not necessarily
+        picklable, only the parts needed for parsing are sent.
+        """
+        projection, page_desc = t_desc_parse.projection, t_desc_parse.page_desc
+        page = t_desc_parse.page
+        db_relation = projection.schema.db_relation
+        prepare_args = (db_relation, projection.epsg_crs, column_formats(projection),
+                        self.config.geometry_encoding) \
+            if self.config.db_mode in ('write', 'copy') and db_relation is not None else None
+        parse_args = (page, projection.epsg_crs, page_renames(projection), prepare_args)
+
+        if self._parse_executor is None:
+            df, prepared = parse_page(*parse_args)
+        else:
+            loop = asyncio.get_running_loop()
+            df, prepared = await loop.run_in_executor(self._parse_executor, parse_page, *parse_args)
+
+        t_desc_save = IngestionTaskDescriptor.Save(projection, page_desc, df, prepared)
         await self._save_queue.put(t_desc_save)
         self._telemetry.record_save_queue(t_desc_save, len(page))
 
@@ -143,16 +215,20 @@ class GisIngestion:
                 raise asyncio.CancelledError('dryrun')
             case 'skip':
                 pass
-            case 'write':
-                df_copy, query = prepare_query(db_relation, proj, df)
+            case 'write' | 'copy' as db_mode:
+                df_copy, query = t_desc.prepared \
+                    or prepare_query(db_relation, proj, df, self.config.geometry_encoding)
                 async with self._db.async_connect() as conn:
                     async with conn.cursor() as cur:
-                        slice, rows = [], df_copy.to_records(index=False).tolist()
+                        rows = df_copy.to_records(index=False).tolist()
                         cursor, size = 0, self.config.chunk_size or len(rows)
                         try:
-                            for cursor in range(0, len(rows), size):
-                                slice = rows[cursor:cursor + size]
-                                await cur.executemany(query, slice)
+                            if db_mode == 'copy':
+                                size = len(rows)
+                                await copy_rows(cur, db_relation, list(df_copy.columns), rows)
+                            else:
+                                for cursor in range(0, len(rows), size):
+                                    await cur.executemany(query, rows[cursor:cursor + size])
                         except PgClientException as e:
                             self.stop()
                             log_exception_info_df(df_copy.iloc[cursor:cursor+size], self._logger, e)
@@ -162,6 +238,8 @@ class GisIngestion:
                             await self._cache_cleaner.forget_page_cache(proj, page_desc)
                             raise e
                     await conn.commit()
+                if self._checkpoint is not None:
+                    await self._checkpoint.record_page(proj, page_desc)
         self._telemetry.record_save_end(t_desc, len(t_desc.df))
         t_desc.df.drop(t_desc.df.index, inplace=True)
 
@@ -173,6 +251,7 @@ class GisIngestion:
         self._bg_ts -= done_ts
 
         return not self._save_queue.empty() \
+            or not self._parse_queue.empty() \
             or not self._fetch_queue.empty() \
             or self._listeners > 0 \
             or bool(self._bg_ts)
@@ -193,51 +272,64 @@ def create_placeholder(col: str, fmts: _Formats, crs: int) -> str:
             return f"ST_GeomFromText(%s, {crs})"
     return '%s'
 
-def prepare_query(db_relation: str, p: GisProjection, df: gpd.GeoDataFrame) -> Tuple[gpd.GeoDataFrame, str]:
+def column_formats(p: GisProjection) -> _Formats:
+    return {
+        'geometry': 'geometry',
+        **({
+            (f.rename or f.name): f.format
+            for f in p.get_fields() if f.format
+        })
+    }
+
+def prepare_query(db_relation: str,
+                  p: GisProjection,
+                  df: gpd.GeoDataFrame,
+                  geometry_encoding: GeometryEncoding = 'wkt') -> Tuple[gpd.GeoDataFrame, str]:
     try:
         return prepare_postgis_insert(df,
             relation=db_relation,
             epsg_crs=p.epsg_crs,
-            column_formats={
-                'geometry': 'geometry',
-                **({
-                    (f.rename or f.name): f.format
-                    for f in p.get_fields() if f.format
-                })
-            },
+            column_formats=column_formats(p),
             clone=True,
+            geometry_encoding=geometry_encoding,
         )
     except:
         from pprint import pformat
         _logger.error(pformat(p))
         raise
 
-def build_df(proj: GisProjection, page: List[Any]) -> gpd.GeoDataFrame:
-    components: List[Tuple[Any, Dict[str, Any]]] = []
-
-    for feature in page:
-        obj_id = feature['attributes'][proj.schema.id_field]
-
-        geometry = feature['geometry']
-        if 'rings' in geometry:
-            geom = shape({"type": "Polygon", "coordinates": geometry['rings']})
-        elif 'paths' in geometry:
-            geom = shape({"type": "LineString", "coordinates": geometry['paths']})
-        else:
-            geom = shape(geometry)
-
-        components.append((geom, feature['attributes']))
-
-    if not components:
-        return gpd.GeoDataFrame()
-
-    geometries, attributes = [list(c) for c in zip(*components)]
-    return gpd.GeoDataFrame(
-        attributes,
-        geometry=geometries,
-        crs=f"EPSG:{proj.epsg_crs}",
-    ).rename(columns={
-        f.name: f.rename
-        for f in proj.get_fields()
-        if f.rename
-     })
+async def copy_rows(cur: DbCursorLike, relation: str, columns: List[str], rows: List[Any]) -> None:
+    """
+    Streams the rows in with a single COPY rather than an
+    insert per row. The rows are the same values we'd bind
+    to the insert, so geometries are still text (WKT or hex
+    WKB) which the geometry input function parses the same
+    way either way.
+    """
+    async with cur.copy(f"COPY {relation} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            await copy.write_row(row)
+
+_PrepareArgs = Tuple[str, int, _Formats, GeometryEncoding]
+
+def parse_page(
+    page: List[Any],
+    epsg_crs: int,
+    renames: Dict[str, str],
+    prepare_args: Optional[_PrepareArgs],
+) -> Tuple[gpd.GeoDataFrame, Optional[Tuple[gpd.GeoDataFrame, str]]]:
+    """
+    Module level so it can be run in a process pool.
+    """
+    df = decode_page(page, epsg_crs, renames)
+    if prepare_args is None or df.empty:
+        return df, None
+
+    db_relation, crs, formats, geometry_encoding = prepare_args
+    return df, prepare_postgis_insert(df,
+        relation=db_relation,
+        epsg_crs=crs,
+        column_formats=formats,
+        clone=True,
+        geometry_encoding=geometry_encoding,
+    )
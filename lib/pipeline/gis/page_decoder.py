@@ -0,0 +1,114 @@
+import geopandas as gpd
+import numpy
+import pandas as pd
+import shapely
+from shapely.geometry import shape
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import GisProjection
+
+def build_df(proj: GisProjection, page: List[Any]) -> gpd.GeoDataFrame:
+    return decode_page(page, proj.epsg_crs, page_renames(proj))
+
+def decode_page(page: List[Any], epsg_crs: int, renames: Dict[str, str]) -> gpd.GeoDataFrame:
+    """
+    Decodes a page of ArcGIS features into a dataframe, building
+    each attribute as a column and the geometries as a single
+    vectorised array rather than a shapely object per feature.
+
+    Pages this can't handle in bulk, such as those that mix
+    geometry types or have inconsistent attributes, fall back
+    to being decoded feature by feature.
+    """
+    if not page:
+        return gpd.GeoDataFrame()
+
+    attributes = _attribute_columns(page)
+    geometries = _polygon_array(page)
+
+    if attributes is None or geometries is None:
+        return decode_page_per_feature(page, epsg_crs, renames)
+
+    return gpd.GeoDataFrame(
+        attributes,
+        geometry=gpd.GeoSeries(geometries),
+        crs=f"EPSG:{epsg_crs}",
+    ).rename(columns=renames)
+
+def build_df_per_feature(proj: GisProjection, page: List[Any]) -> gpd.GeoDataFrame:
+    return decode_page_per_feature(page, proj.epsg_crs, page_renames(proj))
+
+def decode_page_per_feature(page: List[Any], epsg_crs: int, renames: Dict[str, str]) -> gpd.GeoDataFrame:
+    components: List[Tuple[Any, Dict[str, Any]]] = []
+
+    for feature in page:
+        geometry = feature['geometry']
+        if 'rings' in geometry:
+            geom = shape({"type": "Polygon", "coordinates": geometry['rings']})
+        elif 'paths' in geometry:
+            geom = shape({"type": "LineString", "coordinates": geometry['paths']})
+        else:
+            geom = shape(geometry)
+
+        components.append((geom, feature['attributes']))
+
+    if not components:
+        return gpd.GeoDataFrame()
+
+    geometries, attributes = [list(c) for c in zip(*components)]
+    return gpd.GeoDataFrame(
+        attributes,
+        geometry=geometries,
+        crs=f"EPSG:{epsg_crs}",
+    ).rename(columns=renames)
+
+def page_renames(proj: GisProjection) -> Dict[str, str]:
+    return { f.name: f.rename for f in proj.get_fields() if f.rename }
+
+def _attribute_columns(page: List[Any]) -> Optional[Dict[str, List[Any]]]:
+    keys = page[0]['attributes'].keys()
+    if any(f['attributes'].keys() != keys for f in page):
+        return None
+    return { k: [f['attributes'][k] for f in page] for k in keys }
+
+def _polygon_array(page: List[Any]) -> Optional[numpy.ndarray]:
+    """
+    ArcGIS polygons are a list of rings, the first being the
+    exterior and the rest being holes (matching how they were
+    built with `shape` previously). These are flattened into
+    the ragged array layout shapely expects, which is a single
+    coordinate array plus offsets for where each ring and each
+    polygon start.
+    """
+    coords: List[Any] = []
+    ring_offsets = [0]
+    geom_offsets = [0]
+
+    for feature in page:
+        geometry = feature['geometry']
+        if not geometry or 'rings' not in geometry:
+            return None
+
+        for ring in geometry['rings']:
+            coords.extend(ring)
+            ring_offsets.append(len(coords))
+        geom_offsets.append(len(ring_offsets) - 1)
+
+    if not coords:
+        # shapely can't build a ragged array without coordinates
+        return numpy.array([shapely.Polygon() for _ in page], dtype=object)
+
+    try:
+        coords_array = numpy.asarray(coords, dtype=numpy.float64)
+    except ValueError:
+        # ragged coordinates, i.e. a mix of xy and xyz
+        return None
+
+    if coords_array.ndim != 2 or coords_array.shape[1] not in (2, 3):
+        return None
+
+    return shapely.from_ragged_array(
+        shapely.GeometryType.POLYGON,
+        coords_array,
+        (numpy.asarray(ring_offsets), numpy.asarray(geom_offsets)),
+    )
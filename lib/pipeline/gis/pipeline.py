@@ -13,9 +13,11 @@ from .config import (
     IngestionTaskDescriptor,
     FeaturePageDescription,
 )
+from .checkpoint import GisCheckpoint
 from .ingestion import GisIngestion
 from .predicate import PredicateParam
 from .feature_pagination_sharding import FeaturePaginationSharderFactory
+from .telemetry import GisPipelineTelemetry
 
 StreamItem = Tuple[GisProjection, FeaturePageDescription, Any]
 
@@ -24,9 +26,13 @@ class GisPipeline:
 
     def __init__(self: Self,
                  sharder_factory: FeaturePaginationSharderFactory,
-                 ingestion: GisIngestion):
+                 ingestion: GisIngestion,
+                 telemetry: GisPipelineTelemetry | None = None,
+                 checkpoint: GisCheckpoint | None = None):
         self._ingestion = ingestion
         self._sharder_factory = sharder_factory
+        self._telemetry = telemetry
+        self._checkpoint = checkpoint
 
     async def start(self, projections: List[Tuple[GisProjection, Sequence[PredicateParam]]]):
             try:
@@ -42,6 +48,14 @@ class GisPipeline:
         async with self._ingestion:
             sharder = self._sharder_factory.create(proj)
             async for page in sharder.shard(params):
+                if self._is_resumed(proj, page):
+                    continue
                 task = IngestionTaskDescriptor.Fetch(proj, page)
                 self._ingestion.queue_page(task)
 
+    def _is_resumed(self, proj: GisProjection, page: FeaturePageDescription) -> bool:
+        if self._checkpoint is None or not self._checkpoint.is_page_saved(proj, page):
+            return False
+        if self._telemetry is not None:
+            self._telemetry.record_resumed(proj, page)
+        return True
@@ -7,7 +7,7 @@ from typing import Self, Optional, List, Tuple, Dict
 
 from lib.service.clock import ClockService
 from lib.utility.format import fmt_time_elapsed
-from .config import GisProjection, IngestionTaskDescriptor
+from .config import FeaturePageDescription, GisProjection, IngestionTaskDescriptor
 
 def _p(a, b):
     return ((a/b) if b > 0 else 0) * 100.0
@@ -129,6 +129,20 @@ class GisPipelineTelemetry:
         state.save_completed += amount
         self._log_status(event="Save Skip")
 
+    def record_resumed(self, p: GisProjection, page_desc: FeaturePageDescription):
+        """
+        For pages saved in an earlier run, which are treated
+        as done without going through any of the other steps.
+        """
+        state = self._state_map[p.id][page_desc.where_clause]
+        amount = page_desc.expected_results
+        state.fetch_started += amount
+        state.fetch_completed += amount
+        state.save_queued += amount
+        state.save_started += amount
+        state.save_completed += amount
+        self._log_status(event="Resumed")
+
     def get_state(self, p: GisProjection, clause: str) -> ShardStatistics:
         return self._state_map[p.id][clause]
 
@@ -0,0 +1,101 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock
+
+from lib.service.clock import ClockService
+from lib.service.io import IoService
+
+from ..checkpoint import GisCheckpoint
+from ..config import FeaturePageDescription
+from ..defaults import SNSW_LOT_PROJECTION
+from ..feature_pagination_sharding import FeaturePaginationSharderFactory
+from ..feature_server_client import FeatureServerClient
+from ..telemetry import GisPipelineTelemetry
+
+class GisCheckpointTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.lines = []
+
+        async def f_append(path, data):
+            self.lines.append(data)
+
+        async def f_read_lines(path, encoding=None):
+            for line in ''.join(self.lines).splitlines(keepends=True):
+                yield line
+
+        self.mock_io = AsyncMock(spec=IoService)
+        self.mock_io.f_append.side_effect = f_append
+        self.mock_io.f_read_lines.side_effect = f_read_lines
+        self.mock_io.f_exists.return_value = True
+
+    async def _reload(self) -> GisCheckpoint:
+        checkpoint = GisCheckpoint(self.mock_io, 'checkpoint')
+        await checkpoint.load()
+        return checkpoint
+
+    async def test_saved_pages_survive_restart(self):
+        page_a = FeaturePageDescription('a = 1', 0, 100, True)
+        page_b = FeaturePageDescription('a = 1', 100, 100, True)
+
+        await GisCheckpoint(self.mock_io, 'checkpoint').record_page(SNSW_LOT_PROJECTION, page_a)
+        checkpoint = await self._reload()
+
+        self.assertTrue(checkpoint.is_page_saved(SNSW_LOT_PROJECTION, page_a))
+        self.assertFalse(checkpoint.is_page_saved(SNSW_LOT_PROJECTION, page_b))
+
+    async def test_skips_malformed_lines(self):
+        self.lines.append('{"op": "pa')
+        checkpoint = await self._reload()
+        self.assertIsNone(checkpoint.get_shards(SNSW_LOT_PROJECTION, ''))
+
+    async def test_replays_shards_without_counting(self):
+        telemetry = GisPipelineTelemetry.create(ClockService())
+        feature_server = AsyncMock(spec=FeatureServerClient)
+        feature_server.get_where_count.return_value = 10
+
+        checkpoint = GisCheckpoint(self.mock_io, 'checkpoint')
+        factory = FeaturePaginationSharderFactory(
+            feature_server, telemetry, lambda ls: None, checkpoint)
+        expected = [p async for p in factory.create(SNSW_LOT_PROJECTION).shard([])]
+        self.assertGreater(feature_server.get_where_count.call_count, 0)
+
+        feature_server.get_where_count.reset_mock()
+        factory = FeaturePaginationSharderFactory(
+            feature_server, telemetry, lambda ls: None, await self._reload())
+        replayed = [p async for p in factory.create(SNSW_LOT_PROJECTION).shard([])]
+
+        self.assertEqual(replayed, expected)
+        feature_server.get_where_count.assert_not_called()
+
+    async def test_incomplete_sharding_is_not_replayed(self):
+        self.lines.append('{"op": "shard", "projection": "x", "params": "", "where": "a", "count": 1, "use_cache": true}\n')
+        checkpoint = await self._reload()
+        self.assertIsNone(checkpoint.get_shards(SNSW_LOT_PROJECTION, ''))
+
+    async def test_interrupted_sharding_is_not_replayed_twice(self):
+        telemetry = GisPipelineTelemetry.create(ClockService())
+        feature_server = AsyncMock(spec=FeatureServerClient)
+        feature_server.get_where_count.return_value = 10
+
+        def create(checkpoint: GisCheckpoint):
+            factory = FeaturePaginationSharderFactory(
+                feature_server, telemetry, lambda ls: None, checkpoint)
+            return factory.create(SNSW_LOT_PROJECTION)
+
+        # the first run stops after a couple of shards
+        interrupted = create(GisCheckpoint(self.mock_io, 'checkpoint')).shard([])
+        await anext(interrupted)
+        await anext(interrupted)
+        await interrupted.aclose()
+
+        # the next run shards from the start & finishes
+        expected = [p async for p in create(await self._reload()).shard([])]
+
+        # both later resumes only replay the finished pass
+        feature_server.get_where_count.reset_mock()
+        first_resume = [p async for p in create(await self._reload()).shard([])]
+        second_resume = [p async for p in create(await self._reload()).shard([])]
+
+        self.assertEqual(first_resume, expected)
+        self.assertEqual(second_resume, expected)
+        self.assertEqual(len(set(expected)), len(expected))
+        feature_server.get_where_count.assert_not_called()
@@ -0,0 +1,46 @@
+from dataclasses import replace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock
+
+from lib.service.clock import ClockService
+
+from ..config import FeaturePageDescription
+from ..defaults import SNSW_LOT_PROJECTION
+from ..feature_pagination_sharding import FeaturePaginationSharderFactory
+from ..feature_server_client import FeatureServerClient
+from ..predicate import DateRangeParam, YearMonth
+from ..telemetry import GisPipelineTelemetry
+
+_PROJECTION = replace(
+    SNSW_LOT_PROJECTION,
+    schema=replace(SNSW_LOT_PROJECTION.schema, result_limit=2, shard_strategy='object_id'),
+)
+
+class ObjectIdShardingTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.feature_server = AsyncMock(spec=FeatureServerClient)
+        self.feature_server.get_object_ids.return_value = ('OBJECTID', [1, 2, 5, 9, 10])
+        telemetry = GisPipelineTelemetry.create(ClockService())
+        self.factory = FeaturePaginationSharderFactory(
+            self.feature_server, telemetry, lambda ls: None)
+
+    async def test_pages_are_exact_id_ranges(self):
+        pages = [p async for p in self.factory.create(_PROJECTION).shard([])]
+
+        self.assertEqual(pages, [
+            FeaturePageDescription('OBJECTID >= 1 AND OBJECTID <= 2', 0, 2, True),
+            FeaturePageDescription('OBJECTID >= 5 AND OBJECTID <= 9', 0, 2, True),
+            FeaturePageDescription('OBJECTID >= 10 AND OBJECTID <= 10', 0, 1, True),
+        ])
+        self.feature_server.get_where_count.assert_not_called()
+        self.feature_server.get_object_ids.assert_called_once_with(
+            projection=_PROJECTION, where_clause=None, use_cache=True)
+
+    async def test_params_scope_the_ids(self):
+        param = DateRangeParam(YearMonth(2020, 1), YearMonth(2020, 3), ClockService())
+        field = _PROJECTION.schema.shard_scheme[0].field
+        pages = [p async for p in self.factory.create(_PROJECTION).shard([param])]
+
+        where_clause = self.feature_server.get_object_ids.call_args.kwargs['where_clause']
+        self.assertEqual(where_clause, param.apply(field))
+        self.assertTrue(all(p.where_clause.startswith(f'({where_clause}) AND (OBJECTID >= ') for p in pages))
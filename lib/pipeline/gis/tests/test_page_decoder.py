@@ -0,0 +1,73 @@
+import unittest
+
+from geopandas.testing import assert_geodataframe_equal # type: ignore[import-untyped]
+
+from ..config import GisProjection, GisSchema, SchemaField
+from ..page_decoder import build_df, build_df_per_feature
+
+_schema = GisSchema(
+    url='https://example.com/FeatureServer/0',
+    id_field='objectid',
+    db_relation=None,
+    result_limit=100,
+    result_depth=100,
+    fields=[
+        SchemaField('id', 'objectid', rename='object_id'),
+        SchemaField('meta', 'area'),
+        SchemaField('meta', 'label'),
+    ],
+    shard_scheme=[],
+    debug_field='objectid',
+)
+
+_projection = GisProjection(id='test', schema=_schema, fields='*', epsg_crs=4326)
+
+_square = [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]
+_hole = [[2, 2], [4, 2], [4, 4], [2, 4], [2, 2]]
+_other = [[20.5, 20.5], [20.5, 30], [30, 30], [20.5, 20.5]]
+
+def _feature(objectid, area, label, rings):
+    return {
+        'attributes': { 'objectid': objectid, 'area': area, 'label': label },
+        'geometry': { 'rings': rings },
+    }
+
+class BuildDfTestCase(unittest.TestCase):
+    def test_polygon_page_matches_per_feature(self):
+        page = [
+            _feature(1, 10.5, 'a', [_square]),
+            _feature(2, None, None, [_square, _hole]),
+            _feature(3, 3.0, 'c', [_other]),
+        ]
+        assert_geodataframe_equal(
+            build_df(_projection, page),
+            build_df_per_feature(_projection, page),
+        )
+
+    def test_renames_columns(self):
+        df = build_df(_projection, [_feature(1, 10.5, 'a', [_square])])
+        self.assertEqual(list(df.columns), ['object_id', 'area', 'label', 'geometry'])
+        self.assertEqual(df.crs.to_epsg(), 4326)
+
+    def test_inconsistent_attributes_fall_back(self):
+        page = [
+            _feature(1, 10.5, 'a', [_square]),
+            { 'attributes': { 'objectid': 2 }, 'geometry': { 'rings': [_other] } },
+        ]
+        assert_geodataframe_equal(
+            build_df(_projection, page),
+            build_df_per_feature(_projection, page),
+        )
+
+    def test_empty_polygons(self):
+        for page in [
+            [_feature(1, 10.5, 'a', []), _feature(2, 3.0, 'b', [])],
+            [_feature(1, 10.5, 'a', []), _feature(2, 3.0, 'b', [_square])],
+        ]:
+            assert_geodataframe_equal(
+                build_df(_projection, page),
+                build_df_per_feature(_projection, page),
+            )
+
+    def test_empty_page(self):
+        self.assertTrue(build_df(_projection, []).empty)
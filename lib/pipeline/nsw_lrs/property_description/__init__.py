@@ -1,2 +1,3 @@
 from .parse import *
 from .data import *
+from .base_parcel import BaseParcelKind, get_base_parcel_id, get_base_parcel_kind
@@ -0,0 +1,35 @@
+import re
+from typing import Literal
+
+BaseParcelKind = Literal['strata_plan', 'deposit_lot']
+
+_STRATA_PLAN = re.compile(r'SP\d+')
+
+def get_base_parcel_id(folio_id: str) -> str:
+    """
+    Same as `nsw_lrs.get_base_parcel_id` in the database, so
+    base parcels can be worked out before they're written. Like
+    the SQL function, only the first run of slashes is collapsed.
+    """
+    folio_id = re.sub(r'//+', '/', folio_id, count=1)
+    plan_part = _last_part(folio_id)
+    if plan_part is None:
+        return folio_id
+
+    if _STRATA_PLAN.fullmatch(plan_part):
+        return plan_part
+
+    head = folio_id[:-len(plan_part)]
+    return head + re.sub(r'^DP', '', plan_part, count=1)
+
+def get_base_parcel_kind(folio_id: str) -> BaseParcelKind:
+    """
+    Same as `nsw_lrs.get_base_parcel_kind` in the database.
+    """
+    plan_part = _last_part(re.sub(r'/+', '/', folio_id))
+    if plan_part is not None and _STRATA_PLAN.fullmatch(plan_part):
+        return 'strata_plan'
+    return 'deposit_lot'
+
+def _last_part(folio_id: str) -> str | None:
+    return folio_id.rsplit('/', 1)[-1] or None
@@ -2,3 +2,4 @@ from . import types
 from .parse import parse_land_parcel_ids
 from .parse import parse_property_description
 from .parse import parse_property_description_data
+from .cache import ParseCache, ParseCacheFile, ParseCacheStats
@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import inspect
+from logging import getLogger
+import pickle
+import sqlite3
+from typing import List, Optional, Self, Tuple
+
+from .. import builder, data
+from . import compiled, grammar, parcel_parser, parse, types
+from .compiled import pre_parcel_rules, post_parcel_rules
+from .parse import parse_property_description_data
+
+ParseResult = Tuple[data.PropertyDescription, str]
+
+# Bump this when cached results change shape in a way the
+# fingerprint of the parser's modules doesn't pick up, such
+# as a change to `ParseResult` or how it's pickled.
+CACHE_VERSION = 1
+
+# The modules parse results are built by & built from, any
+# change to these clears the cache file.
+_PARSER_MODULES = [builder, data, compiled, grammar, parcel_parser, parse, types]
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    hits: int
+    file_hits: int
+    misses: int
+    evictions: int
+    entries: int
+
+    @property
+    def lookups(self: Self) -> int:
+        return self.hits + self.file_hits + self.misses
+
+    def __sub__(self: Self, other: 'ParseCacheStats') -> 'ParseCacheStats':
+        return ParseCacheStats(
+            hits=self.hits - other.hits,
+            file_hits=self.file_hits - other.file_hits,
+            misses=self.misses - other.misses,
+            evictions=self.evictions - other.evictions,
+            entries=self.entries,
+        )
+
+    def __str__(self: Self) -> str:
+        rate = ((self.hits + self.file_hits) / self.lookups * 100.0) if self.lookups else 0.0
+        return f'hits {self.hits + self.file_hits} ({rate:.2f}%), ' \
+               f'file hits {self.file_hits}, misses {self.misses}, ' \
+               f'evictions {self.evictions}, entries {self.entries}'
+
+class ParseCache:
+    """
+    A bounded LRU of parsed legal descriptions, keyed by the
+    raw description, as the same descriptions show up for every
+    valuation & sale of a property.
+
+    When given a `ParseCacheFile`, misses are looked up in the
+    file before being parsed, & new results are written to it
+    on `flush`, so other processes (& later runs) can use them.
+    Results are shared between callers, so they shouldn't be
+    mutated.
+    """
+    _logger = getLogger(f'{__name__}.ParseCache')
+
+    def __init__(self: Self,
+                 capacity: int,
+                 file: Optional['ParseCacheFile'] = None) -> None:
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._capacity = capacity
+        self._file = file
+        self._entries: OrderedDict[str, ParseResult] = OrderedDict()
+        self._pending: List[Tuple[str, ParseResult]] = []
+        self._hits = 0
+        self._file_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self: Self, desc: str) -> ParseResult:
+        if desc in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(desc)
+            return self._entries[desc]
+
+        result = self._file.get(desc) if self._file else None
+        if result is not None:
+            self._file_hits += 1
+        else:
+            self._misses += 1
+            result = parse_property_description_data(desc)
+            if self._file:
+                self._pending.append((desc, result))
+
+        self._entries[desc] = result
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return result
+
+    def flush(self: Self) -> None:
+        if not self._file or not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._file.put_many(pending)
+
+    def close(self: Self) -> None:
+        self.flush()
+        if self._file:
+            self._file.close()
+
+    def stats(self: Self) -> ParseCacheStats:
+        return ParseCacheStats(
+            hits=self._hits,
+            file_hits=self._file_hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+        )
+
+class ParseCacheFile:
+    """
+    Parse results persisted to a sqlite database, which can
+    be opened by several processes at once. Each process has
+    to open its own, after it has started.
+
+    Results are only valid for the parser they were parsed
+    with, so the file is cleared when the grammar, the source
+    of the modules building the results or `CACHE_VERSION`
+    changes.
+
+    Reads & writes are synchronous, so they block the event
+    loop of the worker using the cache while they run. Reads
+    are primary key lookups & writes are batched into one
+    transaction per `flush`, so they're short next to parsing
+    & inserting a page.
+    """
+    _logger = getLogger(f'{__name__}.ParseCacheFile')
+
+    def __init__(self: Self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    @staticmethod
+    def open(path: str) -> 'ParseCacheFile':
+        conn = sqlite3.connect(path, timeout=60)
+        conn.execute('PRAGMA journal_mode = WAL')
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS grammar (fingerprint TEXT NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS parsed ('
+                         '  description TEXT PRIMARY KEY,'
+                         '  result BLOB NOT NULL)')
+
+            fingerprint = _parser_fingerprint()
+            row = conn.execute('SELECT fingerprint FROM grammar').fetchone()
+            if row is None or row[0] != fingerprint:
+                if row is not None:
+                    ParseCacheFile._logger.info(f'parser changed, clearing {path}')
+                conn.execute('DELETE FROM parsed')
+                conn.execute('DELETE FROM grammar')
+                conn.execute('INSERT INTO grammar VALUES (?)', (fingerprint,))
+        return ParseCacheFile(conn)
+
+    def get(self: Self, desc: str) -> Optional[ParseResult]:
+        row = self._conn.execute(
+            'SELECT result FROM parsed WHERE description = ?',
+            (desc,),
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def put_many(self: Self, results: List[Tuple[str, ParseResult]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO parsed VALUES (?, ?)',
+                [(desc, pickle.dumps(result)) for desc, result in results],
+            )
+
+    def close(self: Self) -> None:
+        self._conn.close()
+
+def _parser_fingerprint() -> str:
+    digest = hashlib.sha256()
+    digest.update(repr(CACHE_VERSION).encode('utf-8'))
+    for rules in [pre_parcel_rules, post_parcel_rules]:
+        for rule in rules.rules:
+            digest.update(repr((rule.pattern.pattern, rule.pattern.flags, rule.out)).encode('utf-8'))
+    for module in _PARSER_MODULES:
+        digest.update(inspect.getsource(module).encode('utf-8'))
+    return digest.hexdigest()
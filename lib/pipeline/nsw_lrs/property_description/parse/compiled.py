@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Self
+import re
+
+from . import grammar as g
+from . import types as t
+
+_META = set('\\()[]{}?*+.|^$')
+_QUANTIFIERS = set('?*+{')
+_ESCAPED_LITERALS = set('()[]{}?*+.|^$\\-/ ')
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A pattern from the grammar along with what to do with its
+    matches, either replace them with `out` or remove them and
+    record the item returned by `item`.
+
+    `keyword` is text every match must contain, so most rules
+    can be ruled out with a substring check before the regex
+    engine is involved at all.
+    """
+    pattern: re.Pattern
+    keyword: str
+    ignore_case: bool
+    out: str = ''
+    item: Optional[Callable[[re.Match], t.ParseItem]] = None
+
+    @staticmethod
+    def create(pattern: re.Pattern,
+               out: str = '',
+               item: Optional[Callable[[re.Match], t.ParseItem]] = None) -> 'Rule':
+        ignore_case = bool(pattern.flags & re.IGNORECASE)
+        keyword = literal_prefix(pattern.pattern)
+        return Rule(pattern=pattern,
+                    keyword=keyword.lower() if ignore_case else keyword,
+                    ignore_case=ignore_case,
+                    out=out,
+                    item=item)
+
+class CompiledRules:
+    """
+    Applies a list of rules in order, same as running each
+    pattern's `finditer` & `sub` one after the other, except
+    each rule makes one pass over the text and rules which
+    can't match are skipped without running them.
+
+    The keyword check is only done on ascii text, as with
+    unicode case folding some characters match others under
+    `re.IGNORECASE` that aren't the same once lower cased.
+    """
+    _rules: List[Rule]
+
+    def __init__(self: Self, rules: List[Rule]) -> None:
+        self._rules = rules
+
+    @property
+    def rules(self: Self) -> List[Rule]:
+        return self._rules
+
+    def apply(self: Self, text: str, items: List[t.ParseItem]) -> str:
+        checkable = text.isascii()
+        lower = text.lower()
+
+        for rule in self._rules:
+            if checkable and rule.keyword \
+                    and rule.keyword not in (lower if rule.ignore_case else text):
+                continue
+
+            if rule.item is None:
+                out = rule.pattern.sub(rule.out, text)
+            else:
+                out = rule.pattern.sub(_collector(rule.item, items), text)
+
+            if out != text:
+                text = out
+                checkable = text.isascii()
+                lower = text.lower()
+        return text
+
+def _collector(item: Callable[[re.Match], t.ParseItem],
+               items: List[t.ParseItem]) -> Callable[[re.Match], str]:
+    def collect(match: re.Match) -> str:
+        items.append(item(match))
+        return ''
+    return collect
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Returns the literal text at the start of a pattern that
+    every match must start with, which is empty if the pattern
+    starts with anything other than plain characters.
+    """
+    if _has_top_level_branch(pattern):
+        return ''
+
+    prefix: List[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern) and pattern[i + 1] in _ESCAPED_LITERALS:
+            c, width = pattern[i + 1], 2
+        elif c in _META:
+            break
+        else:
+            width = 1
+
+        if i + width < len(pattern) and pattern[i + width] in _QUANTIFIERS:
+            break
+
+        prefix.append(c)
+        i += width
+    return ''.join(prefix)
+
+def _has_top_level_branch(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+def _id_item(Const: Any) -> Callable[[re.Match], t.ParseItem]:
+    return lambda match: Const(id=match.group(1))
+
+def _named_item(pattern: g.NamePattern) -> Callable[[re.Match], t.ParseItem]:
+    return lambda match: pattern.Const(
+        **{ k: match.group(k) for k in pattern.id_names },
+        **{ k: match.group(k) is not None for k in pattern.bool_names },
+    )
+
+def _flag_item(Const: Any) -> Callable[[re.Match], t.ParseItem]:
+    return lambda match: Const()
+
+pre_parcel_rules = CompiledRules([
+    *(Rule.create(p.re, out=p.out) for p in g.sanitize_patterns),
+    *(Rule.create(p.re, out=p.out) for p in g.sanitize_pre_parcels_patterns),
+])
+
+post_parcel_rules = CompiledRules([
+    *(Rule.create(p.re, out=p.out) for p in g.sanitize_post_parcels_patterns),
+    *(Rule.create(p) for p in g.ignore_pre_patterns),
+    *(Rule.create(p.re, item=_id_item(p.Const)) for p in g.id_patterns),
+    *(Rule.create(p.re, item=_named_item(p)) for p in g.named_group_patterns),
+    *(Rule.create(p.re, item=_flag_item(p.Const)) for p in g.flag_patterns),
+    *(Rule.create(p) for p in g.ignore_post_patterns),
+])
@@ -75,14 +75,33 @@ def parse_parcel_data(parcel_id: str) -> data.Folio:
     raise ValueError(f'invalid parcel, {parcel_id}')
 
 class ParcelsParser:
+    """
+    The description is split into its space separated chunks
+    up front, & the cursor is the index of the next chunk to
+    read, so reading doesn't copy what's left of the string.
+    """
     _stop = False
     _desc: str
     _seen: Set[Folio]
-    _read_from = 0
+    _chunks: List[str]
+    _starts: List[int]
+    _cursor = 0
 
     def __init__(self: Self, desc: str) -> None:
         self._desc = desc
         self._seen = set()
+        self._chunks = desc.split(' ')
+        self._starts = []
+        start = 0
+        for chunk in self._chunks:
+            self._starts.append(start)
+            start += len(chunk) + 1
+
+    @property
+    def _read_from(self: Self) -> int:
+        if self._cursor < len(self._chunks):
+            return self._starts[self._cursor]
+        return len(self._desc)
 
     @property
     def running(self: Self) -> bool:
@@ -154,21 +173,11 @@ class ParcelsParser:
 
 
     def _read_chunk(self: Self, skip = 0) -> str:
-        copy = self._desc[self._read_from:]
-        while skip > 0:
-            copy = copy[copy.find(' ') + 1:]
-            skip -= 1
-        if copy.find(' ') == -1:
-            return copy
-        else:
-            return copy[:copy.find(' ')]
+        if self._cursor >= len(self._chunks):
+            return ''
+        # skipping past the last chunk stays on the last chunk
+        return self._chunks[min(self._cursor + skip, len(self._chunks) - 1)]
 
     # todo rename to progress
     def _move_cursor(self: Self, skip = 0):
-        while skip > 0:
-            if self._desc[self._read_from:].find(' ') == -1:
-                self._read_from = len(self._desc)
-                return
-
-            self._read_from += self._desc[self._read_from:].find(' ') + 1
-            skip -= 1
+        self._cursor = min(self._cursor + skip, len(self._chunks))
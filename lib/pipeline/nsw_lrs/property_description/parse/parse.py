@@ -3,13 +3,15 @@ from logging import getLogger
 import re
 
 from . import types as t
-from . import grammar as g
+from .compiled import pre_parcel_rules, post_parcel_rules
 from .parcel_parser import ParcelsParser, parse_parcel_data
 from .. import data
 from ..builder import PropertyDescriptionBuilder
 
 logger = getLogger(__name__)
 
+_WHITESPACE = re.compile(r'\s+')
+
 def parse_land_parcel_ids(desc: str):
     parser = ParcelsParser(desc)
     parcels = list(parser.read_parcels())
@@ -18,48 +20,13 @@ def parse_land_parcel_ids(desc: str):
 def parse_property_description(description: str) -> Tuple[str, List[t.ParseItem]]:
     parsed_items: List[t.ParseItem] = []
 
-    for s_pattern in g.sanitize_patterns:
-        description = s_pattern.re.sub(s_pattern.out, description)
-
-    for s_pattern in g.sanitize_pre_parcels_patterns:
-        description = s_pattern.re.sub(s_pattern.out, description)
-
-    description = re.sub(r'\s+', ' ', description)
+    description = pre_parcel_rules.apply(description, parsed_items)
+    description = _WHITESPACE.sub(' ', description)
     description, land_parcels = parse_land_parcel_ids(description)
     parsed_items.extend(land_parcels)
 
-    for s_pattern in g.sanitize_post_parcels_patterns:
-        description = s_pattern.re.sub(s_pattern.out, description)
-
-    for i_pattern in g.ignore_pre_patterns:
-        description = i_pattern.sub('', description)
-
-    for id_pattern in g.id_patterns:
-        for match in id_pattern.re.finditer(description):
-            parsed_items.append(id_pattern.Const(id=match.group(1)))
-        description = id_pattern.re.sub('', description)
-
-    for n_pattern in g.named_group_patterns:
-        for match in n_pattern.re.finditer(description):
-            parsed_item = n_pattern.Const(
-                **{ k: match.group(k) for k in n_pattern.id_names },
-                **{
-                    k: match.group(k) is not None
-                    for k in n_pattern.bool_names
-                },
-            )
-            parsed_items.append(parsed_item)
-        description = n_pattern.re.sub('', description)
-
-    for f_pattern in g.flag_patterns:
-        for match in f_pattern.re.finditer(description):
-            parsed_items.append(f_pattern.Const())
-        description = f_pattern.re.sub('', description)
-
-    for i_pattern in g.ignore_post_patterns:
-        description = i_pattern.sub('', description)
-
-    description = re.sub(r'\s+', ' ', description)
+    description = post_parcel_rules.apply(description, parsed_items)
+    description = _WHITESPACE.sub(' ', description)
     description = '' if description == ' ' else description
 
     return description, parsed_items
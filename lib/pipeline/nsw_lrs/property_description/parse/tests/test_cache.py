@@ -0,0 +1,67 @@
+import sqlite3
+
+from .. import cache as cache_module
+from ..cache import ParseCache, ParseCacheFile
+from ..parse import parse_property_description_data
+
+def test_repeated_descriptions_are_hits():
+    cache = ParseCache(2)
+    assert cache.parse('1/23423') == parse_property_description_data('1/23423')
+    assert cache.parse('1/23423') is cache.parse('1/23423')
+    cache.parse('2/23423')
+    cache.parse('3/23423')
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 3, 1, 2)
+
+def test_least_recently_used_is_evicted():
+    cache = ParseCache(2)
+    cache.parse('1/23423')
+    cache.parse('2/23423')
+    cache.parse('1/23423')
+    cache.parse('3/23423')
+    cache.parse('1/23423')
+    assert cache.stats().misses == 3
+    cache.parse('2/23423')
+    assert cache.stats().misses == 4
+
+def test_results_are_shared_through_the_file(tmp_path):
+    path = str(tmp_path / 'parse.db')
+    desc = 'PT 1/123 Permissive Occupancy 67/15'
+
+    writer = ParseCache(8, ParseCacheFile.open(path))
+    writer.parse(desc)
+    writer.close()
+
+    reader = ParseCache(8, ParseCacheFile.open(path))
+    assert reader.parse(desc) == parse_property_description_data(desc)
+    stats = reader.stats()
+    assert (stats.file_hits, stats.misses) == (1, 0)
+    reader.close()
+
+def test_file_is_cleared_when_grammar_changes(tmp_path):
+    path = str(tmp_path / 'parse.db')
+    cache = ParseCache(8, ParseCacheFile.open(path))
+    cache.parse('1/23423')
+    cache.close()
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE grammar SET fingerprint = 'old'")
+    conn.close()
+
+    cache = ParseCache(8, ParseCacheFile.open(path))
+    cache.parse('1/23423')
+    assert cache.stats().misses == 1
+    cache.close()
+
+def test_file_is_cleared_when_cache_version_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'parse.db')
+    cache = ParseCache(8, ParseCacheFile.open(path))
+    cache.parse('1/23423')
+    cache.close()
+
+    monkeypatch.setattr(cache_module, 'CACHE_VERSION', cache_module.CACHE_VERSION + 1)
+    cache = ParseCache(8, ParseCacheFile.open(path))
+    cache.parse('1/23423')
+    assert cache.stats().misses == 1
+    cache.close()
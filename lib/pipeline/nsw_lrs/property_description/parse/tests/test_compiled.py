@@ -0,0 +1,35 @@
+import pytest
+import re
+
+from .. import types as t
+from ..compiled import CompiledRules, Rule, literal_prefix
+
+@pytest.mark.parametrize("pattern,prefix", [
+    (r'Wind Farm\s+(\w+)', 'Wind Farm'),
+    (r'RAILCORP\. FILE:\s+(\w+)', 'RAILCORP. FILE:'),
+    (r' \(', ' ('),
+    (r'\$\$\$\$ ', '$$$$ '),
+    (r'COONONG WILDLIFE REFUGE (NO )?\w+', 'COONONG WILDLIFE REFUGE '),
+    (r"sqm('s)?", 'sqm'),
+    (r'Shared? Use', 'Share'),
+    (r'(TOTAL )?SUBSURFACE', ''),
+    (r'Crown Road|Crown Lane', ''),
+    (r'[|]Crown Road', ''),
+])
+def test_literal_prefix(pattern, prefix):
+    assert literal_prefix(pattern) == prefix
+
+def test_rules_apply_in_order():
+    rules = CompiledRules([
+        Rule.create(re.compile(r'Forest Permit\s+(\w+)'),
+                    item=lambda m: t.ForestPermit(id=m.group(1))),
+        Rule.create(re.compile(r'share use', re.IGNORECASE)),
+    ])
+    items = []
+    assert rules.apply('Share Forest Permit 12 Use', items) == 'Share  Use'
+    assert items == [t.ForestPermit(id='12')]
+
+    # once the permit is removed the ignored text can match
+    items = []
+    assert rules.apply('ShareForest Permit 12 Use', items) == ''
+    assert items == [t.ForestPermit(id='12')]
@@ -0,0 +1,21 @@
+import pytest
+
+from ..base_parcel import get_base_parcel_id, get_base_parcel_kind
+
+# expected values are what the sql functions return
+@pytest.mark.parametrize("folio_id,base_parcel_id,kind", [
+    ('123/313', '123/313', 'deposit_lot'),
+    ('123//313', '123/313', 'deposit_lot'),
+    ('1//DP1234', '1/1234', 'deposit_lot'),
+    ('1/2/DP100', '1/2/100', 'deposit_lot'),
+    ('1///DP5', '1/5', 'deposit_lot'),
+    ('1//2//DP5', '1/2//5', 'deposit_lot'),
+    ('5/SP1234', 'SP1234', 'strata_plan'),
+    ('5//SP1234', 'SP1234', 'strata_plan'),
+    ('SP77', 'SP77', 'strata_plan'),
+    ('5/SP12A', '5/SP12A', 'deposit_lot'),
+    ('12/', '12/', 'deposit_lot'),
+])
+def test_base_parcel(folio_id, base_parcel_id, kind):
+    assert get_base_parcel_id(folio_id) == base_parcel_id
+    assert get_base_parcel_kind(folio_id) == kind
@@ -3,7 +3,10 @@ from .config import (
     NswVgLvChildMsg,
     NswVgLvParentMsg,
     RawLandValueRow,
+    RawLandValueColumns,
     DiscoveryMode as NswVgLvCsvDiscoveryMode,
+    LandValueParseMode as NswVgLvParseMode,
+    LandValueLoadMode as NswVgLvLoadMode,
 )
 from .discovery import (
     Config as NswVgLvCsvDiscoveryConfig,
@@ -0,0 +1,122 @@
+from datetime import datetime
+from logging import getLogger
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+import lib.pipeline.nsw_vg.raw_data.rows as util
+
+from .config import RawLandValueColumns, RawLandValueRow
+
+_logger = getLogger(__name__)
+
+_AREA_TYPES = {'M', 'H', 'U'}
+
+def columns_from_frame(frame: pd.DataFrame,
+                       first_line: int,
+                       file_path: str,
+                       source_date: datetime) -> RawLandValueColumns:
+    """
+    Same as `RawLandValueRow.from_row` for each record in the
+    frame, but each column is read in one go. Values that come
+    up again & again (dates, zones, postcodes) are only parsed
+    once per batch.
+
+    Anything the vectorised checks reject is read again with
+    `from_row`, so invalid rows fail with the same error they
+    would have on the row by row path.
+    """
+    try:
+        return _read_columns(frame, first_line, file_path, source_date)
+    except Exception:
+        _logger.debug(f'falling back to row by row parse in {file_path}')
+
+    rows = [
+        RawLandValueRow.from_row(record, '', first_line + index, file_path, source_date)
+        for index, record in enumerate(frame.to_dict('records'))
+    ]
+    return RawLandValueColumns.from_rows(rows)
+
+def _read_columns(frame: pd.DataFrame,
+                  first_line: int,
+                  file_path: str,
+                  source_date: datetime) -> RawLandValueColumns:
+    def col(name: str) -> np.ndarray:
+        return frame[name].to_numpy(dtype=object)
+
+    size = len(frame)
+    out: Dict[str, List[Any]] = {
+        'district_code': _read_int(col('DISTRICT CODE')),
+        'district_name': _or_none(col('DISTRICT NAME')),
+        'property_id': _read_int(col('PROPERTY ID')),
+        'property_type': _read_str(col('PROPERTY TYPE')),
+        'property_name': _or_none(col('PROPERTY NAME')),
+        'unit_number': _or_none(col('UNIT NUMBER')),
+        'house_number': _or_none(col('HOUSE NUMBER')),
+        'street_name': _or_none(col('STREET NAME')),
+        'suburb_name': _read_str(col('SUBURB NAME')),
+        'postcode': _map_unique(col('POSTCODE'), _read_postcode),
+        'property_description': _or_none(col('PROPERTY DESCRIPTION')),
+        'zone_code': _read_zone_code(col('ZONE CODE')),
+        'zone_standard': _map_unique(col('ZONE CODE'), _read_zone_std),
+        'area': _read_optional_float(col('AREA')),
+        'area_type': _map_unique(col('AREA TYPE'), _read_area_type),
+    }
+    for n in range(1, 6):
+        out[f'land_value_{n}'] = _read_optional_float(col(f'LAND VALUE {n}'))
+        out[f'base_date_{n}'] = _map_unique(col(f'BASE DATE {n}'), _read_date_pre_2002)
+        out[f'authority_{n}'] = _or_none(col(f'AUTHORITY {n}'))
+        out[f'basis_{n}'] = _or_none(col(f'BASIS {n}'))
+    out['source_file_name'] = [file_path] * size
+    out['source_line_number'] = list(range(first_line, first_line + size))
+    out['source_date'] = [source_date] * size
+
+    return RawLandValueColumns({
+        name: out[name]
+        for name in RawLandValueRow.__dataclass_fields__
+    })
+
+def _or_none(values: np.ndarray) -> List[Any]:
+    out = values.copy()
+    out[values == ''] = None
+    return out.tolist()
+
+def _read_str(values: np.ndarray) -> List[Any]:
+    if (values == '').any():
+        raise ValueError('empty required string')
+    return values.tolist()
+
+def _read_int(values: np.ndarray) -> List[Any]:
+    return values.astype(np.int64).tolist()
+
+def _read_optional_float(values: np.ndarray) -> List[Any]:
+    present = values != ''
+    out = np.full(len(values), None, dtype=object)
+    out[present] = values[present].astype(np.float64).tolist()
+    return out.tolist()
+
+def _read_zone_code(values: np.ndarray) -> List[Any]:
+    if any(len(v) > 4 for v in set(values.tolist())):
+        raise ValueError('zone code too long')
+    return _or_none(values)
+
+def _map_unique(values: np.ndarray, f: Callable[[str], Any]) -> List[Any]:
+    codes, uniques = pd.factorize(values)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [f(v) for v in uniques]
+    return mapped[codes].tolist()
+
+def _read_postcode(value: str) -> str | None:
+    return util.read_postcode({'POSTCODE': value}, 'POSTCODE', 'postcode')
+
+def _read_zone_std(value: str) -> Any:
+    return util.read_zone_std({'ZONE CODE': value}, 'ZONE CODE', 'zone_standard')
+
+def _read_area_type(value: str) -> str | None:
+    if value and value not in _AREA_TYPES:
+        raise ValueError(f'Unknown area unit {value}')
+    return value or None
+
+def _read_date_pre_2002(value: str) -> datetime | None:
+    return util.parse_date_pre_2002(value) if value else None
@@ -2,6 +2,7 @@ from abc import ABC
 from datetime import datetime
 from dataclasses import dataclass, fields, field
 from typing import (
+    Any,
     Dict,
     List,
     Literal,
@@ -22,6 +23,9 @@ class ByoLandValue:
     src_dst: str
     datetime: datetime
 
+LandValueParseMode = Literal['rows', 'columns']
+LandValueLoadMode = Literal['insert', 'copy']
+
 class DiscoveryMode:
     class T(ABC): pass
     class Latest(T): pass
@@ -56,15 +60,26 @@ class NswVgLvTaskDesc:
 
     @dataclass(frozen=True)
     class Parse(Base):
+        """
+        When `zip_member` is set, `file` is the zip the csv is
+        read out of, and `size` is the uncompressed size.
+        """
         file: str
         size: int
         target: Union[ByoLandValue, NswVgTarget] = field(repr=False)
+        zip_member: Optional[str] = field(default=None)
+
+        @property
+        def source(self: Self) -> str:
+            if self.zip_member is None:
+                return self.file
+            return f'{self.file}/{self.zip_member}'
 
     @dataclass(frozen=True)
     class Load(Base):
         file: str
         offset: int
-        rows: List['RawLandValueRow'] = field(repr=False)
+        rows: Union[List['RawLandValueRow'], 'RawLandValueColumns'] = field(repr=False)
 
 class NswVgLvParentMsg:
     class Base:
@@ -189,3 +204,29 @@ class RawLandValueRow:
 
     def db_columns(self) -> List[str]:
         return [f.name for f in fields(self)]
+
+@dataclass(frozen=True)
+class RawLandValueColumns:
+    """
+    A batch of land value rows stored a column at a time, with
+    the columns in the same order as `RawLandValueRow`, so they
+    can be loaded without building a dataclass per row.
+    """
+    columns: Dict[str, List[Any]] = field(repr=False)
+
+    def __len__(self: Self) -> int:
+        return len(self.columns['source_line_number'])
+
+    def db_columns(self: Self) -> List[str]:
+        return list(self.columns)
+
+    def db_values(self: Self) -> List[List[Any]]:
+        return [list(row) for row in zip(*self.columns.values())]
+
+    @staticmethod
+    def from_rows(rows: List[RawLandValueRow]) -> 'RawLandValueColumns':
+        names = [f.name for f in fields(RawLandValueRow)]
+        return RawLandValueColumns({
+            name: [getattr(row, name) for row in rows]
+            for name in names
+        })
@@ -0,0 +1,193 @@
+import codecs
+import csv
+from io import StringIO
+import pandas as pd
+from typing import AsyncIterator, Dict, List, Optional, Self, Tuple
+
+CsvRecord = Dict[str, str]
+
+class FallbackDecoder:
+    """
+    Decodes a file a chunk at a time as UTF-8, until a chunk
+    isn't valid UTF-8, from which point the rest of the file
+    is decoded as ISO-8859-1 (which every byte is valid in).
+
+    Like reading the file in text mode, line endings are all
+    translated to `\\n`.
+    """
+
+    def __init__(self: Self) -> None:
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._fallback = False
+        self._trailing_cr = False
+
+    def decode(self: Self, chunk: bytes, final: bool = False) -> str:
+        if not self._fallback:
+            pending, _ = self._utf8.getstate()
+            try:
+                text = self._utf8.decode(chunk, final=final)
+            except UnicodeDecodeError:
+                self._fallback = True
+                self._utf8.reset()
+                text = (pending + chunk).decode('ISO-8859-1')
+        else:
+            text = chunk.decode('ISO-8859-1')
+        return self._translate_newlines(text, final)
+
+    def _translate_newlines(self: Self, text: str, final: bool) -> str:
+        if self._trailing_cr:
+            text = '\r' + text
+            self._trailing_cr = False
+        if text.endswith('\r') and not final:
+            # might be the first half of a \r\n
+            text = text[:-1]
+            self._trailing_cr = True
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def split_complete_records(text: str) -> Tuple[List[str], str]:
+    """
+    Splits text starting at the start of a record into the
+    lines making up whole records, & the text after them which
+    may be the start of a record continuing into the next
+    chunk. A newline only ends a record when it isn't inside a
+    quoted field.
+
+    Same as the csv module, a quote only starts a quoted field
+    at the start of a field, anywhere else it's kept as is, so
+    a stray quote doesn't hold back the rest of the file.
+    """
+    lines = text.split('\n')
+    rest = lines.pop()
+    complete, quoted = 0, False
+    for i, line in enumerate(lines):
+        if quoted or '"' in line:
+            quoted = _ends_in_quoted_field(line, quoted)
+        if not quoted:
+            complete = i + 1
+
+    if complete < len(lines):
+        rest = '\n'.join([*lines[complete:], rest])
+    return [line + '\n' for line in lines[:complete]], rest
+
+def _ends_in_quoted_field(line: str, quoted: bool) -> bool:
+    """
+    Whether the newline after this line is inside a quoted
+    field, given whether the line starts inside one.
+    """
+    pos = 0
+    while True:
+        if quoted:
+            end = line.find('"', pos)
+            if end == -1:
+                return True
+            if line.startswith('"', end + 1):
+                # escaped quote
+                pos = end + 2
+                continue
+            quoted, pos = False, end + 1
+        elif line.startswith('"', pos):
+            quoted, pos = True, pos + 1
+            continue
+
+        # the rest of the field is unquoted
+        comma = line.find(',', pos)
+        if comma == -1:
+            return False
+        pos = comma + 1
+
+async def read_complete_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """
+    Yields the lines of the whole records in each chunk as
+    it's read, the last list has whatever is left at the end
+    of the file, which may not end with a newline.
+    """
+    decoder = FallbackDecoder()
+    rest = ''
+
+    async for chunk in chunks:
+        lines, rest = split_complete_records(rest + decoder.decode(chunk))
+        if lines:
+            yield lines
+
+    rest += decoder.decode(b'', final=True)
+    if rest:
+        *lines, last = rest.split('\n')
+        yield [*(line + '\n' for line in lines), last]
+
+async def read_csv_records(chunks: AsyncIterator[bytes],
+                           batch_size: int) -> AsyncIterator[List[CsvRecord]]:
+    """
+    Reads CSV records from the chunks of a file as they're
+    read, only holding onto the records that haven't been
+    yielded & the part of a record that continues into the
+    next chunk, so memory doesn't grow with the file size.
+
+    Records are the same as `csv.DictReader` gives for the
+    whole file, with the header taken from the first record.
+    """
+    fieldnames: Optional[List[str]] = None
+    batch: List[CsvRecord] = []
+
+    async for lines in read_complete_lines(chunks):
+        reader = csv.DictReader(lines, fieldnames=fieldnames)
+        batch.extend(reader)
+        if fieldnames is None and reader.fieldnames is not None:
+            fieldnames = list(reader.fieldnames)
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+
+    while batch:
+        yield batch[:batch_size]
+        batch = batch[batch_size:]
+
+async def read_csv_frames(chunks: AsyncIterator[bytes],
+                          batch_size: int) -> AsyncIterator[pd.DataFrame]:
+    """
+    Same as `read_csv_records`, but each batch is parsed with
+    the pandas C parser into a frame of strings, one column
+    per field in the header.
+
+    Unlike `csv.DictReader`, short records are padded with
+    empty strings rather than None, and a record with more
+    fields than the header is an error.
+    """
+    fieldnames: Optional[List[str]] = None
+    frames: List[pd.DataFrame] = []
+    pending = 0
+
+    async for lines in read_complete_lines(chunks):
+        if fieldnames is None:
+            header = csv.reader(lines)
+            fieldnames = next(header, None)
+            lines = lines[header.line_num:]
+            if fieldnames is None:
+                return
+
+        frame = _read_frame(lines, fieldnames)
+        if len(frame):
+            frames.append(frame)
+            pending += len(frame)
+        if pending >= batch_size:
+            batch = pd.concat(frames, ignore_index=True)
+            while len(batch) >= batch_size:
+                yield batch.iloc[:batch_size].reset_index(drop=True)
+                batch = batch.iloc[batch_size:]
+            frames, pending = ([batch], len(batch)) if len(batch) else ([], 0)
+
+    if frames:
+        batch = pd.concat(frames, ignore_index=True)
+        for start in range(0, len(batch), batch_size):
+            yield batch.iloc[start:start + batch_size].reset_index(drop=True)
+
+def _read_frame(lines: List[str], fieldnames: List[str]) -> pd.DataFrame:
+    if all(line in ('', '\n') for line in lines):
+        return pd.DataFrame(columns=fieldnames, dtype=str)
+    return pd.read_csv(
+        StringIO(''.join(lines)),
+        header=None,
+        names=fieldnames,
+        dtype=str,
+        na_filter=False,
+        engine='c',
+    )
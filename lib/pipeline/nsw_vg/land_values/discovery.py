@@ -7,7 +7,7 @@ from typing import Self, AsyncIterator, Sequence, List, Literal
 
 from lib.pipeline.nsw_vg.discovery import NswVgTarget, LandValueDiscovery
 from lib.service.io import IoService
-from lib.service.static_environment import StaticEnvironmentInitialiser
+from lib.service.static_environment import StaticEnvironmentInitialiser, download_path
 
 from ..discovery import NswVgPublicationDiscovery, NSWVG_LV_DISCOVERY_CFG
 from ._util import select_targets
@@ -18,9 +18,16 @@ _BYO_LV_DIR = '_cfg_byo_lv'
 
 @dataclass(frozen=True)
 class Config:
+    """
+    With `read_from_zip` the csvs are read straight out of
+    their zip rather than extracted to `unzip_dir` first. Like
+    the extracted files, only csvs at the top of the zip are
+    picked up.
+    """
     kind: DiscoveryMode.T
     unzip_dir: str
     byo_dir: str
+    read_from_zip: bool = False
 
 class CsvAbstractDiscovery:
     @abc.abstractmethod
@@ -42,6 +49,12 @@ class ByoCsvDiscovery(CsvAbstractDiscovery):
 
     async def files(self: Self) -> AsyncIterator[NswVgLvTaskDesc.Parse]:
         for target in select_targets(self.config.kind, self.fixtures):
+            if self.config.read_from_zip:
+                zip_path = f'{self.config.byo_dir}/{target.src_dst}.zip'
+                async for task in zip_csv_files(self._io, self._telemetry, zip_path, target):
+                    yield task
+                continue
+
             root_out = f'{self.config.unzip_dir}/{dst_name_from_src_name(target.src_dst)}'
             await self._unzip(target, root_out)
 
@@ -86,7 +99,14 @@ class RemoteCsvDiscovery(CsvAbstractDiscovery):
             await self._web_discovery.load_links(NSWVG_LV_DISCOVERY_CFG),
         )
 
-        async for target in self._env.with_targets(targets):
+        extract = not self.config.read_from_zip
+        async for target in self._env.with_targets(targets, extract=extract):
+            if self.config.read_from_zip:
+                zip_path = download_path(target)
+                async for task in zip_csv_files(self._io, self._telemetry, zip_path, target):
+                    yield task
+                continue
+
             root = f'{self.config.unzip_dir}/{target.zip_dst}'
             for f in sorted(await self._io.ls_dir(root)):
                 if not f.endswith("csv"):
@@ -97,6 +117,18 @@ class RemoteCsvDiscovery(CsvAbstractDiscovery):
                 self._telemetry.record_file_queue(f_path, f_size)
                 yield NswVgLvTaskDesc.Parse(f_path, f_size, target)
 
+async def zip_csv_files(io: IoService,
+                        telemetry: NswVgLvTelemetry,
+                        zip_path: str,
+                        target: ByoLandValue | NswVgTarget) -> AsyncIterator[NswVgLvTaskDesc.Parse]:
+    for name, size in sorted(await io.zip_members(zip_path)):
+        if '/' in name or not name.endswith('csv'):
+            continue
+
+        task = NswVgLvTaskDesc.Parse(zip_path, size, target, zip_member=name)
+        telemetry.record_file_queue(task.source, size)
+        yield task
+
 def dst_name_from_src_name(src_dst: str) -> str:
     prefix, date_str = src_dst.split("_")
     year, month, day = date_str[:4], date_str[4:6], date_str[6:]
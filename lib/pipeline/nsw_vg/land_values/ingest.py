@@ -1,22 +1,24 @@
 import asyncio
-import csv
 from dataclasses import dataclass
-from io import StringIO
 from logging import getLogger
-from multiprocessing import Queue as MpQueue
-import queue
-from typing import AsyncIterator, Self, Any
+from typing import AsyncIterator, Dict, Self, Any
 
 from lib.service.database import DatabaseService
 from lib.service.io import IoService
 from lib.service.uuid import UuidService
+from lib.utility.process import IpcReceiver, IpcSender
 
+from .columnar import columns_from_frame
 from .config import (
+    LandValueLoadMode,
+    LandValueParseMode,
     NswVgLvTaskDesc,
     NswVgLvParentMsg,
     NswVgLvChildMsg,
+    RawLandValueColumns,
     RawLandValueRow,
 )
+from .csv_reader import read_csv_frames, read_csv_records
 
 class NswVgLvWorker:
     _close_requested: bool = False
@@ -80,6 +82,8 @@ class NswVgLvWorker:
         except Exception as e:
             self._stopped = True
             raise e
+        finally:
+            self._coordinator.close()
 
     async def _start_recv(self: Self):
         while not self._close_requested:
@@ -91,7 +95,8 @@ class NswVgLvWorker:
                 case NswVgLvChildMsg.Ingest(task):
                     await self._parse_q.put(task)
                 case None:
-                    continue
+                    self._logger.warning('coordinator hung up without closing')
+                    self._close_requested = True
                 case other:
                     self._logger.warn(f'unknown message {other}')
 
@@ -105,58 +110,128 @@ class NswVgLvWorker:
 
 @dataclass
 class NswVgLvCoordinatorClient:
-    recv_q: MpQueue
-    send_q: MpQueue
+    """
+    The send queue should batch messages, as a message is
+    sent for every chunk parsed & saved. Anything left in
+    the batch is sent on close.
+    """
+    recv_q: IpcReceiver[NswVgLvChildMsg.Base]
+    send_q: IpcSender[NswVgLvParentMsg.Base]
 
     def send_msg(self: Self, msg: NswVgLvParentMsg.Base):
-        self.send_q.put(msg)
+        self.send_q.send(msg)
 
-    async def recv_msg(self: Self):
+    async def recv_msg(self: Self) -> NswVgLvChildMsg.Base | None:
         """
-        It is important to add this timeout otherwise we can
-        block the parent thread from exiting.
+        Returns None once the coordinator has hung up.
         """
-        try:
-            return await asyncio.to_thread(self.recv_q.get, timeout=0.1)
-        except queue.Empty:
-            return None
+        return await self.recv_q.get()
+
+    def close(self: Self) -> None:
+        self.send_q.close()
+        self.recv_q.close()
 
 class NswVgLvIngestion:
+    """
+    Files are read `read_size` bytes at a time & parsed as
+    they're read, so only the rows waiting to be loaded are
+    held in memory rather than the whole file.
+
+    Csvs still in their zip are decompressed as they're read,
+    and their rows are attributed to `{zip}/{member}`.
+
+    With the `columns` parse mode, batches are parsed by the
+    pandas C parser & validated a column at a time, which are
+    passed to the loader as `RawLandValueColumns`.
+
+    With the `copy` load mode, batches are written with a
+    binary COPY rather than an INSERT per row.
+    """
     _logger = getLogger(f'{__name__}.NswVgLvIngestion')
 
     def __init__(self: Self,
                  chunk_size: int,
                  uuid: UuidService,
                  io: IoService,
-                 db: DatabaseService):
+                 db: DatabaseService,
+                 read_size: int = 2 ** 20,
+                 parse_mode: LandValueParseMode = 'rows',
+                 load_mode: LandValueLoadMode = 'insert'):
         self.chunk_size = chunk_size
         self._uuid = uuid
         self._io = io
         self._db = db
+        self._read_size = read_size
+        self._parse_mode = parse_mode
+        self._load_mode = load_mode
 
-    async def parse(self: Self, task: NswVgLvTaskDesc.Parse) -> AsyncIterator[NswVgLvTaskDesc.Load]:
-        quasi_file = StringIO(await self._get_data(task.file))
+    def parse(self: Self, task: NswVgLvTaskDesc.Parse) -> AsyncIterator[NswVgLvTaskDesc.Load]:
+        match self._parse_mode:
+            case 'rows':
+                return self._parse_rows(task)
+            case 'columns':
+                return self._parse_columns(task)
+            case other:
+                raise ValueError(f'unknown parse mode {other}')
+
+    def _read_chunks(self: Self, task: NswVgLvTaskDesc.Parse) -> AsyncIterator[bytes]:
+        if task.zip_member is None:
+            return self._io.f_read_chunks(task.file, self._read_size)
+        return self._io.f_read_zip_member_chunks(task.file, task.zip_member, self._read_size)
+
+    async def _parse_columns(self: Self, task: NswVgLvTaskDesc.Parse) -> AsyncIterator[NswVgLvTaskDesc.Load]:
+        offset = 0
+        async for frame in read_csv_frames(self._read_chunks(task), self.chunk_size):
+            columns = columns_from_frame(frame, offset + 1, task.source, task.target.datetime)
+            yield NswVgLvTaskDesc.Load(task.source, offset, columns)
+            await asyncio.sleep(0)
+            offset += len(columns)
+
+    async def _parse_rows(self: Self, task: NswVgLvTaskDesc.Parse) -> AsyncIterator[NswVgLvTaskDesc.Load]:
         offset = 0
-        batch = []
-        for index, row_raw in enumerate(csv.DictReader(quasi_file)):
-            batch.append(RawLandValueRow.from_row(
-                row_raw,
-                self._uuid.get_uuid4_hex(),
-                index + 1,
-                task.file,
-                task.target.datetime,
-            ))
-
-            if len(batch) >= self.chunk_size:
-                yield NswVgLvTaskDesc.Load(task.file, offset, batch)
-                await asyncio.sleep(0)
-                offset += self.chunk_size
-                batch = []
-
-        if batch:
-            yield NswVgLvTaskDesc.Load(task.file, offset, batch)
+        async for records in read_csv_records(self._read_chunks(task), self.chunk_size):
+            batch = [
+                RawLandValueRow.from_row(
+                    row_raw,
+                    self._uuid.get_uuid4_hex(),
+                    offset + index + 1,
+                    task.source,
+                    task.target.datetime,
+                )
+                for index, row_raw in enumerate(records)
+            ]
+            yield NswVgLvTaskDesc.Load(task.source, offset, batch)
+            await asyncio.sleep(0)
+            offset += len(batch)
 
     async def load(self: Self, task: NswVgLvTaskDesc.Load):
+        match self._load_mode:
+            case 'insert':
+                await self._load_insert(task)
+            case 'copy':
+                await self._load_copy(task)
+            case other:
+                raise ValueError(f'unknown load mode {other}')
+
+    async def _load_copy(self: Self, task: NswVgLvTaskDesc.Load):
+        columns, types, values = get_copy_values(task)
+        column_str = ', '.join(columns)
+
+        try:
+            async with self._db.async_connect() as conn:
+                async with conn.cursor() as cursor:
+                    async with cursor.copy(f"""
+                        COPY nsw_vg_raw.land_value_row ( {column_str} )
+                        FROM STDIN (FORMAT BINARY)
+                    """) as copy:
+                        copy.set_types(types)
+                        for row in values:
+                            await copy.write_row(row)
+        except Exception as e:
+            self._logger.error(f'failed to copy {task.file}')
+            raise e
+
+    async def _load_insert(self: Self, task: NswVgLvTaskDesc.Load):
         column_str, values_str, values = get_load_values(task)
 
         try:
@@ -170,15 +245,41 @@ class NswVgLvIngestion:
             self._logger.error(f'failed to ingest {task.file}')
             raise e
 
-    async def _get_data(self: Self, f: str) -> str:
-        try:
-            return await self._io.f_read(f, encoding='utf-8')
-        except UnicodeDecodeError:
-            return await self._io.f_read(f, encoding='ISO-8859-1')
-
 def get_load_values(task: NswVgLvTaskDesc.Load) -> tuple[str, str, list[list[Any]]]:
-    columns = task.rows[0].db_columns()
+    columns, values = _get_columns_and_values(task)
     column_str = ', '.join(columns)
     values_str = ', '.join(['%s'] * len(columns))
-    values = [[getattr(row, name) for name in columns] for row in task.rows]
     return column_str, values_str, values
+
+_COPY_TYPES: Dict[str, str] = {
+    'district_code': 'int4',
+    'property_id': 'int4',
+    'area': 'float8',
+    'source_line_number': 'int4',
+    **{ f'base_date_{n}': 'date' for n in range(1, 6) },
+    **{ f'land_value_{n}': 'int8' for n in range(1, 6) },
+    'source_date': 'date',
+}
+
+def get_copy_values(task: NswVgLvTaskDesc.Load) -> tuple[list[str], list[str], list[list[Any]]]:
+    """
+    Columns, their binary COPY types & values. Binary COPY
+    doesn't cast, so land values are rounded to whole dollars
+    like the INSERT's float to BIGINT cast, & the zone standard
+    enum is sent as text, which has the same binary format.
+    """
+    columns, values = _get_columns_and_values(task)
+    types = [_COPY_TYPES.get(c, 'text') for c in columns]
+
+    rounded = [i for i, c in enumerate(columns) if _COPY_TYPES.get(c) == 'int8']
+    for row in values:
+        for i in rounded:
+            if row[i] is not None:
+                row[i] = round(row[i])
+    return columns, types, values
+
+def _get_columns_and_values(task: NswVgLvTaskDesc.Load) -> tuple[list[str], list[list[Any]]]:
+    if isinstance(task.rows, RawLandValueColumns):
+        return task.rows.db_columns(), task.rows.db_values()
+    columns = task.rows[0].db_columns()
+    return columns, [[getattr(row, name) for name in columns] for row in task.rows]
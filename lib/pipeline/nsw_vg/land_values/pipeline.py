@@ -1,10 +1,11 @@
 import asyncio
 from dataclasses import dataclass, field
 from logging import getLogger
-from multiprocessing import Process, Queue as MpQueue
-import queue
+from multiprocessing import Process
 from typing import List, Self
 
+from lib.utility.process import IpcReceiver, IpcSender
+
 from .config import NswVgLvChildMsg, NswVgLvParentMsg
 from .discovery import CsvAbstractDiscovery
 from .telemetry import NswVgLvTelemetry
@@ -12,10 +13,10 @@ from .telemetry import NswVgLvTelemetry
 class NswVgLvPipeline:
     _logger = getLogger(f'{__name__}.NswVgLvPipeline')
     _workers: List['WorkerClient']
-    _recv_q: MpQueue
+    _recv_q: IpcReceiver[NswVgLvParentMsg.Base]
 
     def __init__(self: Self,
-                 recv_queue: MpQueue,
+                 recv_queue: IpcReceiver[NswVgLvParentMsg.Base],
                  telemetry: NswVgLvTelemetry,
                  discovery: CsvAbstractDiscovery):
         self._recv_q = recv_queue
@@ -40,32 +41,24 @@ class NswVgLvPipeline:
             raise e
         finally:
             recv_t.cancel()
+            self._recv_q.close()
 
     def kill(self: Self):
         for worker in self._workers:
             worker.kill()
 
     async def _start_listening(self: Self):
-        async def next_message():
-            """
-            It is important to add this timeout otherwise we can
-            block the parent thread from exiting.
-            """
-            try:
-                return await asyncio.to_thread(self._recv_q.get, timeout=0.1)
-            except queue.Empty:
-                return None
-
         while True:
-            message = await next_message()
+            message = await self._recv_q.get()
             self._logger.debug(f"message received {message}")
             match message:
                 case None:
-                    continue
+                    self._logger.debug('all workers have hung up')
+                    return
                 case NswVgLvParentMsg.FileRowsParsed(id, file, rows):
                     self._telemetry.record_file_parse(file, rows)
                 case NswVgLvParentMsg.FileRowsSaved(id, file, rows):
-                    self._telemetry.record_file_saved(file, rows)
+                    self._telemetry.record_file_saved(file, rows, id)
                 case other:
                     self._logger.warn(f'unknown message {other}')
 
@@ -76,15 +69,16 @@ class NswVgLvPipeline:
 class WorkerClient:
     id: int
     process: Process
-    send_q: MpQueue
+    send_q: IpcSender[NswVgLvChildMsg.Base]
     workload: int = field(default = 0)
 
     def send(self: Self, msg: NswVgLvChildMsg.Base):
         self.workload += msg.workload()
-        self.send_q.put(msg)
+        self.send_q.send(msg)
 
     async def join(self: Self):
         self.send(NswVgLvChildMsg.RequestClose())
+        self.send_q.close()
         await asyncio.create_task(asyncio.to_thread(self.process.join))
         match self.process.exitcode:
             case 0: return
@@ -10,13 +10,21 @@ from lib.utility.format import fmt_time_elapsed
 class WorkerStatistics:
     allocated: int = field(default=0)
     completed: int = field(default=0)
+    rows_saved: int = field(default=0)
+    started: float = field(default=0.0)
 
     def __add__(self: Self, other: 'WorkerStatistics') -> 'WorkerStatistics':
         return WorkerStatistics(
             allocated=self.allocated + other.allocated,
             completed=self.completed + other.completed,
+            rows_saved=self.rows_saved + other.rows_saved,
+            started=min(self.started, other.started),
         )
 
+    def rows_per_second(self: Self, now: float) -> float:
+        elapsed = now - self.started
+        return self.rows_saved / elapsed if elapsed > 0 else 0.0
+
     def __str__(self: Self) -> str:
         p = self.completed / self.allocated
         return f"Done {p:.2f}% In {self.allocated} Out {self.completed}"
@@ -55,7 +63,7 @@ class NswVgLvTelemetry:
         return NswVgLvTelemetry(clock, start_time)
 
     def establish_worker(self: Self, id: int):
-        self._workers[id] = WorkerStatistics()
+        self._workers[id] = WorkerStatistics(started=self._clock.time())
 
     def record_work_allocation(self: Self, worker_id: int, size: int):
         self._workers[worker_id].allocated += size
@@ -73,10 +81,19 @@ class NswVgLvTelemetry:
         self._files[file].rows_parsed += rows
         self._log_status("PARSE FILE")
 
-    def record_file_saved(self: Self, file: str, rows: int):
+    def record_file_saved(self: Self, file: str, rows: int, worker_id: int | None = None):
         self._files[file].rows_ingested += rows
+        if worker_id is not None:
+            self._workers[worker_id].rows_saved += rows
         self._log_status("SAVED FILE")
 
+    def rows_per_second(self: Self) -> dict[int, float]:
+        """
+        Rows saved per second by each worker, since it started.
+        """
+        now = self._clock.time()
+        return { id: w.rows_per_second(now) for id, w in self._workers.items() }
+
     def get_total(self) -> Tuple[FileStatistics, WorkerStatistics]:
         return (
             reduce(lambda a, b: a + b, self._files.values()),
@@ -88,4 +105,5 @@ class NswVgLvTelemetry:
         total, workers = self.get_total()
         t = fmt_time_elapsed(self._start_time, self._clock.time(), 'hms')
         self.total_state = total
-        self._logger.info(f"{event.rjust(10)} ({t}) {str(total)}")
+        rates = ' '.join(f'{id}:{rate:.0f}' for id, rate in self.rows_per_second().items())
+        self._logger.info(f"{event.rjust(10)} ({t}) {str(total)} Rows/s {rates}")
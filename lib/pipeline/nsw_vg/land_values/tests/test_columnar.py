@@ -0,0 +1,76 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+
+from lib.service.database.mock import MockDatabaseService
+from lib.service.io import IoServiceImpl
+from lib.service.uuid.mocks import MockUuidService
+from ..columnar import columns_from_frame
+from ..config import ByoLandValue, NswVgLvTaskDesc, RawLandValueColumns
+from ..ingest import NswVgLvIngestion, get_load_values
+
+_FIXTURES = [
+    './_fixtures/lv_20240701_fake.csv',
+    './_fixtures/lv_20230701_fake_latin1.csv',
+]
+
+async def _parse(file_path: str, parse_mode, read_size: int) -> list[NswVgLvTaskDesc.Load]:
+    io = IoServiceImpl.create(None)
+    uuid = MockUuidService(values=[str(i) for i in range(0, 1000)])
+    ingestion = NswVgLvIngestion(40, uuid, io, MockDatabaseService(),
+                                 read_size=read_size,
+                                 parse_mode=parse_mode)
+    target = ByoLandValue(src_dst='lv_fake', datetime=datetime(2024, 7, 1))
+    task = NswVgLvTaskDesc.Parse(file_path, await io.f_size(file_path), target)
+    return [load async for load in ingestion.parse(task)]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('file_path', _FIXTURES)
+@pytest.mark.parametrize('read_size', [97, 2 ** 20])
+async def test_columns_match_rows(file_path: str, read_size: int) -> None:
+    row_loads = await _parse(file_path, 'rows', read_size)
+    col_loads = await _parse(file_path, 'columns', read_size)
+
+    assert all(isinstance(l.rows, RawLandValueColumns) for l in col_loads)
+    assert [(l.file, l.offset, len(l.rows)) for l in col_loads] \
+        == [(l.file, l.offset, len(l.rows)) for l in row_loads]
+
+    for col_load, row_load in zip(col_loads, row_loads):
+        col_columns, _, col_values = get_load_values(col_load)
+        row_columns, _, row_values = get_load_values(row_load)
+        assert col_columns == row_columns
+        assert col_values == row_values
+        assert [[type(v) for v in r] for r in col_values] \
+            == [[type(v) for v in r] for r in row_values]
+
+def _frame(**overrides: str) -> pd.DataFrame:
+    record = {
+        'DISTRICT CODE': '1', 'DISTRICT NAME': '', 'PROPERTY ID': '2',
+        'PROPERTY TYPE': 'NORMAL', 'PROPERTY NAME': '', 'UNIT NUMBER': '',
+        'HOUSE NUMBER': '1', 'STREET NAME': 'KING ST', 'SUBURB NAME': 'GLEBE',
+        'POSTCODE': '2037', 'PROPERTY DESCRIPTION': '1/234567', 'ZONE CODE': 'R2',
+        'AREA': '100', 'AREA TYPE': 'M',
+        **{
+            k: ''
+            for n in range(1, 6)
+            for k in [f'LAND VALUE {n}', f'BASE DATE {n}', f'AUTHORITY {n}', f'BASIS {n}']
+        },
+        **overrides,
+    }
+    return pd.DataFrame([record], dtype=str)
+
+def test_invalid_rows_fail_like_from_row() -> None:
+    with pytest.raises(Exception, match='Failed to read INT district_code'):
+        columns_from_frame(_frame(**{'DISTRICT CODE': 'x'}), 1, 'f', datetime(2024, 1, 1))
+    with pytest.raises(Exception, match='Failed to read STR suburb_name'):
+        columns_from_frame(_frame(**{'SUBURB NAME': ''}), 1, 'f', datetime(2024, 1, 1))
+    with pytest.raises(ValueError, match='Unknown area unit Q'):
+        columns_from_frame(_frame(**{'AREA TYPE': 'Q'}), 1, 'f', datetime(2024, 1, 1))
+
+def test_falls_back_to_from_row() -> None:
+    # too big for an int64 column, but fine for int()
+    frame = _frame(**{'PROPERTY ID': '99999999999999999999'})
+    columns = columns_from_frame(frame, 7, 'f', datetime(2024, 1, 1))
+    assert columns.columns['property_id'] == [99999999999999999999]
+    assert columns.columns['source_line_number'] == [7]
+    assert columns.db_columns() == RawLandValueColumns.from_rows([]).db_columns()
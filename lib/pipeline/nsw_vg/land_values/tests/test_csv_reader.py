@@ -0,0 +1,104 @@
+import csv
+from io import StringIO
+import pytest
+from typing import AsyncIterator, List
+
+from lib.service.io import IoServiceImpl
+from ..csv_reader import (
+    FallbackDecoder,
+    read_csv_frames,
+    read_csv_records,
+    split_complete_records,
+)
+
+_FIXTURES = ['./_fixtures/lv_20240701_fake.csv', './_fixtures/lv_20230701_fake_latin1.csv']
+
+def _read_whole_file(file_path: str):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except UnicodeDecodeError:
+        with open(file_path, 'r', encoding='ISO-8859-1') as f:
+            text = f.read()
+    return list(csv.DictReader(StringIO(text)))
+
+async def _chunks(data: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in data:
+        yield chunk
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_path", _FIXTURES)
+@pytest.mark.parametrize("read_size", [1, 7, 64, 4096, 2 ** 20])
+async def test_records_match_whole_file(file_path: str, read_size: int):
+    io = IoServiceImpl.create(None)
+    batches = [
+        batch
+        async for batch in read_csv_records(io.f_read_chunks(file_path, read_size), 40)
+    ]
+    assert all(len(b) == 40 for b in batches[:-1])
+    assert [r for b in batches for r in b] == _read_whole_file(file_path)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_path", _FIXTURES)
+@pytest.mark.parametrize("read_size", [7, 64, 4096, 2 ** 20])
+async def test_frames_match_whole_file(file_path: str, read_size: int):
+    io = IoServiceImpl.create(None)
+    frames = [
+        frame
+        async for frame in read_csv_frames(io.f_read_chunks(file_path, read_size), 40)
+    ]
+    assert all(len(f) == 40 for f in frames[:-1])
+    assert [r for f in frames for r in f.to_dict('records')] == _read_whole_file(file_path)
+
+@pytest.mark.asyncio
+async def test_frames_with_quoted_newlines_and_short_records():
+    data = [b'a,b\n1,"x', b'\n', b'y"\n\n2', b'\n3,z']
+    records = [r async for f in read_csv_frames(_chunks(data), 2) for r in f.to_dict('records')]
+    assert records == [
+        {'a': '1', 'b': 'x\ny'},
+        {'a': '2', 'b': ''},
+        {'a': '3', 'b': 'z'},
+    ]
+
+@pytest.mark.asyncio
+async def test_quoted_newlines_across_chunks():
+    data = [b'a,b\n1,"x', b'\n', b'y"\n2,"""', b'q""', b'"\n3,z']
+    records = [r async for b in read_csv_records(_chunks(data), 10) for r in b]
+    assert records == [
+        {'a': '1', 'b': 'x\ny'},
+        {'a': '2', 'b': '"q"'},
+        {'a': '3', 'b': 'z'},
+    ]
+
+def test_split_complete_records():
+    assert split_complete_records('a,b\n1,"x\ny"\n2,"z') == (['a,b\n', '1,"x\n', 'y"\n'], '2,"z')
+    assert split_complete_records('1,"x\n\n') == ([], '1,"x\n\n')
+    # quotes only start a quoted field at the start of a field
+    assert split_complete_records('1,x"y\n2,z\n3') == (['1,x"y\n', '2,z\n'], '3')
+    assert split_complete_records('1,"x"y,"\nz"\n3') == (['1,"x"y,"\n', 'z"\n'], '3')
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("read_size", [1, 5, 4096])
+async def test_stray_quote_in_unquoted_field(read_size: int):
+    text = 'a,b\n1,12" PIPE\n2,"x\ny"\n3,z\n'
+    data = text.encode('utf-8')
+    chunks = [data[i:i + read_size] for i in range(0, len(data), read_size)]
+    expected = list(csv.DictReader(StringIO(text)))
+    assert expected[0] == {'a': '1', 'b': '12" PIPE'}
+
+    records = [r async for b in read_csv_records(_chunks(chunks), 10) for r in b]
+    assert records == expected
+    frames = [r async for f in read_csv_frames(_chunks(chunks), 10) for r in f.to_dict('records')]
+    assert frames == expected
+
+def test_decoder_keeps_split_utf8_characters():
+    decoder = FallbackDecoder()
+    data = 'é\r\nü'.encode('utf-8')
+    text = ''.join(decoder.decode(data[i:i + 1]) for i in range(len(data)))
+    assert text + decoder.decode(b'', final=True) == 'é\nü'
+
+def test_decoder_falls_back_for_the_rest_of_the_file():
+    decoder = FallbackDecoder()
+    assert decoder.decode('ü'.encode('utf-8')) == 'ü'
+    assert decoder.decode('é st'.encode('ISO-8859-1')) == 'é st'
+    assert decoder.decode('ü'.encode('utf-8')) == 'Ã¼'
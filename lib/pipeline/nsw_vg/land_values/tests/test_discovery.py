@@ -61,9 +61,32 @@ async def test_unzip_behaviour():
         ]
     ]
 
+@pytest.mark.asyncio
+async def test_read_from_zip_behaviour():
+    dt = datetime(2012, 1, 1)
+    target = ByoLandValue('LV_20120101', dt)
 
+    io = AsyncMock(spec=IoService)
+    tel = AsyncMock(spec=NswVgLvTelemetry)
+    cfg = Config(DiscoveryMode.Latest(), 'unzip_root', 'byo_root', read_from_zip=True)
 
+    io.zip_members.return_value = [
+        ('b.csv', 200),
+        ('a.csv', 100),
+        ('readme.txt', 10),
+        ('nested/c.csv', 300),
+    ]
+    dis = ByoCsvDiscovery(cfg, io, tel, [target])
+    parse_tasks = [t async for t in dis.files()]
 
+    io.extract_zip.assert_not_called()
+    io.zip_members.assert_called_once_with('byo_root/LV_20120101.zip')
+    tel.record_file_queue.assert_has_calls([
+        call('byo_root/LV_20120101.zip/a.csv', 100),
+        call('byo_root/LV_20120101.zip/b.csv', 200),
+    ])
 
-
-
+    assert parse_tasks == [
+        NswVgLvTaskDesc.Parse('byo_root/LV_20120101.zip', 100, target, zip_member='a.csv'),
+        NswVgLvTaskDesc.Parse('byo_root/LV_20120101.zip', 200, target, zip_member='b.csv'),
+    ]
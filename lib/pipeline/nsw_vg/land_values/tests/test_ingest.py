@@ -1,13 +1,19 @@
+from datetime import datetime
 import pytest
+import zipfile
 from unittest.mock import AsyncMock
 
 from lib.service.database.mock import MockDatabaseService, clean_sql
-from lib.service.io import IoService
+from lib.service.io import IoService, IoServiceImpl
 from lib.service.uuid.mocks import MockUuidService
 from .mocks import get_mock_row
-from ..config import NswVgLvTaskDesc, RawLandValueRow
+from ..config import ByoLandValue, NswVgLvTaskDesc, RawLandValueRow
 from ..ingest import NswVgLvIngestion, get_load_values
 
+def _rows(load: NswVgLvTaskDesc.Load) -> list[RawLandValueRow]:
+    assert isinstance(load.rows, list)
+    return load.rows
+
 @pytest.mark.asyncio
 async def test_load_task() -> None:
     db = MockDatabaseService()
@@ -28,3 +34,79 @@ async def test_load_task() -> None:
         values,
     )
 
+
+@pytest.mark.asyncio
+async def test_copy_load_task() -> None:
+    db = MockDatabaseService()
+    io = AsyncMock(spec=IoService)
+    uuid = MockUuidService(values=[])
+    ingestion = NswVgLvIngestion(100, uuid, io, db, load_mode='copy')
+    rows = [
+        get_mock_row(property_id=0, land_value_1=2500.5),
+        get_mock_row(property_id=1, land_value_1=2501.5),
+    ]
+    load_task = NswVgLvTaskDesc.Load(file='mock', offset=0, rows=rows)
+    column_str, _, values = get_load_values(load_task)
+
+    await ingestion.load(load_task)
+
+    [(statement, types, copied)] = db.state.copy_args
+    assert statement == clean_sql(f'''
+        COPY nsw_vg_raw.land_value_row ( {column_str} )
+        FROM STDIN (FORMAT BINARY)
+    ''')
+    columns = column_str.split(', ')
+    assert types is not None
+    assert types[columns.index('land_value_1')] == 'int8'
+    assert types[columns.index('property_id')] == 'int4'
+    assert types[columns.index('base_date_1')] == 'date'
+    assert types[columns.index('zone_standard')] == 'text'
+
+    # rounded half to even, same as postgres casting float8 to int8
+    i = columns.index('land_value_1')
+    assert [r[i] for r in copied] == [2500, 2502]
+    assert [r[:i] + r[i + 1:] for r in copied] == [r[:i] + r[i + 1:] for r in values]
+
+@pytest.mark.asyncio
+async def test_parse_task() -> None:
+    file_path = './_fixtures/lv_20240701_fake.csv'
+    target = ByoLandValue(src_dst='lv_20240701_fake', datetime=datetime(2024, 7, 1))
+    io = IoServiceImpl.create(None)
+    uuid = MockUuidService(values=[str(i) for i in range(0, 150)])
+    ingestion = NswVgLvIngestion(40, uuid, io, MockDatabaseService(), read_size=512)
+    task = NswVgLvTaskDesc.Parse(file_path, await io.f_size(file_path), target)
+
+    loads = [load async for load in ingestion.parse(task)]
+    assert [(l.offset, len(l.rows)) for l in loads] == [(0, 40), (40, 40), (80, 40), (120, 30)]
+    assert [r.source_line_number for l in loads for r in _rows(l)] == list(range(1, 151))
+    assert {r.source_date for l in loads for r in _rows(l)} == {datetime(2024, 7, 1)}
+
+@pytest.mark.asyncio
+async def test_parse_task_from_zip(tmp_path) -> None:
+    zip_path = str(tmp_path / 'lv_20240701_fake.zip')
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        z.write('./_fixtures/lv_20240701_fake.csv', 'lv_20240701_fake.csv')
+
+    target = ByoLandValue(src_dst='lv_20240701_fake', datetime=datetime(2024, 7, 1))
+    io = IoServiceImpl.create(None)
+    [(member, size)] = await io.zip_members(zip_path)
+    assert size == await io.f_size('./_fixtures/lv_20240701_fake.csv')
+
+    def ingestion() -> NswVgLvIngestion:
+        uuid = MockUuidService(values=[str(i) for i in range(0, 150)])
+        return NswVgLvIngestion(40, uuid, io, MockDatabaseService(), read_size=512)
+
+    zip_task = NswVgLvTaskDesc.Parse(zip_path, size, target, zip_member=member)
+    csv_task = NswVgLvTaskDesc.Parse('./_fixtures/lv_20240701_fake.csv', size, target)
+    zip_loads = [load async for load in ingestion().parse(zip_task)]
+    csv_loads = [load async for load in ingestion().parse(csv_task)]
+
+    assert {l.file for l in zip_loads} == {f'{zip_path}/lv_20240701_fake.csv'}
+    assert {r.source_file_name for l in zip_loads for r in _rows(l)} == {f'{zip_path}/lv_20240701_fake.csv'}
+    assert [(l.offset, len(l.rows)) for l in zip_loads] == [(l.offset, len(l.rows)) for l in csv_loads]
+    def values(loads):
+        return [
+            [getattr(r, c) for c in r.db_columns() if c != 'source_file_name']
+            for l in loads for r in _rows(l)
+        ]
+    assert values(zip_loads) == values(csv_loads)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from lib.service.clock.mocks import MockClockService
+from ..telemetry import NswVgLvTelemetry
+
+def test_rows_per_second_per_worker():
+    clock = MockClockService(dt=datetime(2024, 1, 1))
+    telemetry = NswVgLvTelemetry.create(clock)
+    telemetry.establish_worker(0)
+    telemetry.establish_worker(1)
+    telemetry.record_file_queue('a.csv', 100)
+
+    clock.tick_time(4)
+    telemetry.record_file_parse('a.csv', 3000)
+    telemetry.record_file_saved('a.csv', 1000, 0)
+    telemetry.record_file_saved('a.csv', 2000, 1)
+    telemetry.record_file_saved('a.csv', 200)
+
+    assert telemetry.rows_per_second() == {0: 250.0, 1: 500.0}
+    files, workers = telemetry.get_total()
+    assert files.rows_ingested == 3200
+    assert workers.rows_saved == 3000
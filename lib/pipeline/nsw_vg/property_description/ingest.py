@@ -5,12 +5,19 @@ from logging import getLogger
 from multiprocessing import Process, Queue as MpQueue
 from multiprocessing.synchronize import Semaphore as MpSemaphore
 import time
-from typing import Dict, List, Optional, Self, Callable, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Self, Sequence, Callable, Tuple
 import uuid
 
 from lib.service.database import DatabaseService
-from lib.pipeline.nsw_lrs.property_description.parse import parse_property_description_data
-from lib.pipeline.nsw_lrs.property_description import PropertyDescription
+from lib.pipeline.nsw_lrs.property_description.parse import (
+    ParseCache,
+    parse_property_description_data,
+)
+from lib.pipeline.nsw_lrs.property_description import (
+    BaseParcelKind,
+    get_base_parcel_id,
+    get_base_parcel_kind,
+)
 from .type import ParentMessage, PartitionSlice
 from .work_partitioner import WorkPartitioner
 
@@ -81,17 +88,33 @@ class PropDescIngestionSupervisor:
 
 
 class PropDescIngestionWorker:
+    """
+    Each sub worker reads its partition from a temp table with
+    a server side cursor, while the pages it's already read are
+    parsed & inserted over a second connection. At most
+    `prefetch` pages are read ahead of the inserts.
+
+    Sub workers share the `parse_cache`, if there is one, the
+    lookups made with it are reported after each page.
+    """
     _logger = getLogger(f'{__name__}.Worker')
 
     def __init__(self: Self,
                  process_id: int,
                  queue: MpQueue,
                  semaphore: MpSemaphore,
-                 db: DatabaseService) -> None:
+                 db: DatabaseService,
+                 fetch_size: int = 100,
+                 prefetch: int = 2,
+                 parse_cache: Optional[ParseCache] = None) -> None:
         self.process_id = process_id
         self._queue = queue
         self._semaphore = semaphore
         self._db = db
+        self._fetch_size = fetch_size
+        self._prefetch = prefetch
+        self._parse_cache = parse_cache
+        self._cache_reported = parse_cache.stats() if parse_cache else None
 
     async def ingest(self: Self, partitions: List[PartitionSlice]) -> None:
         self._logger.debug("Starting sub workers")
@@ -100,7 +123,6 @@ class PropDescIngestionWorker:
         self._logger.debug("Finished ingesting")
 
     async def worker(self: Self, worker_id: int, partition: PartitionSlice) -> None:
-        limit = 100
         temp_table_name = f"q_{uuid.uuid4().hex[:8]}"
 
         def on_ingest_page(amount: int):
@@ -111,6 +133,15 @@ class PropDescIngestionWorker:
             pid, wid = self.process_id, worker_id
             self._queue.put(ParentMessage.Queued(pid, wid, amount))
 
+        def on_parse_cache_used():
+            if self._parse_cache is None or self._cache_reported is None:
+                return
+            stats = self._parse_cache.stats()
+            usage, self._cache_reported = stats - self._cache_reported, stats
+            pid, wid = self.process_id, worker_id
+            self._queue.put(ParentMessage.ParseCacheUsage(
+                pid, wid, usage.hits + usage.file_hits, usage.misses))
+
         async with self._db.async_connect() as conn, conn.cursor() as cursor:
             self._logger.debug(f'creating temp table {temp_table_name}')
             await self.create_temp_table(partition, temp_table_name, cursor)
@@ -119,9 +150,33 @@ class PropDescIngestionWorker:
             count = (await cursor.fetchone())[0]
             on_ingest_queued(count)
 
-            for offset in range(0, count, limit):
-                await self.ingest_page(conn, cursor, temp_table_name, offset, limit)
-                on_ingest_page(min(limit, count - offset))
+            pages: asyncio.Queue[List[Tuple[Any, ...]] | None] = asyncio.Queue(maxsize=self._prefetch)
+
+            async def read_pages() -> None:
+                async for page in self.read_pages(conn, temp_table_name):
+                    await pages.put(page)
+                await pages.put(None)
+
+            async with self._db.async_connect() as w_conn, w_conn.cursor() as w_cursor:
+                await w_cursor.execute("SET session_replication_role = 'replica'")
+                await self.create_stage_tables(w_cursor)
+                reader = asyncio.create_task(read_pages())
+                try:
+                    while (page := await _next_page(pages, reader)) is not None:
+                        await self.ingest_page(w_conn, w_cursor, page)
+                        on_ingest_page(len(page))
+                        on_parse_cache_used()
+                    await reader
+                except BaseException:
+                    # a failed statement aborts the transaction, so it's
+                    # rolled back first or the reset below fails as well
+                    # & hides what actually went wrong
+                    await w_conn.rollback()
+                    raise
+                finally:
+                    reader.cancel()
+                    await w_cursor.execute("SET session_replication_role = 'origin'")
+                    await w_conn.commit()
 
 
             self._logger.debug(f"{temp_table_name}: DONE")
@@ -130,71 +185,123 @@ class PropDescIngestionWorker:
                 SET session_replication_role = 'origin';
             """)
 
-    async def ingest_page(self: Self,
-                          conn,
-                          cursor,
-                          table_name: str,
-                          offset: int,
-                          limit: int) -> None:
+    async def read_pages(self: Self, conn, table_name: str) -> AsyncIterator[List[Tuple[Any, ...]]]:
+        """
+        Streams the temp table in pages of `fetch_size` through
+        a named (server side) cursor, so each page continues on
+        from the last rather than rescanning with an offset.
+        """
         try:
-            await cursor.execute(f"""
-                SELECT source_id,
-                       legal_description,
-                       legal_description_id,
-                       property_id,
-                       effective_date
-                  FROM pg_temp.{table_name}
-                  LIMIT {limit} OFFSET {offset}
-            """)
+            async with conn.cursor(name=f'{table_name}_reader') as cursor:
+                await cursor.execute(f"""
+                    SELECT source_id,
+                           legal_description,
+                           legal_description_id,
+                           property_id,
+                           effective_date
+                      FROM pg_temp.{table_name}
+                """)
+                while page := await cursor.fetchmany(self._fetch_size):
+                    yield page
         except Exception as e:
             self._logger.error(e)
             raise e
 
-        rows: List[Tuple[str, PropertyDescription, str, str, str, str]] = [
-            (r[0], *parse_property_description_data(r[1]), r[2], r[3], r[4])
-            for r in await cursor.fetchall()
-        ]
+    async def create_stage_tables(self: Self, cursor) -> None:
+        """
+        Pages are copied into these before being inserted into
+        their targets. The rows are dropped whenever a page is
+        committed, so they're only created once per connection.
+        """
+        await cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS pg_temp.pd_base_parcel_stage (
+              base_parcel_id TEXT NOT NULL,
+              base_parcel_kind TEXT NOT NULL
+            ) ON COMMIT DELETE ROWS;
+
+            CREATE TEMP TABLE IF NOT EXISTS pg_temp.pd_folio_stage (
+              folio_id TEXT NOT NULL,
+              folio_plan TEXT NOT NULL,
+              folio_section TEXT,
+              folio_lot TEXT NOT NULL,
+              base_parcel_id TEXT NOT NULL
+            ) ON COMMIT DELETE ROWS;
+
+            CREATE TEMP TABLE IF NOT EXISTS pg_temp.pd_property_folio_stage (
+              source_id UUID NOT NULL,
+              effective_date DATE NOT NULL,
+              property_id INT NOT NULL,
+              folio_id TEXT NOT NULL,
+              base_parcel_id TEXT NOT NULL,
+              partial BOOLEAN NOT NULL
+            ) ON COMMIT DELETE ROWS;
+
+            CREATE TEMP TABLE IF NOT EXISTS pg_temp.pd_remains_stage (
+              legal_description_remains TEXT NOT NULL,
+              legal_description_id UUID NOT NULL
+            ) ON COMMIT DELETE ROWS;
+        """)
 
-        remains: List[Tuple[str, str]] = [
-            (remains, legal_description_id)
-            for _, _, remains, legal_description_id, _, _ in rows
-            if remains
-        ]
-        row_data: List[Tuple[str, PropertyDescription, str, str]]  = [
-            (source, property_desc, property, effective_date)
-            for source, property_desc, _, _, property, effective_date in rows
+    async def ingest_page(self: Self,
+                          conn,
+                          cursor,
+                          page: List[Tuple[Any, ...]]) -> None:
+        """
+        Folios are deduplicated here & their base parcels worked
+        out in python, then each table is copied into its stage
+        and inserted with one statement, committing once a page.
+        """
+        base_parcels: Dict[str, BaseParcelKind] = {}
+        folios: Dict[str, Tuple[str, str, Optional[str], str, str]] = {}
+        property_folios: Dict[Tuple[Any, ...], None] = {}
+        remains: Dict[Tuple[str, Any], None] = {}
+
+        for source, legal_description, legal_description_id, property, effective_date in page:
+            property_desc, remain = self._parse(legal_description)
+            if remain:
+                remains[(remain, legal_description_id)] = None
+
+            for folio_list, partial in [
+                (property_desc.folios.partial, True),
+                (property_desc.folios.complete, False),
+            ]:
+                for folio in folio_list:
+                    if folio.id not in folios:
+                        base_parcel_id = get_base_parcel_id(folio.id)
+                        base_parcels.setdefault(base_parcel_id, get_base_parcel_kind(folio.id))
+                        folios[folio.id] = (folio.id, folio.plan, folio.section, folio.lot, base_parcel_id)
+                    base_parcel_id = folios[folio.id][4]
+                    key = (source, effective_date, property, folio.id, base_parcel_id, partial)
+                    property_folios[key] = None
+
+        stages: List[Tuple[str, Iterable[Sequence[Any]]]] = [
+            ('pd_base_parcel_stage', base_parcels.items()),
+            ('pd_folio_stage', folios.values()),
+            ('pd_property_folio_stage', property_folios.keys()),
+            ('pd_remains_stage', remains.keys()),
         ]
-
         try:
-            await cursor.executemany("""
+            for stage, rows in stages:
+                async with cursor.copy(f"COPY pg_temp.{stage} FROM STDIN") as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+
+            await cursor.execute("""
                 INSERT INTO nsw_lrs.base_parcel (base_parcel_id, base_parcel_kind)
-                VALUES (nsw_lrs.get_base_parcel_id(%s),
-                        nsw_lrs.get_base_parcel_kind(%s))
+                SELECT base_parcel_id, base_parcel_kind::nsw_lrs.base_parcel_kind
+                  FROM pg_temp.pd_base_parcel_stage
                 ON CONFLICT (base_parcel_id) DO NOTHING;
-            """, [
-                (folio.id, folio.id)
-                for source, property_desc, property, effective_date in row_data
-                for folio in property_desc.folios.all
-            ])
-            await conn.commit()
 
-            await cursor.executemany("""
                 INSERT INTO nsw_lrs.folio (
                     folio_id,
                     folio_plan,
                     folio_section,
                     folio_lot,
                     base_parcel_id)
-                VALUES (%s, %s, %s, %s, nsw_lrs.get_base_parcel_id(%s))
+                SELECT folio_id, folio_plan, folio_section, folio_lot, base_parcel_id
+                  FROM pg_temp.pd_folio_stage
                 ON CONFLICT (folio_id) DO NOTHING;
-            """, [
-                (folio.id, folio.plan, folio.section, folio.lot, folio.id)
-                for source, property_desc, property, effective_date in row_data
-                for folio in property_desc.folios.all
-            ])
-            await conn.commit()
 
-            await cursor.executemany("""
                 INSERT INTO nsw_lrs.property_folio(
                     source_id,
                     effective_date,
@@ -202,29 +309,30 @@ class PropDescIngestionWorker:
                     folio_id,
                     base_parcel_id,
                     partial)
-                VALUES (%s, %s, %s, %s, nsw_lrs.get_base_parcel_id(%s), %s)
-                ON CONFLICT DO NOTHING
-            """, [
-                (source, effective_date, property, folio_id, folio_id, partial)
-                for source, property_desc, property, effective_date in row_data
-                for folio_id, partial in [
-                    *((p.id, True) for p in property_desc.folios.partial),
-                    *((p.id, False) for p in property_desc.folios.complete),
-                ]
-            ])
-            if remains:
-                await cursor.executemany("""
-                    INSERT INTO nsw_lrs.legal_description_remains(
-                        legal_description_remains,
-                        legal_description_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT DO NOTHING
-                """, remains)
+                SELECT source_id, effective_date, property_id, folio_id, base_parcel_id, partial
+                  FROM pg_temp.pd_property_folio_stage
+                ON CONFLICT DO NOTHING;
+
+                INSERT INTO nsw_lrs.legal_description_remains(
+                    legal_description_remains,
+                    legal_description_id)
+                SELECT legal_description_remains, legal_description_id
+                  FROM pg_temp.pd_remains_stage
+                ON CONFLICT DO NOTHING;
+            """)
         except Exception as e:
             self._logger.error(e)
             raise e
         await conn.commit()
 
+        if self._parse_cache:
+            self._parse_cache.flush()
+
+    def _parse(self: Self, desc: str):
+        if self._parse_cache:
+            return self._parse_cache.parse(desc)
+        return parse_property_description_data(desc)
+
 
     async def create_temp_table(self: Self,
                                 p: PartitionSlice,
@@ -252,3 +360,24 @@ class PropDescIngestionWorker:
         self._semaphore.release()
         time.sleep(0.01)
 
+async def _next_page(pages: asyncio.Queue[List[Tuple[Any, ...]] | None],
+                     reader: asyncio.Task) -> List[Tuple[Any, ...]] | None:
+    """
+    Waits on the reader as well as the queue, as a reader that
+    fails never puts the end of its pages on the queue.
+    """
+    get = asyncio.ensure_future(pages.get())
+    try:
+        await asyncio.wait([get, reader], return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        get.cancel()
+        raise
+
+    if get.done():
+        return get.result()
+
+    get.cancel()
+    reader.result()
+    # the reader has finished, so the rest of its pages & the
+    # end of them are already on the queue
+    return await pages.get()
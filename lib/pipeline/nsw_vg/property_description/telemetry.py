@@ -48,6 +48,8 @@ class Telemetry:
         self.start_time = start_time
         self._clock = clock
         self._processes = processes
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     @staticmethod
     def create(clock: AbstractClockService, workers: int, subworkers: int) -> 'Telemetry':
@@ -70,10 +72,20 @@ class Telemetry:
         self._processes[process].workers[worker].processed += amount
         self._log()
 
+    @property
+    def cache_hit_rate(self: Self) -> float:
+        lookups = self._cache_hits + self._cache_misses
+        return (self._cache_hits / lookups * 100.0) if lookups else 0.0
+
+    def parse_cache_usage(self: Self, hits: int, misses: int):
+        self._cache_hits += hits
+        self._cache_misses += misses
+
     def _log(self: Self):
         queued, processed, percent = self.summary.status
         tstr = fmt_time_elapsed(self.start_time, self._clock.time(), 'hms')
-        self._logger.info(f"({tstr}) Processed {percent:.2f}%")
+        self._logger.info(f"({tstr}) Processed {percent:.2f}%, "
+                          f"parse cache hits {self.cache_hit_rate:.2f}%")
 
 class TelemetryListener:
     _logger = getLogger(f'{__name__}.listener')
@@ -120,5 +132,7 @@ class TelemetryListener:
                     self._telemetry.queued(p, w, amount)
                 case ParentMessage.Processed(p, w, amount):
                     self._telemetry.completed(p, w, amount)
+                case ParentMessage.ParseCacheUsage(_, _, hits, misses):
+                    self._telemetry.parse_cache_usage(hits, misses)
                 case other:
                     self._logger.warn(f'unknown message {other}')
@@ -0,0 +1,28 @@
+import asyncio
+import multiprocessing
+import pytest
+from unittest.mock import MagicMock
+
+from lib.service.database.mock import MockDatabaseService, MockDbState
+from ..ingest import PropDescIngestionWorker
+from ..type import PartitionSlice
+
+class _FailingReader(PropDescIngestionWorker):
+    async def read_pages(self, conn, table_name):
+        yield [('source', 'desc', 'desc_id', 1, None)]
+        raise ConnectionError('lost connection')
+
+    async def ingest_page(self, conn, cursor, page):
+        return
+
+@pytest.mark.asyncio
+async def test_worker_raises_when_reader_fails() -> None:
+    db = MockDatabaseService(state=MockDbState(fetchone_ret=[[1]]))
+    worker = _FailingReader(0, MagicMock(), multiprocessing.Semaphore(), db)
+    partition = PartitionSlice(src_table_name='src', start=None, end=None, count=1)
+
+    with pytest.raises(ConnectionError, match='lost connection'):
+        await asyncio.wait_for(worker.worker(0, partition), timeout=5)
+
+    # the role is still reset on the write connection
+    assert "SET session_replication_role = 'origin'" in [sql for sql, _ in db.state.execute_args]
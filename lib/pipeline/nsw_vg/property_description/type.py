@@ -38,3 +38,13 @@ class ParentMessage:
         descriptions.
         """
         amount: int
+
+    @dataclass
+    class ParseCacheUsage(T):
+        """
+        A child will send this to the parent with
+        the parse cache lookups made since the last
+        time it sent one.
+        """
+        hits: int
+        misses: int
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -8,3 +8,16 @@ class PropertySaleDatFileMetaData:
     published_year: int
     download_date: Optional[datetime]
     size: int
+
+    # When a large file is split between workers, each part
+    # is the byte range of whole records it covers, with an
+    # end of None meaning the end of the file. Parts of the
+    # same file share its `file_source_id`.
+    byte_start: int = field(default=0)
+    byte_end: Optional[int] = field(default=None)
+    file_source_id: Optional[str] = field(default=None)
+
+    @property
+    def work_size(self) -> int:
+        end = self.size if self.byte_end is None else self.byte_end
+        return end - self.byte_start
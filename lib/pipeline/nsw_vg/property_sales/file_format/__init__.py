@@ -1,4 +1,5 @@
 from .factories import *
 from .parse import PropertySalesRowParserFactory
 from .syntax import get_columns_and_syntax, Syntax
-from .text_source import BufferedFileReaderTextSource, StringTextSource
+from .text_source import BufferedFileReaderTextSource, MmapTextSource, StringTextSource
+from .split import split_file
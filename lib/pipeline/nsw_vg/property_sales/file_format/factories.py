@@ -1,17 +1,98 @@
 import abc
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Callable, Generic, Self, List, TypeVar, Optional, Protocol
+from typing import Any, Callable, Dict, Generic, Self, List, Tuple, Type, TypeVar, Optional, Protocol
 
 from lib.pipeline.nsw_vg.property_sales import data as t
 from lib.pipeline.nsw_vg.raw_data.rows import *
+from lib.pipeline.nsw_vg.raw_data import columns as col
 from lib.service.uuid import UuidService
 
+# The byte position, variant, kind and fields of a row.
+RawRow = Tuple[int, Optional[str], str, List[str]]
+
+@dataclass
+class ColumnBatch:
+    """
+    A block of records of one type held as columns, in the
+    same order as the type's `db_columns`.
+    """
+    row_type: Type[t.BasePropertySaleFileRow]
+    columns: Dict[str, List[Any]]
+
+    @staticmethod
+    def create(row_type: Type[t.BasePropertySaleFileRow], columns: Dict[str, List[Any]]) -> 'ColumnBatch':
+        names = [f.name for f in fields(row_type) if f.name != 'parent'] # type: ignore
+        if set(names) != set(columns.keys()):
+            raise ValueError(f'columns for {row_type.__name__} don\'t match its fields')
+        return ColumnBatch(row_type, { n: columns[n] for n in names })
+
+    @staticmethod
+    def from_records(records: List[t.BasePropertySaleFileRow]) -> 'ColumnBatch':
+        names = records[0].db_columns()
+        return ColumnBatch(type(records[0]), {
+            n: [getattr(r, n) for r in records] for n in names
+        })
+
+    @property
+    def column_names(self: Self) -> List[str]:
+        return list(self.columns.keys())
+
+    def rows(self: Self) -> List[Tuple[Any, ...]]:
+        return list(zip(*self.columns.values()))
+
+    def __len__(self: Self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+@dataclass
+class _RowGroup:
+    positions: List[int] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    rows: List[List[str]] = field(default_factory=list)
+
+    def column(self: Self, idx: int) -> List[str]:
+        return [r[idx] for r in self.rows]
+
+    def constant(self: Self, value: Any) -> List[Any]:
+        return [value] * len(self.rows)
+
 class AbstractFormatFactory(abc.ABC):
     @classmethod
-    def create(cls, uuid: UuidService, year: int, file_path: str) -> 'AbstractFormatFactory':
+    def create(cls,
+               uuid: UuidService,
+               year: int,
+               file_path: str,
+               file_source_id: Optional[str] = None) -> 'AbstractFormatFactory':
+        """
+        The file source id is only passed in when the file is
+        parsed in parts, so each part has the same id.
+        """
         raise NotImplementedError('create not implemented on AbstractFormatFactory')
 
+    def create_batch(self: Self, rows: List[RawRow]) -> List[ColumnBatch]:
+        """
+        Builds a block of rows as columns, one batch per record
+        type. This builds every record and then splits them into
+        columns, factories override it to skip the records.
+
+        Records built this way don't have parents, as those are
+        only there to make the individual records easier to read.
+        """
+        by_type: Dict[type, List[t.BasePropertySaleFileRow]] = {}
+        for pos, variant, kind, row in rows:
+            record = self.create_record(pos, variant, kind, row)
+            by_type.setdefault(type(record), []).append(record)
+        return [ColumnBatch.from_records(rs) for rs in by_type.values()]
+
+    def create_record(self: Self, pos: int, variant: Optional[str], kind: str, row: List[str]) -> t.BasePropertySaleFileRow:
+        match kind:
+            case 'A': return self.create_a(pos, row, variant=variant)
+            case 'B': return self.create_b(pos, row, a_record=None, variant=variant)
+            case 'C': return self.create_c(pos, row, b_record=None, variant=variant)
+            case 'D': return self.create_d(pos, row, c_record=None, variant=variant)
+            case 'Z': return self.create_z(pos, row, a_record=None, variant=variant)
+            case other: raise ValueError(f"Unexpected record type: {other}")
+
     @abc.abstractmethod
     def create_a(self: Self, pos: int, row: List[str], variant: Optional[str]) -> t.BasePropertySaleFileRow:
         pass
@@ -32,7 +113,43 @@ class AbstractFormatFactory(abc.ABC):
     def create_z(self: Self, pos: int, row: List[str], a_record: Any, variant: Optional[str]) -> t.SaleDataFileSummary:
         pass
 
-class CurrentFormatFactory(AbstractFormatFactory):
+class ColumnarFormatFactory(AbstractFormatFactory):
+    """
+    Builds batches straight from the columns of the raw rows,
+    without creating a record per row. Ids are generated in
+    bulk, in row order, so rows get the same ids they would
+    if they were built one at a time.
+    """
+    uuid: UuidService
+
+    def create_batch(self: Self, rows: List[RawRow]) -> List[ColumnBatch]:
+        ids = iter(self.uuid.get_uuid4_hex_batch(sum(1 for r in rows if r[2] != 'Z')))
+        groups: Dict[Tuple[str, Optional[str]], _RowGroup] = {}
+
+        for pos, variant, kind, row in rows:
+            group = groups.setdefault((kind, variant), _RowGroup())
+            group.positions.append(pos)
+            group.rows.append(row)
+            if kind != 'Z':
+                group.ids.append(next(ids))
+
+        batches = []
+        for (kind, variant), group in groups.items():
+            try:
+                batches.append(self.create_columns(kind, variant, group))
+            except Exception:
+                # the column readers give pretty useless errors,
+                # so redo it row by row to get a proper error
+                for pos, row in zip(group.positions, group.rows):
+                    self.create_record(pos, variant, kind, row)
+                raise
+        return batches
+
+    @abc.abstractmethod
+    def create_columns(self: Self, kind: str, variant: Optional[str], g: _RowGroup) -> ColumnBatch:
+        pass
+
+class CurrentFormatFactory(ColumnarFormatFactory):
     zone_standard: t.ZoningKind = 'ep&a_2006'
     zone_code_len: int = 3
 
@@ -47,8 +164,12 @@ class CurrentFormatFactory(AbstractFormatFactory):
         self.file_source_id = file_source_id
 
     @classmethod
-    def create(Cls, uuid: UuidService, year: int, file_path: str) -> 'CurrentFormatFactory':
-        return CurrentFormatFactory(uuid, year, file_path, uuid.get_uuid4_hex())
+    def create(Cls,
+               uuid: UuidService,
+               year: int,
+               file_path: str,
+               file_source_id: Optional[str] = None) -> 'CurrentFormatFactory':
+        return CurrentFormatFactory(uuid, year, file_path, file_source_id or uuid.get_uuid4_hex())
 
     def create_a(self: Self, pos: int, row: List[str], variant: Optional[str]):
         return t.SaleRecordFile(
@@ -132,13 +253,96 @@ class CurrentFormatFactory(AbstractFormatFactory):
             total_sale_participants=read_int(row, 3, 'total_sale_participants'),
         )
 
+    def create_columns(self: Self, kind: str, variant: Optional[str], g: _RowGroup) -> ColumnBatch:
+        match kind:
+            case 'A':
+                return ColumnBatch.create(t.SaleRecordFile, {
+                    'a_source_id': g.ids,
+                    'position': g.positions,
+                    'year_of_sale': g.constant(self.year),
+                    'file_path': g.constant(self.file_path),
+                    'file_source_id': g.constant(self.file_source_id),
+                    'file_type': col.col_optional_str(g.column(0)),
+                    'district_code': col.col_int(g.column(1)),
+                    'date_provided': col.col_datetime(g.column(2)),
+                    'submitting_user_id': col.col_str(g.column(3)),
+                })
+            case 'B':
+                zone_codes = g.column(15)
+                return ColumnBatch.create(t.SalePropertyDetails, {
+                    'b_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'property_id': col.col_optional_int(g.column(1)),
+                    'sale_counter': col.col_int(g.column(2)),
+                    'date_provided': col.col_datetime(g.column(3)),
+                    'property_name': col.col_optional_str(g.column(4)),
+                    'unit_number': col.col_optional_str(g.column(5)),
+                    'house_number': col.col_optional_str(g.column(6)),
+                    'street_name': col.col_optional_str(g.column(7)),
+                    'locality_name': col.col_optional_str(g.column(8)),
+                    'postcode': col.col_postcode(g.column(9)),
+                    'area': col.col_optional_float(g.column(10)),
+                    'area_type': col.col_area_type(g.column(11)),
+                    'contract_date': col.col_optional_date(g.column(12)),
+                    'settlement_date': col.col_optional_date(g.column(13)),
+                    'purchase_price': col.col_optional_float(g.column(14)),
+                    'zone_code': col.col_optional_str_max(zone_codes, self.zone_code_len),
+                    'zone_standard': col.col_zone_std(zone_codes),
+                    'nature_of_property': col.col_str(g.column(16)),
+                    'primary_purpose': col.col_optional_str(g.column(17)),
+                    'strata_lot_number': col.col_optional_int(g.column(18)),
+                    'comp_code': col.col_optional_str(g.column(19)),
+                    'sale_code': col.col_optional_str(g.column(20)),
+                    'interest_of_sale': col.col_optional_int(g.column(21)),
+                    'dealing_number': col.col_str(g.column(22)),
+                })
+            case 'C':
+                return ColumnBatch.create(t.SalePropertyLegalDescription, {
+                    'c_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'property_id': col.col_optional_int(g.column(1)),
+                    'sale_counter': col.col_int(g.column(2)),
+                    'date_provided': col.col_datetime(g.column(3)),
+                    'property_description': col.col_optional_str(g.column(4)),
+                })
+            case 'D':
+                return ColumnBatch.create(t.SaleParticipant, {
+                    'd_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'property_id': col.col_optional_int(g.column(1)),
+                    'sale_counter': col.col_int(g.column(2)),
+                    'date_provided': col.col_datetime(g.column(3)),
+                    'participant': col.col_str(g.column(4)),
+                })
+            case 'Z':
+                return ColumnBatch.create(t.SaleDataFileSummary, {
+                    'position': g.positions,
+                    'file_path': g.constant(self.file_path),
+                    'total_records': col.col_int(g.column(0)),
+                    'total_sale_property_details': col.col_int(g.column(1)),
+                    'total_sale_property_legal_descriptions': col.col_int(g.column(2)),
+                    'total_sale_participants': col.col_int(g.column(3)),
+                })
+            case other:
+                raise ValueError(f"Unexpected record type: {other}")
+
 class Legacy2002Format(CurrentFormatFactory):
     zone_standard = 'legacy_vg_2011'
     zone_code_len = 4
 
     @classmethod
-    def create(cls, uuid: UuidService, year: int, file_path: str) -> 'Legacy2002Format':
-        return Legacy2002Format(uuid, year, file_path, uuid.get_uuid4_hex())
+    def create(cls,
+               uuid: UuidService,
+               year: int,
+               file_path: str,
+               file_source_id: Optional[str] = None) -> 'Legacy2002Format':
+        return Legacy2002Format(uuid, year, file_path, file_source_id or uuid.get_uuid4_hex())
 
     def create_a(self: Self, pos: int, row: List[str], variant: Optional[str]):
         return t.SaleRecordFile(
@@ -189,7 +393,48 @@ class Legacy2002Format(CurrentFormatFactory):
         else:
             raise TypeError(f'unknown variant {variant}')
 
-class Legacy1990Format(AbstractFormatFactory):
+    def create_columns(self: Self, kind: str, variant: Optional[str], g: _RowGroup) -> ColumnBatch:
+        match kind, variant:
+            case 'A', _:
+                return ColumnBatch.create(t.SaleRecordFile, {
+                    'a_source_id': g.ids,
+                    'position': g.positions,
+                    'year_of_sale': g.constant(self.year),
+                    'file_path': g.constant(self.file_path),
+                    'file_source_id': g.constant(self.file_source_id),
+                    'file_type': g.constant(None),
+                    'district_code': col.col_int(g.column(0)),
+                    'date_provided': col.col_datetime(g.column(1)),
+                    'submitting_user_id': g.column(2),
+                })
+            case 'C', 'missing_property_id':
+                return ColumnBatch.create(t.SalePropertyLegalDescription, {
+                    'c_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'property_id': g.constant(None),
+                    'sale_counter': col.col_int(g.column(1)),
+                    'date_provided': col.col_datetime(g.column(2)),
+                    'property_description': col.col_optional_str(g.column(3)),
+                })
+            case 'D', 'missing_property_id':
+                return ColumnBatch.create(t.SaleParticipant, {
+                    'd_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'property_id': g.constant(None),
+                    'sale_counter': col.col_int(g.column(1)),
+                    'date_provided': col.col_datetime(g.column(2)),
+                    'participant': col.col_str(g.column(3)),
+                })
+            case ('C' | 'D'), v if v is not None:
+                raise TypeError(f'unknown variant {variant}')
+            case _:
+                return super().create_columns(kind, variant, g)
+
+class Legacy1990Format(ColumnarFormatFactory):
     def __init__(self: Self,
                  uuid: UuidService,
                  year: int,
@@ -201,8 +446,12 @@ class Legacy1990Format(AbstractFormatFactory):
         self.file_source_id = file_source_id
 
     @classmethod
-    def create(cls, uuid: UuidService, year: int, file_path: str):
-        return Legacy1990Format(uuid, year, file_path, uuid.get_uuid4_hex())
+    def create(cls,
+               uuid: UuidService,
+               year: int,
+               file_path: str,
+               file_source_id: Optional[str] = None):
+        return Legacy1990Format(uuid, year, file_path, file_source_id or uuid.get_uuid4_hex())
 
     def create_a(self: Self, pos: int, row: List[str], variant: Optional[str]):
         """
@@ -251,6 +500,57 @@ class Legacy1990Format(AbstractFormatFactory):
     def create_d(self: Self, pos: int, row: List[str], c_record: Any, variant: Optional[str]):
         raise TypeError('d record not allowed in 1990 format')
 
+    def create_columns(self: Self, kind: str, variant: Optional[str], g: _RowGroup) -> ColumnBatch:
+        match kind:
+            case 'A':
+                return ColumnBatch.create(t.SaleRecordFileLegacy, {
+                    'a_legacy_source_id': g.ids,
+                    'position': g.positions,
+                    'file_path': g.constant(self.file_path),
+                    'file_source_id': g.constant(self.file_source_id),
+                    'year_of_sale': g.constant(self.year),
+                    'submitting_user_id': g.column(1),
+                    'date_provided': col.col_datetime(g.column(2)),
+                })
+            case 'B':
+                zone_codes = g.column(16)
+                return ColumnBatch.create(t.SalePropertyDetails1990, {
+                    'b_legacy_source_id': g.ids,
+                    'position': g.positions,
+                    'file_source_id': g.constant(self.file_source_id),
+                    'district_code': col.col_int(g.column(0)),
+                    'source': col.col_optional_str(g.column(1)),
+                    'valuation_number': col.col_optional_str(g.column(2)),
+                    'property_id': col.col_optional_int(g.column(3)),
+                    'unit_number': col.col_optional_str(g.column(4)),
+                    'house_number': col.col_optional_str(g.column(5)),
+                    'street_name': col.col_optional_str(g.column(6)),
+                    'locality_name': col.col_optional_str(g.column(7)),
+                    'postcode': col.col_postcode(g.column(8)),
+                    'contract_date': col.col_date_pre_2002(g.column(9)),
+                    'purchase_price': col.col_float(g.column(10)),
+                    'land_description': col.col_optional_str(g.column(11)),
+                    'area': col.col_optional_float(g.column(12)),
+                    'area_type': col.col_area_type(g.column(13)),
+                    'dimensions': col.col_optional_str(g.column(14)),
+                    'comp_code': col.col_optional_str(g.column(15)),
+                    'zone_code': col.col_optional_str_max(zone_codes, 4),
+                    'zone_standard': col.col_zone_std(zone_codes),
+                })
+            case 'Z':
+                return ColumnBatch.create(t.SaleDataFileSummary, {
+                    'position': g.positions,
+                    'file_path': g.constant(self.file_path),
+                    'total_records': col.col_int(g.column(0)),
+                    'total_sale_property_details': col.col_int(g.column(1)),
+                    'total_sale_property_legal_descriptions': g.constant(0),
+                    'total_sale_participants': g.constant(0),
+                })
+            case 'C' | 'D':
+                raise TypeError(f'{kind.lower()} record not allowed in 1990 format')
+            case other:
+                raise ValueError(f"Unexpected record type: {other}")
+
     def create_z(self: Self, pos: int, row: List[str], a_record: Any, variant: Optional[str]):
         return t.SaleDataFileSummary(
             position=pos,
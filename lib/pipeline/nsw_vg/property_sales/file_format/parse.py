@@ -6,12 +6,13 @@ import os
 import re
 
 from lib.pipeline.nsw_vg.property_sales import PropertySaleDatFileMetaData
+from lib.pipeline.nsw_vg.property_sales import data as t
 from lib.service.io import IoService
 from lib.service.uuid import UuidService
 
-from .factories import AbstractFormatFactory
+from .factories import AbstractFormatFactory, ColumnBatch, RawRow
 from .syntax import get_columns_and_syntax, Syntax
-from .text_source import AbstractTextSource
+from .text_source import AbstractTextSource, MmapTextSource
 
 class PropertySalesRowParserFactory:
     Source: Type[AbstractTextSource]
@@ -35,7 +36,10 @@ class PropertySalesRowParserFactory:
         path = file_data.file_path
 
         Factory, syntax = get_columns_and_syntax(date, year)
-        factory = Factory.create(self._uuid, year=year, file_path=path)
+        factory = Factory.create(self._uuid,
+                                 year=year,
+                                 file_path=path,
+                                 file_source_id=file_data.file_source_id)
         f_path = file_data.file_path
         source = await self.Source.create(
             file_data.file_path,
@@ -53,6 +57,7 @@ class PropertySalesParser:
 
     __last_row: str = ''
     _index: int = 0
+    _end: Optional[int] = None
     _logger = getLogger(f'{__name__}.PropertySalesParser')
 
     def __init__(self: Self,
@@ -64,6 +69,11 @@ class PropertySalesParser:
         self.constructors = constructors
         self._source = source
         self._semi_colons = semicolons
+        self._index = file_data.byte_start
+        self._end = file_data.byte_end
+
+    def close(self: Self) -> None:
+        self._source.close()
 
     async def remaining(self: Self) -> str:
         return await self._source.read(self._index, self._index + 400)
@@ -73,6 +83,12 @@ class PropertySalesParser:
         a, b, c, d = None, None, None, None
 
         try:
+            if self._index > 0:
+                # parts of a file start at a B record, so they only
+                # need the A record at the start of the file as the
+                # parent for the records that follow.
+                a = await self._read_header()
+
             async for pos, variant, kind, row in self.get_rows():
                 if kind == 'A':
                     a = self.constructors.create_a(pos, row, variant=variant)
@@ -107,8 +123,46 @@ class PropertySalesParser:
             self._logger.exception(e)
             raise e
 
+    async def get_batches_from_file(self: Self, block_size: int = 1024) -> AsyncIterator[List[ColumnBatch]]:
+        """
+        Same records as `get_data_from_file`, but as columns
+        built a block of rows at a time.
+        """
+        block: List[RawRow] = []
+        try:
+            if isinstance(self._source, MmapTextSource):
+                for block in self._source.scan_rows(self._semi_colons, self._index, block_size, self._end):
+                    self._index = block[-1][0]
+                    yield self.constructors.create_batch(block)
+                    await asyncio.sleep(0)
+                return
+
+            async for raw_row in self.get_rows():
+                block.append(raw_row)
+                if len(block) >= block_size:
+                    yield self.constructors.create_batch(block)
+                    block = []
+            if block:
+                yield self.constructors.create_batch(block)
+        except Exception as e:
+            self._logger.error(f'Source: {self.file_data.file_path}')
+            self._logger.error(f'Target Year: {self.file_data.published_year}')
+            self._logger.error(f'Download Date: {self.file_data.download_date}')
+            self._logger.error(f'Factory: {type(self.constructors)}')
+            self._logger.error(f'Syntax: {self._semi_colons}')
+            self._logger.error(f'Index: {self._index}')
+            self._logger.error(f'last block starts: {block[0] if block else None}')
+            self._logger.exception(e)
+            raise e
+
     async def get_rows(self: Self) -> AsyncIterator[Tuple[int, str | None, str, List[str]]]:
-        while self._index < self._source.size():
+        if isinstance(self._source, MmapTextSource):
+            async for r in self._scan_rows(self._source):
+                yield r
+            return
+
+        end = self._source.size() if self._end is None else self._end
+        while self._index < end:
             position = self._index
             row_s, mode = await self._get_mode()
             variant, row_e, row = await self._get_row_body(mode, row_s)
@@ -121,6 +175,29 @@ class PropertySalesParser:
 
             self._index = row_e + 2
 
+    async def _scan_rows(self: Self, source: MmapTextSource) -> AsyncIterator[Tuple[int, str | None, str, List[str]]]:
+        """
+        Rows are tokenised synchronously in batches, only
+        yielding to the event loop between batches.
+        """
+        for batch in source.scan_rows(self._semi_colons, self._index, end=self._end):
+            for position, variant, mode, row in batch:
+                self._index = position
+                yield position, variant, mode, row
+            await asyncio.sleep(0)
+
+    async def _read_header(self: Self) -> t.BasePropertySaleFileRow:
+        start, end = self._index, self._end
+        self._index, self._end = 0, 1
+        try:
+            async for pos, variant, kind, row in self.get_rows():
+                if kind != 'A':
+                    raise ValueError(f'expected file to start with an A record, got {kind}')
+                return self.constructors.create_a(pos, row, variant=variant)
+            raise ValueError('expected file to start with an A record')
+        finally:
+            self._index, self._end = start, end
+
     async def _get_mode(self) -> Tuple[int, str]:
         mode_end = await self._find_nth_semicolon(1)
         mode = await self._source.read(self._index, mode_end)
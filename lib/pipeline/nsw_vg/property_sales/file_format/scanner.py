@@ -0,0 +1,107 @@
+import mmap
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .factories import RawRow
+from .syntax import Syntax
+
+_Plan = List[Tuple[int, Optional[str]]]
+
+def scan_rows(buffer: bytes | mmap.mmap,
+              syntax: Syntax,
+              start: int = 0,
+              batch_size: int = 1024,
+              source_name: str = '',
+              end: int | None = None) -> Iterator[List[RawRow]]:
+    """
+    Tokenises the rows of a DAT file in one synchronous pass
+    over the raw bytes (usually a memory mapped file), giving
+    the same rows as `PropertySalesParser` does with a text
+    source but without awaiting anything per field.
+
+    Rows are delimited purely by their number of semicolons,
+    where a row kind has more than one variant the longest is
+    tried first and rejected if its last field runs onto the
+    next line, same as the parser.
+
+    Only rows starting before `end` are scanned, so a file
+    split at record boundaries can be scanned a part at a time.
+    """
+    plans: Dict[str, _Plan] = {
+        mode: sorted(counts, reverse=True) if isinstance(counts, list) else [(counts, None)]
+        for mode, counts in syntax.items()
+    }
+
+    size = len(buffer)
+    limit = size if end is None else min(end, size)
+    index = start
+    last_row = ''
+    batch: List[RawRow] = []
+
+    while index < limit:
+        mode_end = buffer.find(b';', index)
+        mode = (buffer[index:mode_end] if mode_end != -1 else buffer[index:]).decode('utf-8').strip()
+
+        if mode not in plans:
+            raise ValueError(f'Unexpected mode: "{mode}"@{index}, ' \
+                             f'last row: "{last_row}", ' \
+                             f'source: {source_name}')
+
+        plan = plans[mode]
+
+        # Nearly every row is one line ending in its last semicolon,
+        # so the semicolons are counted in bulk & only rows that
+        # don't fit on the line are searched semicolon by semicolon.
+        line_end = buffer.find(b'\n', mode_end)
+        line = buffer[index:line_end if line_end != -1 else size]
+        line_semicolons = line.count(b';')
+        semicolons: List[int] | None = None
+
+        for i, (sc_count, variant) in enumerate(plan):
+            if sc_count == line_semicolons:
+                row_end = index + line.rfind(b';')
+            else:
+                if semicolons is None:
+                    semicolons = _find_semicolons(buffer, index, plan[0][0])
+                if len(semicolons) < sc_count:
+                    raise ValueError(
+                        f'Unexpected end of data: "{mode}"@{index}, ' \
+                        f'last row: "{last_row}", ' \
+                        f'source: {source_name}'
+                    )
+                row_end = semicolons[sc_count - 1]
+
+            row_s = buffer[mode_end + 1:row_end].decode('utf-8')
+            row = row_s.split(';')
+
+            if i + 1 == len(plan):
+                break
+
+            sc_count_next, _ = plan[i + 1]
+            if '\n' not in row[sc_count_next - 1]:
+                break
+
+        batch.append((index, variant, mode, row))
+        last_row = row_s
+
+        if mode == 'Z':
+            break
+
+        index = row_end + 2
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+def _find_semicolons(buffer: bytes | mmap.mmap, start: int, n: int) -> List[int]:
+    found: List[int] = []
+    position = start
+    while len(found) < n:
+        position = buffer.find(b';', position)
+        if position == -1:
+            break
+        found.append(position)
+        position += 1
+    return found
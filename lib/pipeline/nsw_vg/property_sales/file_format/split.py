@@ -0,0 +1,69 @@
+from dataclasses import replace
+from typing import List, Optional
+
+from lib.pipeline.nsw_vg.property_sales.data import PropertySaleDatFileMetaData
+from lib.service.io import IoService
+
+_RECORD_START = b'\nB;'
+_LOOK_BEHIND = 4
+
+async def split_file(io: IoService,
+                     file: PropertySaleDatFileMetaData,
+                     part_size: int,
+                     file_source_id: str,
+                     window: int = 64 * 2 ** 10) -> List[PropertySaleDatFileMetaData]:
+    """
+    Splits a DAT file into parts of roughly `part_size` bytes,
+    so one large file can be parsed by several workers.
+
+    Each part after the first starts at a B record. The C & D
+    records that follow a B record belong to the same sale, so
+    the only context a part needs from the rest of the file is
+    the A record at the start of it, which the parser reads
+    itself, and the file source id, which is shared here.
+    """
+    if file.size < part_size * 2:
+        return [file]
+
+    boundaries = [0]
+    while boundaries[-1] + part_size * 2 <= file.size:
+        boundary = await find_record_start(io, file.file_path, boundaries[-1] + part_size, window)
+        if boundary is None:
+            break
+        boundaries.append(boundary)
+
+    if len(boundaries) == 1:
+        return [file]
+
+    ends: List[Optional[int]] = [*boundaries[1:], None]
+    return [
+        replace(file, byte_start=start, byte_end=end, file_source_id=file_source_id)
+        for start, end in zip(boundaries, ends)
+    ]
+
+async def find_record_start(io: IoService,
+                            file_path: str,
+                            offset: int,
+                            window: int = 64 * 2 ** 10) -> Optional[int]:
+    """
+    Returns the position of the first B record at or after
+    `offset`, or None if there isn't one.
+
+    Like the parser, a record is taken to start 2 bytes after
+    the semicolon ending the previous one, which for files with
+    windows line endings is the newline before the record.
+    """
+    # read from a few bytes before, so the end of the previous
+    # record is in the chunk when the record starts at the offset
+    position = max(offset - _LOOK_BEHIND, 0)
+    while True:
+        chunk = await io.f_read_slice(file_path, position, window + _LOOK_BEHIND)
+        found = chunk.find(_RECORD_START)
+        while found != -1:
+            row_end = chunk.rfind(b';', 0, found)
+            if row_end != -1 and found - row_end <= 2:
+                return position + row_end + 2
+            found = chunk.find(_RECORD_START, found + 1)
+        if len(chunk) <= window:
+            return None
+        position += window
@@ -1,12 +1,14 @@
 import pytest
 from pprint import pformat
 from datetime import datetime
+from typing import Any, Dict, List, Tuple, Type
 
-from lib.pipeline.nsw_vg.property_sales.data import PropertySaleDatFileMetaData
+from lib.pipeline.nsw_vg.property_sales.data import BasePropertySaleFileRow, PropertySaleDatFileMetaData
 from lib.service.io import IoServiceImpl
 from lib.service.uuid.mocks import MockUuidService
 
 from ..text_source import *
+from ..factories import ColumnBatch
 from ..parse import PropertySalesRowParserFactory
 
 @pytest.mark.asyncio
@@ -78,3 +80,85 @@ async def test_snapshot(snapshot,
     s_items = [it async for it in s_parser.get_data_from_file()]
     snapshot.assert_match(pformat(s_items, width=150), file_name)
 
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_name,published_year,download_date", [
+    ('ps_2021_20210823.dat', 2021, datetime(2021, 8, 23)),
+    ('ps_2011_20111003.dat', 2011, datetime(2011, 10, 3)),
+    ('ps_2004_20040916.dat', 2004, datetime(2004, 9, 16)),
+    ('ps_2001_20010822.dat', 2001, datetime(2001, 8, 22)),
+    ('ps_2001_20010720.dat', 2001, datetime(2001, 7, 20)),
+    ('ps_2001_20010720_2.dat', 2001, datetime(2001, 7, 20)),
+    ('ps_1990_fake.dat', 1990, None),
+])
+async def test_mmap_matches_buffered(file_name: str,
+                                     published_year: int,
+                                     download_date: datetime | None):
+    io = IoServiceImpl.create(1)
+    uuid = MockUuidService(values=[str(i) for i in range(0, 10)])
+    m_factory = PropertySalesRowParserFactory(io, uuid, MmapTextSource)
+    uuid = MockUuidService(values=[str(i) for i in range(0, 10)])
+    b_factory = PropertySalesRowParserFactory(io,
+                                              uuid,
+                                              BufferedFileReaderTextSource,
+                                              chunk_size=8 * 2 ** 5)
+    file_path = f'./_fixtures/{file_name}'
+    file_size = await io.f_size(file_path)
+    file_data = PropertySaleDatFileMetaData(file_path=file_path,
+                                            published_year=published_year,
+                                            download_date=download_date,
+                                            size=file_size)
+    m_parser = await m_factory.create_parser(file_data)
+    b_parser = await b_factory.create_parser(file_data)
+    m_items = [it async for it in m_parser.get_data_from_file()]
+    b_items = [it async for it in b_parser.get_data_from_file()]
+
+    # both are byte offsets, so positions should match too
+    assert m_items == b_items
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("Source", [MmapTextSource, StringTextSource])
+@pytest.mark.parametrize("file_name,published_year,download_date", [
+    ('ps_2021_20210823.dat', 2021, datetime(2021, 8, 23)),
+    ('ps_2011_20111003.dat', 2011, datetime(2011, 10, 3)),
+    ('ps_2004_20040916.dat', 2004, datetime(2004, 9, 16)),
+    ('ps_2001_20010822.dat', 2001, datetime(2001, 8, 22)),
+    ('ps_2001_20010720.dat', 2001, datetime(2001, 7, 20)),
+    ('ps_2001_20010720_2.dat', 2001, datetime(2001, 7, 20)),
+    ('ps_1990_fake.dat', 1990, None),
+])
+async def test_batches_match_records(Source,
+                                     file_name: str,
+                                     published_year: int,
+                                     download_date: datetime | None):
+    io = IoServiceImpl.create(1)
+    file_path = f'./_fixtures/{file_name}'
+    file_data = PropertySaleDatFileMetaData(file_path=file_path,
+                                            published_year=published_year,
+                                            download_date=download_date,
+                                            size=await io.f_size(file_path))
+
+    uuid = MockUuidService(values=[str(i) for i in range(0, 10)])
+    r_parser = await PropertySalesRowParserFactory(io, uuid, Source).create_parser(file_data)
+    uuid = MockUuidService(values=[str(i) for i in range(0, 10)])
+    c_parser = await PropertySalesRowParserFactory(io, uuid, Source).create_parser(file_data)
+
+    expected: Dict[Type[BasePropertySaleFileRow], List[BasePropertySaleFileRow]] = {}
+    async for record in r_parser.get_data_from_file():
+        expected.setdefault(type(record), []).append(record)
+
+    columns: Dict[Type[BasePropertySaleFileRow], List[Tuple[Any, ...]]] = {}
+    async for batches in c_parser.get_batches_from_file(block_size=50):
+        for batch in batches:
+            assert batch.column_names == expected[batch.row_type][0].db_columns()
+            columns.setdefault(batch.row_type, []).extend(batch.rows())
+
+    # variants of the same record type are batched separately
+    def by_position(row_type, rows):
+        i = expected[row_type][0].db_columns().index('position')
+        return sorted(rows, key=lambda r: r[i])
+
+    assert {k: by_position(k, rs) for k, rs in columns.items()} == {
+        k: by_position(k, ColumnBatch.from_records(records).rows())
+        for k, records in expected.items()
+    }
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime
+from typing import Any, List, Tuple
+
+from lib.pipeline.nsw_vg.property_sales.data import PropertySaleDatFileMetaData
+from lib.service.io import IoServiceImpl
+from lib.service.uuid.mocks import MockUuidService
+
+from ..text_source import *
+from ..parse import PropertySalesRowParserFactory
+from ..split import find_record_start, split_file
+
+async def _file_data(io, file_name: str, published_year: int, download_date: datetime | None):
+    file_path = f'./_fixtures/{file_name}'
+    return PropertySaleDatFileMetaData(file_path=file_path,
+                                       published_year=published_year,
+                                       download_date=download_date,
+                                       size=await io.f_size(file_path))
+
+@pytest.mark.asyncio
+async def test_parts_start_at_b_records():
+    io = IoServiceImpl.create(1)
+    file_data = await _file_data(io, 'ps_2001_20010720_2.dat', 2001, datetime(2001, 7, 20))
+    parts = await split_file(io, file_data, 8 * 2 ** 10, 'file-id', window=256)
+
+    assert len(parts) > 1
+    assert parts[0].byte_start == 0
+    assert parts[-1].byte_end is None
+    assert sum(p.work_size for p in parts) == file_data.size
+    for prev, part in zip(parts, parts[1:]):
+        assert prev.byte_end == part.byte_start
+        # with windows line endings, records start at the newline
+        start = await io.f_read_slice(file_data.file_path, part.byte_start, 3)
+        assert start.lstrip(b'\n').startswith(b'B;')
+
+@pytest.mark.asyncio
+async def test_small_files_are_not_split():
+    io = IoServiceImpl.create(1)
+    file_data = await _file_data(io, 'ps_2021_20210823.dat', 2021, datetime(2021, 8, 23))
+    assert await split_file(io, file_data, 8 * 2 ** 10, 'file-id') == [file_data]
+
+@pytest.mark.asyncio
+async def test_no_record_past_offset():
+    io = IoServiceImpl.create(1)
+    file_data = await _file_data(io, 'ps_2021_20210823.dat', 2021, datetime(2021, 8, 23))
+    assert await find_record_start(io, file_data.file_path, 100, window=16) is None
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("Source", [MmapTextSource, BufferedFileReaderTextSource])
+@pytest.mark.parametrize("file_name,published_year,download_date", [
+    ('ps_2001_20010720_2.dat', 2001, datetime(2001, 7, 20)),
+    ('ps_1990_fake.dat', 1990, None),
+])
+async def test_parts_match_whole_file(Source,
+                                      file_name: str,
+                                      published_year: int,
+                                      download_date: datetime | None):
+    io = IoServiceImpl.create(1)
+    file_data = await _file_data(io, file_name, published_year, download_date)
+    parts = await split_file(io, file_data, file_data.size // 5, '0', window=64)
+    assert len(parts) > 1
+
+    # every id is the same, so records only differ by their content
+    factory = PropertySalesRowParserFactory(io, MockUuidService(values=['0']), Source)
+
+    whole = [r async for r in (await factory.create_parser(file_data)).get_data_from_file()]
+    from_parts = [
+        r
+        for part in parts
+        async for r in (await factory.create_parser(part)).get_data_from_file()
+    ]
+    assert from_parts == whole
+
+    whole_rows: List[Tuple[Any, ...]] = []
+    part_rows: List[Tuple[Any, ...]] = []
+    async for batches in (await factory.create_parser(file_data)).get_batches_from_file(block_size=50):
+        whole_rows.extend(row for b in batches for row in b.rows())
+    for part in parts:
+        async for batches in (await factory.create_parser(part)).get_batches_from_file(block_size=50):
+            part_rows.extend(row for b in batches for row in b.rows())
+    assert sorted(part_rows, key=repr) == sorted(whole_rows, key=repr)
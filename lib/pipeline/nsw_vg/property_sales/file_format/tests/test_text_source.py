@@ -146,3 +146,17 @@ async def test_unicode_find(depth: int,
         s_last_index = s_end + 1
         b_last_index = b_end + 1
 
+
+@pytest.mark.asyncio
+async def test_mmap_source_close(tmp_path):
+    file_path = str(tmp_path / 'file.dat')
+    with open(file_path, 'w') as f:
+        f.write('A;aaaa;bbbb;cccc;\n')
+
+    source = await MmapTextSource.create(file_path, AsyncMock(spec=IoService, **{
+        'f_size.return_value': 18,
+    }))
+    assert await source.read(0, 1) == 'A'
+    source.close()
+    with pytest.raises(ValueError):
+        await source.read(0, 1)
@@ -1,8 +1,12 @@
 import abc
-from typing import Self
+import mmap
+from typing import Iterator, List, Self
 
 from lib.service.io import IoService
 
+from .scanner import RawRow, scan_rows
+from .syntax import Syntax
+
 class AbstractTextSource(abc.ABC):
     @classmethod
     async def create(cls, file_path: str, io_service: IoService, **kwargs):
@@ -25,6 +29,9 @@ class AbstractTextSource(abc.ABC):
     async def find_index(self, search: str, offset: int, retained_index: int) -> int:
         pass
 
+    def close(self) -> None:
+        pass
+
 class StringTextSource(AbstractTextSource):
     _text: str
     _source_name: str
@@ -174,3 +181,54 @@ class BufferedFileReaderTextSource(AbstractTextSource):
         except UnicodeDecodeError as e:
             return b'' if e.start == 0 else buffer[:e.start]
 
+
+class MmapTextSource(AbstractTextSource):
+    """
+    Memory maps the file, mostly so the whole file can be
+    handed to `scan_rows` rather than reading it through
+    `find_index` and `read`, which are still implemented in
+    case anything wants to use this like the other sources.
+
+    Offsets are in bytes, same as the buffered source.
+    """
+    _buffer: mmap.mmap | bytes
+    _file_path: str
+
+    def __init__(self: Self, file_path: str, buffer: mmap.mmap | bytes) -> None:
+        self._file_path = file_path
+        self._buffer = buffer
+
+    @property
+    def source_name(self: Self) -> str:
+        return self._file_path
+
+    def size(self: Self) -> int:
+        return len(self._buffer)
+
+    async def read(self: Self, start: int, end: int) -> str:
+        return self._buffer[start:end].decode('utf-8')
+
+    async def find_index(self: Self, search: str, offset: int, retained_index: int) -> int:
+        return self._buffer.find(search.encode('utf-8'), offset)
+
+    def scan_rows(self: Self,
+                  syntax: Syntax,
+                  start: int,
+                  batch_size: int = 1024,
+                  end: int | None = None) -> Iterator[List[RawRow]]:
+        return scan_rows(self._buffer, syntax, start, batch_size, self._file_path, end)
+
+    def close(self: Self) -> None:
+        # closing the map also closes its handle to the file
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    @classmethod
+    async def create(cls, file_path: str, io_service: IoService, **kwargs) -> 'MmapTextSource':
+        if await io_service.f_size(file_path) == 0:
+            # empty files can't be mapped
+            return cls(file_path, b'')
+
+        with open(file_path, 'rb') as f:
+            # the map holds its own handle to the file
+            return cls(file_path, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
@@ -1,3 +1,5 @@
 from .config import *
 from .defaults import *
 from .ingestion import PropertySalesIngestion
+from .copy_sink import PropertySalesCopySink
+from .locate import locate_bad_rows
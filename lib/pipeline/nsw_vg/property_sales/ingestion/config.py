@@ -1,9 +1,16 @@
 from dataclasses import dataclass, field
 from logging import getLogger
-from typing import List, Self
+from typing import List, Literal, Self, Type
 
 from lib.pipeline.nsw_vg.property_sales import data as t
 
+# How the ingestion writes batches to the database:
+#
+#   - insert: `executemany` straight into each table.
+#   - copy: COPY into an unlogged staging table per worker,
+#     merged into each table when the ingestion is flushed.
+PropertySalesDbMode = Literal['insert', 'copy']
+
 @dataclass
 class IngestionTableConfig:
     table: str
@@ -31,24 +38,27 @@ class IngestionTableMap:
     d: IngestionTableConfig
 
     def get_config(self: Self, row: t.BasePropertySaleFileRow) -> IngestionTableConfig | None:
-        match row:
-            case t.SaleRecordFile():
+        return self.get_type_config(type(row))
+
+    def get_type_config(self: Self, row_type: Type[t.BasePropertySaleFileRow]) -> IngestionTableConfig | None:
+        match row_type:
+            case t.SaleRecordFile:
                 return self.a
-            case t.SaleRecordFileLegacy():
+            case t.SaleRecordFileLegacy:
                 return self.a_legacy
-            case t.SalePropertyDetails():
+            case t.SalePropertyDetails:
                 return self.b
-            case t.SalePropertyDetails1990():
+            case t.SalePropertyDetails1990:
                 return self.b_legacy
-            case t.SalePropertyLegalDescription():
+            case t.SalePropertyLegalDescription:
                 return self.c
-            case t.SaleParticipant():
+            case t.SaleParticipant:
                 return self.d
-            case t.SaleDataFileSummary():
+            case t.SaleDataFileSummary:
                 return None
-            case t.BasePropertySaleFileRow():
+            case _ if issubclass(row_type, t.BasePropertySaleFileRow):
                 raise ValueError('this shouldn\'t happen')
-        raise ValueError(f'unknown row, {row}')
+        raise ValueError(f'unknown row type, {row_type}')
 
 @dataclass
 class IngestionConfig:
@@ -56,6 +66,9 @@ class IngestionConfig:
     tables: IngestionTableMap
 
     def get_config(self: Self, row: t.BasePropertySaleFileRow) -> IngestionTableConfig:
-        match self.tables.get_config(row):
+        return self.get_type_config(type(row))
+
+    def get_type_config(self: Self, row_type: Type[t.BasePropertySaleFileRow]) -> IngestionTableConfig:
+        match self.tables.get_type_config(row_type):
             case None: raise ValueError('unexpected row type')
             case conf: return conf.hydrate(schema=self.schema)
@@ -0,0 +1,109 @@
+import asyncio
+from logging import getLogger
+from typing import Any, Dict, List, Self, Sequence
+
+from lib.service.database import DatabaseService
+
+from .config import IngestionTableConfig
+from .locate import locate_bad_rows
+
+class PropertySalesCopySink:
+    """
+    Writes rows with COPY into an unlogged staging table (one
+    per table, per worker) and merges them into the actual table
+    with a single `INSERT ... SELECT` on `merge`. Staging tables
+    are created on first use and dropped once merged.
+
+    Rows that fail to copy are found by bisecting the batch,
+    the rest of the batch is still written. If a write or merge
+    fails or is cancelled, every staging table is dropped
+    without being merged, so none are left behind.
+    """
+    _logger = getLogger(f'{__name__}.PropertySalesCopySink')
+
+    def __init__(self: Self, db: DatabaseService, worker_id: str):
+        self._db = db
+        self._worker_id = worker_id
+        self._lock = asyncio.Lock()
+        self._staged: Dict[str, List[str]] = {}
+
+    def stage_symbol(self: Self, conf: IngestionTableConfig) -> str:
+        return f'{conf.table_symbol}_stage_{self._worker_id}'
+
+    async def write(self: Self, conf: IngestionTableConfig, columns: List[str], rows: Sequence[Sequence[Any]]) -> None:
+        stage = await self._ensure_stage(conf, columns)
+
+        async def attempt(rs: Sequence[Sequence[Any]]) -> None:
+            async with self._db.async_connect() as c, c.cursor() as cursor:
+                async with cursor.copy(f"COPY {stage} ({', '.join(columns)}) FROM STDIN") as copy:
+                    for row in rs:
+                        await copy.write_row(row)
+                await c.commit()
+
+        try:
+            await attempt(rows)
+            self._logger.debug(f'copied {len(rows)} into {stage}')
+        except asyncio.CancelledError:
+            await self.discard()
+            raise
+        except Exception as e:
+            self._logger.error(f'failed to copy {len(rows)} rows into {stage}, locating bad rows')
+            bad_rows = await locate_bad_rows(rows, attempt, e)
+            for row, row_e in bad_rows:
+                self._logger.error(f'bad row {row}: {row_e}')
+            await self.discard()
+            raise bad_rows[0][1] if bad_rows else e
+
+    async def merge(self: Self) -> None:
+        async with self._lock:
+            staged, self._staged = self._staged, {}
+
+        try:
+            for target, columns in list(staged.items()):
+                stage = f'{target}_stage_{self._worker_id}'
+                column_str = ', '.join(columns)
+                async with self._db.async_connect() as c, c.cursor() as cursor:
+                    await cursor.execute(
+                        f'INSERT INTO {target} ({column_str}) '
+                        f'SELECT {column_str} FROM {stage} '
+                        f'ON CONFLICT DO NOTHING')
+                    await cursor.execute(f'DROP TABLE {stage}')
+                    await c.commit()
+                del staged[target]
+                self._logger.debug(f'merged {stage} into {target}')
+        except BaseException:
+            async with self._lock:
+                self._staged.update(staged)
+            await self.discard()
+            raise
+
+    async def discard(self: Self) -> None:
+        """
+        Drops the staging tables without merging them.
+        """
+        async with self._lock:
+            staged, self._staged = self._staged, {}
+
+        if not staged:
+            return
+
+        async with self._db.async_connect() as c, c.cursor() as cursor:
+            for target in staged:
+                await cursor.execute(f'DROP TABLE IF EXISTS {target}_stage_{self._worker_id}')
+            await c.commit()
+        self._logger.debug(f'dropped {len(staged)} staging tables')
+
+    async def _ensure_stage(self: Self, conf: IngestionTableConfig, columns: List[str]) -> str:
+        stage = self.stage_symbol(conf)
+        async with self._lock:
+            if conf.table_symbol in self._staged:
+                return stage
+
+            async with self._db.async_connect() as c, c.cursor() as cursor:
+                await cursor.execute(f'DROP TABLE IF EXISTS {stage}')
+                await cursor.execute(
+                    f'CREATE UNLOGGED TABLE {stage} '
+                    f'(LIKE {conf.table_symbol} INCLUDING DEFAULTS)')
+                await c.commit()
+            self._staged[conf.table_symbol] = columns
+        return stage
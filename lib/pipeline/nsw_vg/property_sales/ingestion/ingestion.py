@@ -1,15 +1,17 @@
 import asyncio
 from asyncio import TaskGroup
 from logging import getLogger
-from typing import Any, Dict, List, Self, Set, Tuple, Type
+from typing import Any, Dict, List, Self, Sequence, Set, Tuple, Type
 
 from lib.service.database import DatabaseService
 from lib.pipeline.nsw_vg.property_sales import data as t
+from lib.pipeline.nsw_vg.property_sales.file_format import ColumnBatch
 
-from .config import IngestionConfig, IngestionTableConfig
+from .config import IngestionConfig, IngestionTableConfig, PropertySalesDbMode
+from .copy_sink import PropertySalesCopySink
+from .locate import locate_bad_rows
 
-def insert_queue(conf: IngestionTableConfig, row: t.BasePropertySaleFileRow) -> Tuple[str, List[Any]]:
-    columns = row.db_columns()
+def insert_queue(conf: IngestionTableConfig, columns: List[str]) -> Tuple[str, List[str]]:
     values_str = ', '.join(['%s'] * len(columns))
     column_str = ', '.join(columns)
     on_conflict = ''
@@ -19,7 +21,7 @@ def insert_queue(conf: IngestionTableConfig, row: t.BasePropertySaleFileRow) ->
     query = f"INSERT INTO {conf.table_symbol} ({column_str}) VALUES ({values_str}) {on_conflict}"
     return query, columns
 
-RowBatchState = Dict[Type[t.BasePropertySaleFileRow], List[t.BasePropertySaleFileRow]]
+RowBatchState = Dict[Type[t.BasePropertySaleFileRow], List[Sequence[Any]]]
 
 class PropertySalesIngestion:
     _logger = getLogger(f'{__name__}.PropertySalesIngestion')
@@ -30,25 +32,32 @@ class PropertySalesIngestion:
     _state: RowBatchState
     _db: DatabaseService
     _tg: TaskGroup
+    _sink: PropertySalesCopySink | None
 
     def __init__(self: Self,
                  db: DatabaseService,
                  tg: TaskGroup,
                  config: IngestionConfig,
                  batch_size: int,
-                 state: RowBatchState) -> None:
+                 state: RowBatchState,
+                 sink: PropertySalesCopySink | None = None) -> None:
         self.batch_size = batch_size
         self._db = db
+        self._sink = sink
         self._tg = tg
         self._state = state
         self._tasks = set()
         self._config = config
+        self._columns: Dict[Type[t.BasePropertySaleFileRow], List[str]] = {}
 
     @staticmethod
     def create(db: DatabaseService,
                tg: TaskGroup,
                config: IngestionConfig,
-               batch_size: int) -> 'PropertySalesIngestion':
+               batch_size: int,
+               db_mode: PropertySalesDbMode = 'insert',
+               worker_id: str = '0') -> 'PropertySalesIngestion':
+        sink = PropertySalesCopySink(db, worker_id) if db_mode == 'copy' else None
         return PropertySalesIngestion(db, tg, config, batch_size, {
             t.SaleRecordFileLegacy: [],
             t.SalePropertyDetails1990: [],
@@ -56,7 +65,7 @@ class PropertySalesIngestion:
             t.SalePropertyDetails: [],
             t.SalePropertyLegalDescription: [],
             t.SaleParticipant: [],
-        })
+        }, sink)
 
     def abort(self: Self) -> None:
         for t in self._tasks:
@@ -67,16 +76,18 @@ class PropertySalesIngestion:
 
     async def flush(self: Self) -> int:
         size = 0
-        for t, queued in self._state.items():
+        for row_type, queued in self._state.items():
             size += len(queued)
             if queued:
-                table_conf = self._config.get_config(queued[0])
-                self._dispatch(table_conf, queued)
+                table_conf = self._config.get_type_config(row_type)
+                self._dispatch(table_conf, self._columns[row_type], queued)
 
 
         self._state = {t: [] for t in self._state.keys()}
         await asyncio.gather(*self._tasks)
         await self._maintain_running()
+        if self._sink is not None:
+            await self._sink.merge()
         return size
 
     async def queue(self: Self, row: t.BasePropertySaleFileRow) -> int:
@@ -90,22 +101,59 @@ class PropertySalesIngestion:
             self._logger.error(f'state: {list(self._state.keys())}')
             raise ValueError('unexpected row type')
 
+        if type(row) not in self._columns:
+            self._columns[type(row)] = row.db_columns()
+
         queued = self._state[type(row)]
-        queued.append(row)
+        queued.append([getattr(row, name) for name in self._columns[type(row)]])
 
         if len(queued) < self.batch_size:
             return 0
 
         table_conf = self._config.get_config(row)
 
-        self._dispatch(table_conf, queued)
+        self._dispatch(table_conf, self._columns[type(row)], queued)
         self._state[type(row)] = []
         return self.batch_size
 
-    def _dispatch(self: Self, c: IngestionTableConfig, q: List[t.BasePropertySaleFileRow]) -> None:
-        sql, columns = insert_queue(c, q[0])
-        values = [[getattr(row, name) for name in columns] for row in q]
-        task = self._tg.create_task(self._worker(sql, values, c.table_symbol))
+    async def queue_batch(self: Self, batch: ColumnBatch) -> int:
+        """
+        Queues a batch of records already in columns, these
+        are zipped into rows without building the records.
+        """
+        await self._maintain_running()
+
+        if batch.row_type is t.SaleDataFileSummary:
+            return 0
+
+        if batch.row_type not in self._state:
+            self._logger.error(f'key: {batch.row_type}')
+            self._logger.error(f'state: {list(self._state.keys())}')
+            raise ValueError('unexpected row type')
+
+        self._columns[batch.row_type] = batch.column_names
+        queued = self._state[batch.row_type]
+        queued.extend(batch.rows())
+
+        if len(queued) < self.batch_size:
+            return 0
+
+        table_conf = self._config.get_type_config(batch.row_type)
+        dispatched = 0
+        while len(queued) - dispatched >= self.batch_size:
+            chunk = queued[dispatched:dispatched + self.batch_size]
+            self._dispatch(table_conf, batch.column_names, chunk)
+            dispatched += self.batch_size
+
+        self._state[batch.row_type] = queued[dispatched:]
+        return dispatched
+
+    def _dispatch(self: Self, c: IngestionTableConfig, columns: List[str], values: List[Sequence[Any]]) -> None:
+        if self._sink is not None:
+            task = self._tg.create_task(self._sink.write(c, columns, values))
+        else:
+            sql, _ = insert_queue(c, columns)
+            task = self._tg.create_task(self._worker(sql, values, c.table_symbol))
         self._tasks.add(task)
 
     async def _maintain_running(self: Self) -> None:
@@ -114,23 +162,23 @@ class PropertySalesIngestion:
         for t in completed:
             await t
 
-    async def _worker(self: Self, sql: str, rows: List[List[str]], name: str):
-        try:
+    async def _worker(self: Self, sql: str, rows: List[Sequence[Any]], name: str):
+        async def attempt(rs: Sequence[Sequence[Any]]) -> None:
             async with self._db.async_connect() as c, c.cursor() as cursor:
-                match len(rows):
+                match len(rs):
                     case 0: pass
-                    case 1: await cursor.execute(sql, rows[0])
-                    case n: await cursor.executemany(sql, rows)
+                    case 1: await cursor.execute(sql, rs[0])
+                    case n: await cursor.executemany(sql, [list(r) for r in rs])
+
+        try:
+            await attempt(rows)
             self._logger.debug(f'inserted {len(rows)} for {name}')
         except Exception as e:
             self._logger.error(f'failed on "{sql}"')
-            if len(rows) > 1:
-                # `executemany` has terribel error messages so lets
-                # narrow in on whatever caused the issue
-                for row in rows:
-                    await self._worker(sql, [row], name)
-            else:
-                self._logger.error(rows)
-                self._logger.exception(e)
-                raise e
-
+            # `executemany` has terribel error messages so lets narrow
+            # in on whatever caused the issue, by bisecting the batch
+            bad_rows = await locate_bad_rows(rows, attempt, e)
+            for row, row_e in bad_rows:
+                self._logger.error(row)
+                self._logger.exception(row_e)
+            raise bad_rows[0][1] if bad_rows else e
@@ -0,0 +1,41 @@
+from typing import Any, Awaitable, Callable, List, Sequence, Tuple
+
+Rows = Sequence[Sequence[Any]]
+
+async def locate_bad_rows(
+    rows: Rows,
+    attempt: Callable[[Rows], Awaitable[None]],
+    error: Exception,
+) -> List[Tuple[Sequence[Any], Exception]]:
+    """
+    Finds the rows in a batch that failed with `error` that
+    can't be written, by splitting the batch in half & retrying
+    each half until the failing halves are down to single rows.
+    Halves that succeed are written, so only the bad rows are
+    left out.
+
+    The batch itself isn't retried, as it's already failed.
+    For a batch with `k` bad rows this takes in the order of
+    `k * log(n)` attempts, rather than one per row.
+    """
+    if len(rows) == 1:
+        return [(rows[0], error)]
+
+    middle = len(rows) // 2
+    return [
+        *await _attempt_or_locate(rows[:middle], attempt),
+        *await _attempt_or_locate(rows[middle:], attempt),
+    ]
+
+async def _attempt_or_locate(
+    rows: Rows,
+    attempt: Callable[[Rows], Awaitable[None]],
+) -> List[Tuple[Sequence[Any], Exception]]:
+    if not rows:
+        return []
+
+    try:
+        await attempt(rows)
+        return []
+    except Exception as e:
+        return await locate_bad_rows(rows, attempt, e)
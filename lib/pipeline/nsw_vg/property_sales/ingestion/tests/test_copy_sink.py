@@ -0,0 +1,70 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from lib.service.database.mock import MockCopy, MockDatabaseService
+
+from ..config import IngestionTableConfig
+from ..copy_sink import PropertySalesCopySink
+
+_conf = IngestionTableConfig(table='ps_row_b', schema='nsw_vg_raw')
+_stage = 'nsw_vg_raw.ps_row_b_stage_w1'
+
+class PropertySalesCopySinkTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.db = MockDatabaseService()
+        self.sink = PropertySalesCopySink(self.db, 'w1')
+
+    def _statements(self):
+        return [sql for sql, _ in self.db.state.execute_args]
+
+    async def test_write_then_merge(self):
+        await self.sink.write(_conf, ['a', 'b'], [(1, 'x'), (2, 'y')])
+        await self.sink.write(_conf, ['a', 'b'], [(3, 'z')])
+        await self.sink.merge()
+
+        self.assertEqual(self.db.state.copy_args, [
+            (f'COPY {_stage} (a, b) FROM STDIN', None, [[1, 'x'], [2, 'y']]),
+            (f'COPY {_stage} (a, b) FROM STDIN', None, [[3, 'z']]),
+        ])
+        self.assertEqual(self._statements(), [
+            f'DROP TABLE IF EXISTS {_stage}',
+            f'CREATE UNLOGGED TABLE {_stage} (LIKE nsw_vg_raw.ps_row_b INCLUDING DEFAULTS)',
+            f'INSERT INTO nsw_vg_raw.ps_row_b (a, b) SELECT a, b FROM {_stage} ON CONFLICT DO NOTHING',
+            f'DROP TABLE {_stage}',
+        ])
+
+        # nothing is left to merge or drop
+        await self.sink.merge()
+        await self.sink.discard()
+        self.assertEqual(len(self.db.state.execute_args), 4)
+
+    async def test_failed_write_drops_stage(self):
+        async def write_row(copy, row):
+            if row[0] < 0:
+                raise ValueError('bad row')
+            copy.written.append(list(row))
+
+        with patch.object(MockCopy, 'write_row', write_row):
+            with self.assertRaisesRegex(ValueError, 'bad row'):
+                await self.sink.write(_conf, ['a'], [(1,), (-1,), (2,)])
+
+        self.assertEqual(self._statements()[-1], f'DROP TABLE IF EXISTS {_stage}')
+        await self.sink.merge()
+        self.assertFalse(any(sql.startswith('INSERT') for sql in self._statements()))
+
+    async def test_cancelled_write_drops_stage(self):
+        started = asyncio.Event()
+
+        async def write_row(copy, row):
+            started.set()
+            await asyncio.Event().wait()
+
+        with patch.object(MockCopy, 'write_row', write_row):
+            task = asyncio.create_task(self.sink.write(_conf, ['a'], [(1,)]))
+            await started.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertEqual(self._statements()[-1], f'DROP TABLE IF EXISTS {_stage}')
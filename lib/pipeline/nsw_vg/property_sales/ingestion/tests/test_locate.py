@@ -0,0 +1,43 @@
+from unittest import IsolatedAsyncioTestCase
+
+from ..locate import locate_bad_rows
+
+class LocateBadRowsTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.attempts = 0
+        self.written = []
+
+    async def _attempt(self, rows):
+        self.attempts += 1
+        if any(row[0] < 0 for row in rows):
+            raise ValueError('negative')
+        self.written.extend(rows)
+
+    async def _attempt_batch(self, rows):
+        try:
+            await self._attempt(rows)
+            return []
+        except Exception as e:
+            return await locate_bad_rows(rows, self._attempt, e)
+
+    async def test_failed_batch_is_not_retried(self):
+        rows = [[i] for i in range(100)]
+        error = ConnectionError('transient')
+        self.assertEqual(await locate_bad_rows(rows, self._attempt, error), [])
+        self.assertEqual(self.attempts, 2)
+        self.assertEqual(self.written, rows)
+
+    async def test_single_row_is_not_retried(self):
+        error = ValueError('negative')
+        self.assertEqual(await locate_bad_rows([[-1]], self._attempt, error), [([-1], error)])
+        self.assertEqual(self.attempts, 0)
+
+    async def test_finds_bad_rows_and_writes_the_rest(self):
+        rows = [[-i if i in (17, 600) else i] for i in range(1, 1001)]
+        bad_rows = await self._attempt_batch(rows)
+
+        self.assertEqual([row for row, _ in bad_rows], [[-17], [-600]])
+        self.assertTrue(all(isinstance(e, ValueError) for _, e in bad_rows))
+        self.assertEqual(sorted(r[0] for r in self.written),
+                         [i for i in range(1, 1001) if i not in (17, 600)])
+        self.assertLess(self.attempts, 50)
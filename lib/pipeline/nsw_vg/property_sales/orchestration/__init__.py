@@ -1,4 +1,5 @@
 from .config import *
+from .messages import ChildMessage, ParentMessage
 from .child_server import NswVgPsChildServer, ParentClient
 from .child_client import NswVgPsChildClient
 from .coordinator import NswVgPsIngestionCoordinator
@@ -5,6 +5,7 @@ from logging import getLogger
 import multiprocessing
 from typing import Any, Self, Set
 
+from lib.utility.process import IpcSender
 
 from ..data import PropertySaleDatFileMetaData
 from .messages import ChildMessage, ParentMessage
@@ -18,23 +19,24 @@ class NswVgPsChildClient:
     This instance is created on the parent process
     """
     _logger = getLogger(f'{__name__}.NswVgPsChildClient')
-    _q_send: multiprocessing.Queue
+    _q_send: IpcSender[ChildMessage.Message]
     _p_child: multiprocessing.Process
     _workload: int = 0
 
     def __init__(self,
-                 q_send: multiprocessing.Queue,
+                 q_send: IpcSender[ChildMessage.Message],
                  p_child: multiprocessing.Process) -> None:
         self._q_send = q_send
         self._p_child = p_child
 
     def parse(self: Self, file: PropertySaleDatFileMetaData):
-        self._workload += file.size
-        self._q_send.put(ChildMessage.Parse(file))
+        self._workload += file.work_size
+        self._q_send.send(ChildMessage.Parse(file))
 
     async def wait_till_done(self: Self):
         self._logger.debug(f'pid {self._p_child.pid} waiting to finish')
-        self._q_send.put(ChildMessage.RequestClose())
+        self._q_send.send(ChildMessage.RequestClose())
+        self._q_send.close()
         await asyncio.create_task(asyncio.to_thread(self._p_child.join))
         self._logger.debug(f'pid {self._p_child.pid} finished')
         match self._p_child.exitcode:
@@ -1,14 +1,13 @@
 import abc
 import asyncio
 from logging import getLogger
-import multiprocessing
-import queue
 from typing import Any, Coroutine, Self, Set, TypeVar, Optional
 
+from lib.utility.process import IpcSender
 from lib.utility.sampling import Sampler
 
-from ..file_format import PropertySalesRowParserFactory
-from ..data import BasePropertySaleFileRow, PropertySaleDatFileMetaData, SaleDataFileSummary
+from ..file_format import ColumnBatch, PropertySalesRowParserFactory
+from ..data import PropertySaleDatFileMetaData, SaleDataFileSummary
 from ..ingestion import PropertySalesIngestion
 from .messages import ChildMessage, ParentMessage
 from .telemetry import IngestionSample
@@ -21,20 +20,20 @@ class ParentClient:
     pid: int
     parsed: int = 0
     ingested: int = 0
-    q_send: multiprocessing.Queue
+    q_send: IpcSender[ParentMessage.Message]
     threshold: int
 
     def __init__(self: Self,
                  pid: int,
-                 q_send: multiprocessing.Queue,
+                 q_send: IpcSender[ParentMessage.Message],
                  threshold: int):
         self.pid = pid
         self.threshold = threshold
         self.q_send = q_send
         self.parsed = 0
 
-    def on_parsed(self: Self) -> None:
-        self.parsed += 1
+    def on_parsed(self: Self, size: int = 1) -> None:
+        self.parsed += size
         if self.parsed >= self.threshold:
             self.flush()
 
@@ -50,11 +49,7 @@ class ParentClient:
             self.flush()
 
     def _put(self: Self, sample: IngestionSample):
-        try:
-            message = ParentMessage.Update(self.pid, sample)
-            self.q_send.put(message, timeout=0.5)
-        except queue.Full:
-            self.logger.error("failed to send message")
+        self.q_send.send(ParentMessage.Update(self.pid, sample))
 
 
 class NswVgPsChildServer:
@@ -64,7 +59,7 @@ class NswVgPsChildServer:
     logger = getLogger(f'{__name__}.NswVgPsChildServer')
     tg: asyncio.TaskGroup
 
-    q_rows: asyncio.Queue[BasePropertySaleFileRow | None]
+    q_rows: asyncio.Queue[ColumnBatch | None]
     p_parent: ParentClient
     t_ingest: asyncio.Task | None
     t_parser: Set[asyncio.Task]
@@ -128,12 +123,12 @@ class NswVgPsChildServer:
     async def _ingest(self: Self) -> None:
         try:
             while True:
-                row = await self._t(self.q_rows.get())
+                batch = await self._t(self.q_rows.get())
 
-                if row is None:
+                if batch is None:
                     break
 
-                count = await self._t(self.ingestion.queue(row))
+                count = await self._t(self.ingestion.queue_batch(batch))
                 self.p_parent.on_ingest(count)
 
             count = await self._t(self.ingestion.flush())
@@ -146,18 +141,22 @@ class NswVgPsChildServer:
             raise e
 
     async def _start_parser(self: Self, file: PropertySaleDatFileMetaData) -> None:
+        parser = None
         try:
             parser = await self._t(self.parser_factory.create_parser(file))
-            async for row in parser.get_data_from_file():
-                if not isinstance(row, SaleDataFileSummary):
-                    self.p_parent.on_parsed()
-                await self._t(self.q_rows.put(row))
+            async for batches in parser.get_batches_from_file():
+                for batch in batches:
+                    if batch.row_type is not SaleDataFileSummary:
+                        self.p_parent.on_parsed(len(batch))
+                    await self._t(self.q_rows.put(batch))
         except Exception as e:
             self.logger.error('threw while parsing')
             self.logger.exception(e)
             await self.kill()
             raise e
         finally:
+            if parser is not None:
+                parser.close()
             self.t_parser -= { asyncio.current_task() }
 
     def _t(self: Self, t: Coroutine[Any, Any, T]) -> asyncio.Task[T]:
@@ -3,8 +3,7 @@ from datetime import date, datetime
 from typing import Optional, Self
 
 from lib.service.database import DatabaseConfig
-from ..data import PropertySaleDatFileMetaData
-from ..ingestion.config import IngestionConfig
+from ..ingestion.config import IngestionConfig, PropertySalesDbMode
 
 
 # TODO RENAME
@@ -16,6 +15,10 @@ class NswVgPsiSupervisorConfig:
     download_min: Optional[date]
     download_max: Optional[date]
 
+    # files at least twice this many bytes are split into
+    # parts of about this size for different workers
+    split_size: Optional[int] = field(default=None)
+
     def valid_download_date(self: Self, maybe_dt: Optional[datetime]) -> bool:
         if maybe_dt is None:
             return self.download_min is None and self.download_max is None
@@ -50,23 +53,4 @@ class NswVgPsiWorkerConfig:
     ingestion_config: IngestionConfig
     # remove
     log_config: Optional[NswVgPsiWorkerLogConfig]
-
-class ParentMessage:
-    class Message:
-        pass
-
-    @dataclass
-    class IDied(Message):
-        sender: int
-
-class ChildMessage:
-    class Message:
-        pass
-
-    @dataclass
-    class Parse(Message):
-        file: PropertySaleDatFileMetaData
-
-    @dataclass
-    class Done(Message):
-        pass
+    db_mode: PropertySalesDbMode = field(default='insert')
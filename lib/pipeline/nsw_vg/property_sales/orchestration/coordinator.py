@@ -2,15 +2,16 @@ import asyncio
 from asyncio import TaskGroup
 from datetime import datetime
 from logging import getLogger
-import multiprocessing
-import queue
 import re
 from typing import Any, Coroutine, List, Self, Tuple, Optional, TypeVar
 
 from lib.pipeline.nsw_vg.discovery import NswVgTarget
 from lib.pipeline.nsw_vg.property_sales.data import PropertySaleDatFileMetaData
+from lib.pipeline.nsw_vg.property_sales.file_format import split_file
 from lib.service.io import IoService
+from lib.service.uuid import UuidService
 from lib.utility.concurrent import merge_async_iters
+from lib.utility.process import IpcReceiver
 from lib.utility.sampling import Sampler
 
 from .child_client import NswVgPsChildClient
@@ -23,26 +24,29 @@ T = TypeVar('T')
 class NswVgPsIngestionCoordinator:
     config: NswVgPsiSupervisorConfig
 
-    _recv_queue: multiprocessing.Queue
+    _recv_queue: IpcReceiver[ParentMessage.Message]
     _logger = getLogger(f'{__name__}.NswVgPsIngestionCoordinator')
     _telemetry: Sampler[IngestionSample]
     _children: List[NswVgPsChildClient]
     _io: IoService
+    _uuid: UuidService
     _tg: TaskGroup
 
     def __init__(self: Self,
                  config: NswVgPsiSupervisorConfig,
                  telemetry: Sampler[IngestionSample],
-                 q_recv: multiprocessing.Queue,
+                 q_recv: IpcReceiver[ParentMessage.Message],
                  children: List[NswVgPsChildClient],
                  task_group: TaskGroup,
-                 io: IoService) -> None:
+                 io: IoService,
+                 uuid: UuidService) -> None:
         self.config = config
         self._telemetry = telemetry
         self._children = children
         self._recv_queue = q_recv
         self._tg = task_group
         self._io = io
+        self._uuid = uuid
 
     async def process(self: Self, targets: List[NswVgTarget]):
         m_task = self._t(self._listen_to_children())
@@ -53,7 +57,8 @@ class NswVgPsIngestionCoordinator:
                 if file is None:
                     break
 
-                self._find_next_child().parse(file)
+                for part in await self._split(file):
+                    self._find_next_child().parse(part)
 
             await asyncio.gather(q_task, *[
                 self._t(c.wait_till_done())
@@ -64,23 +69,14 @@ class NswVgPsIngestionCoordinator:
                 p.terminate()
         finally:
             m_task.cancel()
+            self._recv_queue.close()
 
     async def _listen_to_children(self: Self):
-        async def next_message():
-            """
-            It is important to add this timeout otherwise we can
-            block the parent thread from exiting.
-            """
-            try:
-                task = asyncio.to_thread(self._recv_queue.get, timeout=0.1)
-                return await task
-            except queue.Empty:
-                return None
-
         while True:
-            match await next_message():
+            match await self._recv_queue.get():
                 case None:
-                    continue
+                    self._logger.debug('all children have hung up')
+                    return
                 case ParentMessage.Update(sender, value):
                     self._telemetry.count(value)
                     self._telemetry.log_if_necessary()
@@ -90,6 +86,19 @@ class NswVgPsIngestionCoordinator:
     def _find_next_child(self: Self) -> NswVgPsChildClient:
         return min(self._children, key=lambda c: c.status().queued)
 
+    async def _split(self: Self, file: PropertySaleDatFileMetaData) -> List[PropertySaleDatFileMetaData]:
+        """
+        Large files are split into parts, so work is balanced
+        between the children by bytes rather than by files.
+        """
+        if self.config.split_size is None:
+            return [file]
+
+        parts = await split_file(self._io, file, self.config.split_size, self._uuid.get_uuid4_hex())
+        if len(parts) > 1:
+            self._logger.debug(f'split {file.file_path} into {len(parts)} parts')
+        return parts
+
     def _file_queue(
         self: Self,
         targets: List[NswVgTarget],
@@ -0,0 +1,75 @@
+"""
+Column wise counterparts to the readers in `rows`, they take
+every value of a column at once and either convert all of them
+or throw. They don't produce the same error messages as the row
+readers, so callers wanting a useful error should redo the failed
+rows with the row readers.
+
+Dates & zones repeat heavily within a file, so those are parsed
+once per distinct value rather than once per row.
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+from .rows import (
+    parse_date,
+    parse_date_pre_2002,
+    parse_datetime,
+    read_zone_std,
+)
+from .zoning import ZoningKind
+
+T = TypeVar('T')
+
+def map_distinct(col: Sequence[str], f: Callable[[str], T]) -> List[T]:
+    parsed: Dict[str, T] = { v: f(v) for v in set(col) }
+    return [parsed[v] for v in col]
+
+def map_distinct_optional(col: Sequence[str], f: Callable[[str], T]) -> List[T | None]:
+    parsed: Dict[str, T | None] = { v: f(v) if v != '' else None for v in set(col) }
+    return [parsed[v] for v in col]
+
+def col_int(col: Sequence[str]) -> List[int]:
+    return [int(v) for v in col]
+
+def col_optional_int(col: Sequence[str]) -> List[Optional[int]]:
+    return [int(v) if v != '' else None for v in col]
+
+def col_float(col: Sequence[str]) -> List[float]:
+    return [float(v) for v in col]
+
+def col_optional_float(col: Sequence[str]) -> List[Optional[float]]:
+    return [float(v) if v != '' else None for v in col]
+
+def col_str(col: Sequence[str]) -> List[str]:
+    if not all(col):
+        raise ValueError('empty value in required column')
+    return list(col)
+
+def col_optional_str(col: Sequence[str]) -> List[Optional[str]]:
+    return [v or None for v in col]
+
+def col_optional_str_max(col: Sequence[str], max_len: int) -> List[Optional[str]]:
+    if any(len(v) > max_len for v in col):
+        raise ValueError(f'value longer than {max_len}')
+    return [v or None for v in col]
+
+def col_postcode(col: Sequence[str]) -> List[Optional[str]]:
+    return [v if len(v) == 4 else None for v in col]
+
+def col_area_type(col: Sequence[str]) -> List[Optional[str]]:
+    if not set(col) <= {'M', 'H', 'U', ''}:
+        raise ValueError('unknown area unit')
+    return [v or None for v in col]
+
+def col_zone_std(col: Sequence[str]) -> List[ZoningKind | None]:
+    return map_distinct(col, lambda v: read_zone_std([v], 0, 'zone_standard'))
+
+def col_datetime(col: Sequence[str]) -> List[datetime]:
+    return map_distinct(col, parse_datetime)
+
+def col_optional_date(col: Sequence[str]) -> List[Optional[datetime]]:
+    return map_distinct_optional(col, parse_date)
+
+def col_date_pre_2002(col: Sequence[str]) -> List[datetime]:
+    return map_distinct(col, parse_date_pre_2002)
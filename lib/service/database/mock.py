@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 import re
-from typing import Any, Self, Protocol, Sequence
+from typing import Any, AsyncGenerator, AsyncIterator, Optional, Self, Protocol, Sequence
 
 from .config import DatabaseConfig
 from .type import DatabaseService, CursorLike, ConnectionLike, CopyLike
@@ -16,6 +16,46 @@ class MockDbState:
     fetchall_ret: list[list[list[Any]]] = field(default_factory=lambda: [])
     execute_args: list[tuple[str, Sequence[Any]]] = field(default_factory=lambda: [])
     executemany_args: list[tuple[str, list[list[Any]]]] = field(default_factory=lambda: [])
+    copy_args: list[tuple[str, list[int | str] | None, list[list[Any]]]] = field(default_factory=lambda: [])
+
+@dataclass
+class MockCopy(CopyLike):
+    """
+    Records the rows written, along with the statement & the
+    types set, in `copy_args`. Only supports `COPY ... FROM`
+    with `write_row`.
+    """
+    state: MockDbState
+    statement: str
+    types: list[int | str] | None = field(default=None)
+    written: list[list[Any]] = field(default_factory=lambda: [])
+
+    async def __aexit__(self: Self, *args, **kwargs):
+        self.state.copy_args.append((self.statement, self.types, self.written))
+
+    async def __aenter__(self: Self) -> Self:
+        return self
+
+    def set_types(self: Self, types: Sequence[int | str]) -> None:
+        self.types = list(types)
+
+    async def write_row(self: Self, row: Sequence[Any]) -> None:
+        self.written.append(list(row))
+
+    async def write(self: Self, buffer: bytes | str) -> None:
+        raise NotImplementedError('only write_row is recorded')
+
+    async def read(self: Self) -> bytes:
+        raise NotImplementedError('only supports COPY ... FROM')
+
+    def rows(self: Self) -> AsyncIterator[tuple[Any, ...]]:
+        raise NotImplementedError('only supports COPY ... FROM')
+
+    async def read_row(self: Self) -> Optional[tuple[Any, ...]]:
+        raise NotImplementedError('only supports COPY ... FROM')
+
+    def __aiter__(self) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError('only supports COPY ... FROM')
 
 @dataclass
 class MockCursor(CursorLike):
@@ -47,7 +87,7 @@ class MockCursor(CursorLike):
         return
 
     def copy(self: Self, statement: str, params: list[str] | None = None) -> CopyLike:
-        raise NotImplementedError('idk I didn\'t get around to it')
+        return MockCopy(self.state, clean_sql(statement))
 
 @dataclass
 class MockConnection(ConnectionLike):
@@ -62,6 +102,9 @@ class MockConnection(ConnectionLike):
     async def commit(self: Self) -> None:
         return
 
+    async def rollback(self: Self) -> None:
+        return
+
     async def set_autocommit(self: Self, value: bool) -> None:
         return
 
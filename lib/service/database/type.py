@@ -4,6 +4,9 @@ from typing import Any, AsyncIterator, AsyncGenerator, Self, Protocol, Sequence,
 from .config import DatabaseConfig
 
 class CopyLike(Protocol):
+    def set_types(self: Self, types: Sequence[int | str]) -> None:
+        ...
+
     async def write_row(self: Self, row: Sequence[Any]) -> None:
         ...
 
@@ -63,6 +66,9 @@ class ConnectionLike(Protocol):
     async def commit(self: Self) -> None:
         ...
 
+    async def rollback(self: Self) -> None:
+        ...
+
     async def set_autocommit(self: Self, value: bool) -> None:
         ...
 
@@ -1,6 +1,6 @@
 from .cache import *
 from .exp_backoff import ExpBackoffClientSession
 from .exp_backoff.config import *
-from .throttled import ThrottledClientSession
+from .throttled import ThrottledClientSession, HostLimiters, create_host_limiters
 from .throttled.config import *
 
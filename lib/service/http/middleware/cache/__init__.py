@@ -6,3 +6,5 @@ from .expiry import Delta as DeltaExpire
 from .expiry import TillNextDayOfWeek as TillNextDayOfWeekExpire
 from .file_cache import FileCacher as HttpLocalCache
 from .headers import InstructionHeaders, CacheHeader
+from .memory_tier import MemoryTier as HttpMemoryTier
+from .storage import StorageFormat as HttpCacheStorageFormat
@@ -21,6 +21,8 @@ from lib.service.http import ClientSession
 from lib.service.http.util import url_with_params, url_host
 from .expiry import CacheExpire
 from .file_cache import FileCacher, RequestCache
+from .memory_tier import MemoryTier, MemoryTierStats
+from .storage import read_text, read_chunks
 from .headers import InstructionHeaders, CacheHeader
 
 Factory = Callable[[str, Dict[str, str], InstructionHeaders], 'CachedGetResponse']
@@ -32,15 +34,18 @@ class CachedClientSession(AbstractClientSession):
     def __init__(self: Self,
                  session: AbstractClientSession,
                  cacher: FileCacher,
-                 create_get_request: Factory):
+                 create_get_request: Factory,
+                 memory_tier: MemoryTier | None = None):
         self._session = session
         self._cache = cacher
         self._create_get_request = create_get_request
+        self._memory_tier = memory_tier
 
     @staticmethod
     def create(file_cache: FileCacher,
                io_service: IoService,
-               session: AbstractClientSession | None):
+               session: AbstractClientSession | None,
+               memory_tier: MemoryTier | None = None):
         session = session or ClientSession.create()
         logger = getLogger(f'{__name__}.CachedGet')
         create_get_request: Factory = lambda url, headers, meta: CachedGetResponse(
@@ -49,8 +54,12 @@ class CachedClientSession(AbstractClientSession):
             _logger=logger,
             _session=session,
             _cache=file_cache,
+            _memory_tier=memory_tier,
         )
-        return CachedClientSession(session, file_cache, create_get_request)
+        return CachedClientSession(session, file_cache, create_get_request, memory_tier)
+
+    def memory_tier_stats(self: Self) -> MemoryTierStats | None:
+        return self._memory_tier.stats() if self._memory_tier else None
 
     def get(self: Self, url, headers=None):
         if not isinstance(url, str):
@@ -87,6 +96,7 @@ class CachedGetResponse(AbstractGetResponse):
     _session: AbstractClientSession
     _cache: FileCacher
     _logger: Logger
+    _memory_tier: MemoryTier | None = field(default=None)
     _status: int | None = field(default=None)
     _state: Any = field(default=None)
     _response: Any = field(default=None)
@@ -138,17 +148,28 @@ class CachedGetResponse(AbstractGetResponse):
         if 'json' not in self._state:
             raise ValueError('Incorrect cache hint')
 
-        return json.loads(await self._io.f_read(self._state['json'].location))
+        location = self._state['json'].location
+        if self._memory_tier is None:
+            return json.loads(await read_text(self._io, location))
+
+        found, value = self._memory_tier.get(location)
+        if found:
+            return value
+
+        body = await read_text(self._io, location)
+        value = json.loads(body)
+        self._memory_tier.put(location, value, len(body))
+        return value
 
     async def stream(self: Self, chunk_size: int):
         _, _, instructions = self._config
-        f_loc = self._state['json'].location[instructions.format]
-        async for chunk in self._io.f_read_chunks(f_loc, chunk_size):
+        f_loc = self._state[instructions.format].location
+        async for chunk in read_chunks(self._io, f_loc, chunk_size):
             yield chunk
 
     async def text(self: Self):
         if 'text' not in self._state:
             raise ValueError('Incorrect cache hint')
 
-        return await self._io.f_read(self._state['text'].location)
+        return await read_text(self._io, self._state['text'].location)
 
@@ -1,19 +1,24 @@
-import aiofiles
 import asyncio
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from logging import getLogger
-import json
-import os
 from typing import Any, Dict, List, Optional, Self
 
 from lib.service.clock import ClockService
 from lib.service.io import IoService
 from lib.service.uuid import UuidService
 from lib.utility.concurrent import PartitionLock
-from .constants import STATE_INIT, CACHE_VERSION
 from .expiry import CacheExpire
 from .headers import InstructionHeaders
+from .state_store import (
+    CacheStateStore,
+    SnapshotStateStore,
+    StateBackend,
+    create_state_store,
+)
+from .storage import CacheStorage, PlainStorage, StorageFormat, create_storage
+from .url_index import UrlClauseIndex
 
 # Explaination of keys and their values
 #
@@ -44,12 +49,21 @@ class FileCacher:
                  io: IoService,
                  uuid: UuidService,
                  clock: ClockService,
-                 state: State | None = None):
+                 state: State | None = None,
+                 store: CacheStateStore | None = None,
+                 storage: CacheStorage | None = None):
         self._save_dir = save_dir
         self._config_path = config_path
         self._state = state
+        self._index = UrlClauseIndex.build(state or {})
+        self._refs = _count_refs(state or {})
+        self._store = store or SnapshotStateStore(config_path, io)
+        self._storage = storage or PlainStorage(save_dir, io, uuid)
         self._io = io
         self._lock = PartitionLock()
+        # files can be shared across partitions, so reference
+        # counting & deleting them is guarded by a single lock
+        self._refs_lock = asyncio.Lock()
         self._uuid = uuid
         self._clock = clock
         self._rc_factory = rc_factory
@@ -88,27 +102,34 @@ class FileCacher:
             if self._state is None:
                 return
 
-            url_to_rm: List[str] = []
-            locations: List[str] = []
-            for url, value in self._state.items():
-                if any([c not in url for c in clauses]):
-                    continue
+            matches = self._index.match(clauses)
+            if matches is None:
+                matches = {
+                    url for url in self._state
+                    if all(c in url for c in clauses)
+                }
 
-                for fmt in self.parse_state(self._state, url).values():
-                    locations.append(fmt.location)
+            url_to_rm: List[str] = []
+            released: List[RequestCache] = []
+            for url in matches:
+                released.extend(self.parse_state(self._state, url).values())
                 url_to_rm.append(url)
 
+            if not url_to_rm:
+                return
+
             for url in url_to_rm:
                 del self._state[url]
-            else:
-                return
+                self._index.remove(url)
 
             self._logger.info("Removed the following from cache: \n" \
                 + "\n - " + '\n - '.join(url_to_rm) \
                 + "\n\nNow deleteing from cache dir")
-            await self._save_cache_state()
-            for l in locations:
-                await self._io.f_delete(l)
+            await self._store.record_forget(self._state, url_to_rm)
+            async with self._refs_lock:
+                for fmt in released:
+                    if self._release(fmt):
+                        await self._io.f_delete(fmt.location)
 
     async def write(
         self: Self,
@@ -121,21 +142,24 @@ class FileCacher:
                 if self._state is None:
                     raise ValueError('write occured while state was not initialised')
 
-                fname = f"{meta.request_label}-{self._uuid.get_uuid4_hex()}.{meta.ext}"
-                fpath = os.path.join(self._save_dir, fname)
-                await self._io.f_write(fpath, data)
+                async with self._refs_lock:
+                    fname = await self._storage.put(meta, data)
+                    self._refs[fname] += 1
 
                 fmts = self._state.get(url, {})
 
                 if meta.format in fmts:
                     cache = self._rc_factory.from_json(fmts[meta.format])
-                    await self._io.f_delete(cache.location)
+                    async with self._refs_lock:
+                        if self._release(cache):
+                            await self._io.f_delete(cache.location)
 
                 request_cache = self._rc_factory.create(meta.expiry, fname, self._clock.now())
                 fmts[meta.format] = request_cache.to_json()
                 self._state[url] = fmts
+                self._index.add(url)
 
-                await self._save_cache_state()
+                await self._store.record_write(self._state, url, meta.format, fmts[meta.format])
 
                 if url in self._state:
                     return self.parse_state(self._state, url)
@@ -147,14 +171,23 @@ class FileCacher:
             for fmt, s in state[key].items()
         }
 
+    def _release(self: Self, cache: 'RequestCache') -> bool:
+        """
+        Drops a reference to a cached file, returning true if
+        nothing else refers to it & it's safe to delete. Only
+        compressed storage shares files between urls.
+        """
+        self._refs[cache.file_name] -= 1
+        if self._refs[cache.file_name] > 0:
+            return False
+        del self._refs[cache.file_name]
+        return True
+
     async def __aenter__(self: Self):
         try:
-            if not await self._io.f_exists(self._config_path):
-                await self._io.f_write(self._config_path, STATE_INIT)
-            state = json.loads(await self._io.f_read(self._config_path))
-            if state['version'] != CACHE_VERSION:
-                raise Exception("cache doesn't match version")
-            self._state = state['files']
+            self._state = await self._store.load()
+            self._index = UrlClauseIndex.build(self._state)
+            self._refs = _count_refs(self._state)
         except Exception as e:
             self._logger.exception(e)
             self._logger.error("Failed to save cache state, possibly corrupted")
@@ -162,30 +195,40 @@ class FileCacher:
         return self
 
     async def __aexit__(self: Self, exc_type, exc_value, traceback):
-        await self._save_cache_state()
+        if self._state is not None:
+            await self._store.flush(self._state)
         return False
 
-    async def _save_cache_state(self: Self):
-        state = { 'version': CACHE_VERSION, 'files': self._state }
-        await self._io.f_write(self._config_path, json.dumps(state, indent=1))
-
     @staticmethod
     def create(io: IoService,
                uuid: UuidService,
                cache_id: str | None,
                cache_dir: str | None = None,
-               state_dir: str | None = None):
+               state_dir: str | None = None,
+               state_backend: StateBackend = 'journal',
+               storage_format: StorageFormat = 'plain'):
         cache_dir = cache_dir or './_out_cache'
         state_dir = state_dir or './_out_state'
         state_path = f"{state_dir}/{cache_id or 'http'}-cache.json"
-        clock = ClockService()
+        journal_path = f"{state_dir}/{cache_id or 'http'}-cache.journal"
         factory = RequestCacheFactory(cache_dir=cache_dir)
+        store = create_state_store(state_backend, state_path, journal_path, io)
+        storage = create_storage(storage_format, cache_dir, io, uuid)
         return FileCacher(save_dir=cache_dir,
                           config_path=state_path,
                           rc_factory=factory,
                           io=io,
                           uuid=uuid,
-                          clock=ClockService())
+                          clock=ClockService(),
+                          store=store,
+                          storage=storage)
+
+def _count_refs(state: State) -> Counter[str]:
+    return Counter(
+        fmt['location']
+        for fmts in state.values()
+        for fmt in fmts.values()
+    )
 
 _date_format = '%Y-%m-%d %H:%M:%S'
 
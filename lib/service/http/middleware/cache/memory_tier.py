@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Self, Tuple
+
+@dataclass(frozen=True)
+class MemoryTierStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes_used: int
+
+    def __str__(self: Self) -> str:
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100.0) if lookups else 0.0
+        return f'hits {self.hits} ({rate:.2f}%), misses {self.misses}, ' \
+               f'evictions {self.evictions}, entries {self.entries}, ' \
+               f'bytes {self.bytes_used}'
+
+class MemoryTier:
+    """
+    A bounded LRU of parsed responses that sits in front of
+    the file cache, so small hot responses (like count queries)
+    don't get read from disk and parsed on every access.
+
+    Entries are keyed by the location of the cached file, as
+    a new file is written each time a response is refreshed,
+    stale entries just age out. Values are shared between
+    callers, so they shouldn't be mutated.
+    """
+
+    def __init__(self: Self, byte_budget: int, max_entry_bytes: int):
+        if max_entry_bytes > byte_budget:
+            raise ValueError('max_entry_bytes cannot exceed byte_budget')
+        self._byte_budget = byte_budget
+        self._max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[str, Tuple[Any, int]] = OrderedDict()
+        self._bytes_used = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self: Self, key: str) -> Tuple[bool, Any]:
+        if key not in self._entries:
+            self._misses += 1
+            return False, None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        value, _ = self._entries[key]
+        return True, value
+
+    def accepts(self: Self, size: int) -> bool:
+        return size <= self._max_entry_bytes
+
+    def put(self: Self, key: str, value: Any, size: int) -> None:
+        if not self.accepts(size):
+            return
+
+        if key in self._entries:
+            _, old_size = self._entries.pop(key)
+            self._bytes_used -= old_size
+
+        self._entries[key] = (value, size)
+        self._bytes_used += size
+
+        while self._bytes_used > self._byte_budget:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes_used -= evicted_size
+            self._evictions += 1
+
+    def stats(self: Self) -> MemoryTierStats:
+        return MemoryTierStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes_used=self._bytes_used,
+        )
@@ -0,0 +1,188 @@
+import asyncio
+from abc import ABC, abstractmethod
+from logging import getLogger
+import json
+from typing import Any, Dict, List, Literal, Self
+
+from lib.service.io import IoService
+from .constants import STATE_INIT, CACHE_VERSION
+
+State = Dict[str, Dict[str, Dict[str, str]]]
+
+StateBackend = Literal['snapshot', 'journal']
+
+class CacheStateStore(ABC):
+    """
+    Persists the state of the `FileCacher`, the cacher owns
+    the state in memory and tells the store about each change
+    as it happens so the store can decide how to persist it.
+    """
+
+    @abstractmethod
+    async def load(self: Self) -> State:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def record_write(self: Self,
+                           state: State,
+                           url: str,
+                           fmt: str,
+                           value: Dict[str, str]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def record_forget(self: Self, state: State, urls: List[str]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def flush(self: Self, state: State) -> None:
+        raise NotImplementedError()
+
+class SnapshotStateStore(CacheStateStore):
+    """
+    Rewrites the entire state file on every change, this
+    is fine for small caches but the cost of each write
+    grows with the size of the cache.
+    """
+    _logger = getLogger(f'{__name__}.SnapshotStateStore')
+
+    def __init__(self: Self, config_path: str, io: IoService):
+        self._config_path = config_path
+        self._io = io
+
+    async def load(self: Self) -> State:
+        return await read_snapshot(self._io, self._config_path)
+
+    async def record_write(self: Self,
+                           state: State,
+                           url: str,
+                           fmt: str,
+                           value: Dict[str, str]) -> None:
+        await self.flush(state)
+
+    async def record_forget(self: Self, state: State, urls: List[str]) -> None:
+        await self.flush(state)
+
+    async def flush(self: Self, state: State) -> None:
+        await write_snapshot(self._io, self._config_path, state)
+
+class JournalStateStore(CacheStateStore):
+    """
+    Uses the snapshot file as a base and appends each change
+    to a journal file next to it, so recording a change costs
+    the same regardless of how big the cache is. Once the
+    journal has grown past `compact_every` records it is
+    folded back into the snapshot.
+
+    The snapshot is the same file format as the one written
+    by `SnapshotStateStore`, so an existing cache is migrated
+    simply by loading it as the base, and switching back to
+    the snapshot store only loses uncompacted changes if the
+    last run didn't exit cleanly.
+    """
+    _logger = getLogger(f'{__name__}.JournalStateStore')
+
+    def __init__(self: Self,
+                 config_path: str,
+                 journal_path: str,
+                 io: IoService,
+                 compact_every: int = 10_000):
+        self._config_path = config_path
+        self._journal_path = journal_path
+        self._io = io
+        self._compact_every = compact_every
+        self._journal_size = 0
+        self._lock = asyncio.Lock()
+
+    async def load(self: Self) -> State:
+        state = await read_snapshot(self._io, self._config_path)
+        if not await self._io.f_exists(self._journal_path):
+            self._journal_size = 0
+            return state
+
+        self._journal_size = await replay_journal(self._io, self._journal_path, state)
+        self._logger.info(f'replayed {self._journal_size} records from {self._journal_path}')
+        return state
+
+    async def record_write(self: Self,
+                           state: State,
+                           url: str,
+                           fmt: str,
+                           value: Dict[str, str]) -> None:
+        await self._append(state, { 'op': 'write', 'url': url, 'fmt': fmt, 'value': value })
+
+    async def record_forget(self: Self, state: State, urls: List[str]) -> None:
+        await self._append(state, { 'op': 'forget', 'urls': urls })
+
+    async def flush(self: Self, state: State) -> None:
+        async with self._lock:
+            await self._compact(state)
+
+    async def _append(self: Self, state: State, record: Dict[str, Any]) -> None:
+        async with self._lock:
+            await self._io.f_append(self._journal_path, json.dumps(record) + '\n')
+            self._journal_size += 1
+            if self._journal_size >= self._compact_every:
+                await self._compact(state)
+
+    async def _compact(self: Self, state: State) -> None:
+        """
+        The snapshot is written before the journal is truncated,
+        if we die between the two, replaying the journal over the
+        new snapshot is harmless as each record is idempotent.
+        """
+        await write_snapshot(self._io, self._config_path, state)
+        await self._io.f_write(self._journal_path, '')
+        self._journal_size = 0
+
+def create_state_store(backend: StateBackend,
+                       config_path: str,
+                       journal_path: str,
+                       io: IoService) -> CacheStateStore:
+    match backend:
+        case 'snapshot':
+            return SnapshotStateStore(config_path, io)
+        case 'journal':
+            return JournalStateStore(config_path, journal_path, io)
+        case other:
+            raise ValueError(f'unknown cache state backend {other}')
+
+async def read_snapshot(io: IoService, config_path: str) -> State:
+    if not await io.f_exists(config_path):
+        await io.f_write(config_path, STATE_INIT)
+    state = json.loads(await io.f_read(config_path))
+    if state['version'] != CACHE_VERSION:
+        raise Exception("cache doesn't match version")
+    return state['files']
+
+async def write_snapshot(io: IoService, config_path: str, state: State) -> None:
+    snapshot = { 'version': CACHE_VERSION, 'files': state }
+    await io.f_write(config_path, json.dumps(snapshot, indent=1))
+
+async def replay_journal(io: IoService, journal_path: str, state: State) -> int:
+    """
+    Applies each record in the journal to the state, returning
+    the number of records. A trailing partial line can happen if
+    the process died mid append, in which case it's skipped.
+    """
+    count = 0
+    async for line in io.f_read_lines(journal_path):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            getLogger(__name__).warning(f'skipping malformed journal record in {journal_path}')
+            continue
+
+        match record['op']:
+            case 'write':
+                state.setdefault(record['url'], {})[record['fmt']] = record['value']
+            case 'forget':
+                for url in record['urls']:
+                    state.pop(url, None)
+            case other:
+                raise ValueError(f'unknown journal op {other}')
+        count += 1
+    return count
@@ -0,0 +1,106 @@
+import asyncio
+from abc import ABC, abstractmethod
+import gzip
+import hashlib
+import os
+from typing import AsyncIterator, Literal, Self, Tuple
+import zlib
+
+from lib.service.io import IoService
+from lib.service.uuid import UuidService
+from .headers import InstructionHeaders
+
+StorageFormat = Literal['plain', 'gzip']
+
+_COMPRESSED_EXT = '.gz'
+
+class CacheStorage(ABC):
+    """
+    Decides how the body of a response is written to the
+    cache directory. Reading doesn't depend on the storage
+    in use, as the file name tells us how it was written,
+    which means a cache can contain a mix of both formats.
+    """
+
+    @abstractmethod
+    async def put(self: Self, meta: InstructionHeaders, data: str) -> str:
+        """
+        Returns the file name of the stored body, relative
+        to the cache directory.
+        """
+        raise NotImplementedError()
+
+class PlainStorage(CacheStorage):
+    def __init__(self: Self, save_dir: str, io: IoService, uuid: UuidService):
+        self._save_dir = save_dir
+        self._io = io
+        self._uuid = uuid
+
+    async def put(self: Self, meta: InstructionHeaders, data: str) -> str:
+        fname = f"{meta.request_label}-{self._uuid.get_uuid4_hex()}.{meta.ext}"
+        await self._io.f_write(os.path.join(self._save_dir, fname), data)
+        return fname
+
+class CompressedStorage(CacheStorage):
+    """
+    Names each file after a hash of its body so identical
+    responses share a file, and gzips the body. As files are
+    shared the cacher has to reference count them before
+    deleting them.
+    """
+
+    def __init__(self: Self, save_dir: str, io: IoService, level: int = 6):
+        self._save_dir = save_dir
+        self._io = io
+        self._level = level
+
+    async def put(self: Self, meta: InstructionHeaders, data: str) -> str:
+        digest, blob = await asyncio.to_thread(_hash_and_compress, data, self._level)
+        fname = f"{digest}.{meta.ext}{_COMPRESSED_EXT}"
+        fpath = os.path.join(self._save_dir, fname)
+        if not await self._io.f_exists(fpath):
+            await self._io.f_write_bytes(fpath, blob)
+        return fname
+
+def create_storage(storage_format: StorageFormat,
+                   save_dir: str,
+                   io: IoService,
+                   uuid: UuidService) -> CacheStorage:
+    match storage_format:
+        case 'plain':
+            return PlainStorage(save_dir, io, uuid)
+        case 'gzip':
+            return CompressedStorage(save_dir, io)
+        case other:
+            raise ValueError(f'unknown cache storage format {other}')
+
+def is_compressed(location: str) -> bool:
+    return location.endswith(_COMPRESSED_EXT)
+
+async def read_text(io: IoService, location: str) -> str:
+    if not is_compressed(location):
+        return await io.f_read(location)
+
+    blob = await io.f_read_bytes(location)
+    data = await asyncio.to_thread(gzip.decompress, blob)
+    return data.decode('utf-8')
+
+async def read_chunks(io: IoService, location: str, chunk_size: int) -> AsyncIterator[bytes]:
+    if not is_compressed(location):
+        async for chunk in io.f_read_chunks(location, chunk_size):
+            yield chunk
+        return
+
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in io.f_read_chunks(location, chunk_size):
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+def _hash_and_compress(data: str, level: int) -> Tuple[str, bytes]:
+    raw = data.encode('utf-8')
+    digest = hashlib.sha256(raw).hexdigest()
+    return digest, gzip.compress(raw, compresslevel=level, mtime=0)
@@ -9,6 +9,7 @@ from .. import *
 from ..expiry import *
 from ..file_cache import FileCacher, RequestCache
 from ..client_session import CachedGetResponse as CachedGet
+from ..memory_tier import MemoryTier
 
 _date_str = '2012-10-15 10:10:10'
 _date_obj = datetime(2012, 10, 15, 10, 10, 10)
@@ -146,6 +147,31 @@ class GetResponseTestCase(IsolatedAsyncioTestCase):
             self.assertEqual(await request.json(), { 'count': 0 })
             self.mock_io.f_read.assert_called_once_with('cache_dir/file_location')
 
+    async def test_json_from_memory_tier(self):
+        meta = _never_instructions
+        fmts = {'json': RequestCache(meta.expiry, 'file_location', _date_obj, 'cache_dir')}
+        memory_tier = MemoryTier(byte_budget=1024, max_entry_bytes=64)
+
+        self.mock_io.f_read.return_value = '{"count":0}'
+        self.mock_cache.read.return_value = (fmts, True)
+
+        for _ in range(2):
+            instance = CachedGet(
+                _config=('my_url', {}, meta),
+                _io=self.mock_io,
+                _cache=self.mock_cache,
+                _logger=self.mock_logger,
+                _session=self.mock_session,
+                _memory_tier=memory_tier,
+            )
+
+            async with instance as request:
+                self.assertEqual(await request.json(), { 'count': 0 })
+
+        self.mock_io.f_read.assert_called_once_with('cache_dir/file_location')
+        self.assertEqual(memory_tier.stats().hits, 1)
+        self.assertEqual(memory_tier.stats().misses, 1)
+
     async def test_async_context_connection_error_with_cache(self):
         meta = _never_instructions
         fmts = {'json': RequestCache(meta.expiry, 'file_location', _date_obj, 'cache_dir')}
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from unittest import TestCase, IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock, call, ANY
@@ -8,6 +9,7 @@ from lib.service.io import IoService
 from lib.service.http.middleware.cache import InstructionHeaders, CACHE_VERSION
 from lib.service.http.middleware.cache.file_cache import RequestCache, FileCacher, RequestCacheFactory
 from lib.service.http.middleware.cache.expiry import *
+from lib.service.http.middleware.cache.storage import CacheStorage
 
 _file_path = 'blah/blah/blah'
 _date_str = '2012-10-15 10:10:10'
@@ -192,3 +194,74 @@ class FileCacherTestCase(IsolatedAsyncioTestCase):
         ])
         self.mock_io.f_delete.assert_called_once_with('cache_dir/old-file')
 
+
+    async def test_forget_by_clause(self):
+        encoded = lambda f: { 'expire': 'never', 'location': f, 'age': _date_str }
+        self.mock_io.f_write.return_value = None
+        self.mock_io.f_delete.return_value = None
+        instance = self._get_instance(state={
+            'https://h/a/query?where=1&resultOffset=0': { 'json': encoded('a0') },
+            'https://h/a/query?where=1&resultOffset=10': { 'json': encoded('a10') },
+            'https://h/a/query?where=2&resultOffset=0': { 'json': encoded('b0') },
+        })
+        await instance.forget_by_clause(['https://h/a', 'where=1', 'resultOffset=10'], 'blah')
+        self.assertEqual(set(instance._state.keys()), {
+            'https://h/a/query?where=1&resultOffset=0',
+            'https://h/a/query?where=2&resultOffset=0',
+        })
+        self.mock_io.f_delete.assert_called_once_with('cache_dir/a10')
+
+        await instance.forget_by_clause(['https://h/a', 'where=1'], 'blah')
+        self.assertEqual(set(instance._state.keys()), {
+            'https://h/a/query?where=2&resultOffset=0',
+        })
+
+    async def test_forget_shared_file(self):
+        encoded = lambda f: { 'expire': 'never', 'location': f, 'age': _date_str }
+        self.mock_io.f_write.return_value = None
+        self.mock_io.f_delete.return_value = None
+        instance = self._get_instance(state={
+            'https://h/a/query?where=1': { 'json': encoded('abc.json.gz') },
+            'https://h/a/query?where=2': { 'json': encoded('abc.json.gz') },
+        })
+        await instance.forget_by_clause(['https://h/a', 'where=1'], 'blah')
+        self.mock_io.f_delete.assert_not_called()
+
+        await instance.forget_by_clause(['https://h/a', 'where=2'], 'blah')
+        self.mock_io.f_delete.assert_called_once_with('cache_dir/abc.json.gz')
+
+    async def test_forget_while_writing_shared_file(self):
+        encoded = lambda f: { 'expire': 'never', 'location': f, 'age': _date_str }
+        self.mock_io.f_write.return_value = None
+        self.mock_io.f_delete.return_value = None
+        started = asyncio.Event()
+
+        class SlowStorage(CacheStorage):
+            async def put(self, meta, data):
+                started.set()
+                await asyncio.sleep(0.01)
+                return 'abc.json.gz'
+
+        instance = FileCacher(cache_dir,
+                              'state_path',
+                              RequestCacheFactory(cache_dir),
+                              self.mock_io,
+                              MockUuidService(values=[]),
+                              MockClockService(dt=_date_obj),
+                              { 'https://h/a/query?where=1': { 'json': encoded('abc.json.gz') } },
+                              storage=SlowStorage())
+        meta = InstructionHeaders(format='json',
+                                  expiry=Never(),
+                                  disabled=False,
+                                  partition='p1',
+                                  request_label='abc')
+
+        # the write in one partition reuses the file the forget
+        # in another partition drops the last reference to
+        write = asyncio.create_task(instance.write('https://h/b/query', meta, '{}'))
+        await started.wait()
+        await instance.forget_by_clause(['https://h/a'], 'p2')
+        await write
+
+        self.mock_io.f_delete.assert_not_called()
+        self.assertEqual(instance._refs['abc.json.gz'], 1)
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from lib.service.http.middleware.cache.memory_tier import MemoryTier, MemoryTierStats
+
+class MemoryTierTestCase(TestCase):
+    def test_hit_and_miss(self):
+        tier = MemoryTier(byte_budget=100, max_entry_bytes=50)
+        self.assertEqual(tier.get('a'), (False, None))
+        tier.put('a', { 'count': 1 }, 10)
+        self.assertEqual(tier.get('a'), (True, { 'count': 1 }))
+        self.assertEqual(tier.stats(), MemoryTierStats(1, 1, 0, 1, 10))
+
+    def test_rejects_large_entries(self):
+        tier = MemoryTier(byte_budget=100, max_entry_bytes=50)
+        tier.put('a', 'large', 51)
+        self.assertEqual(tier.get('a'), (False, None))
+        self.assertEqual(tier.stats().bytes_used, 0)
+
+    def test_evicts_least_recently_used(self):
+        tier = MemoryTier(byte_budget=100, max_entry_bytes=50)
+        tier.put('a', 'a', 40)
+        tier.put('b', 'b', 40)
+        tier.get('a')
+        tier.put('c', 'c', 40)
+
+        self.assertEqual(tier.get('b'), (False, None))
+        self.assertEqual(tier.get('a'), (True, 'a'))
+        self.assertEqual(tier.get('c'), (True, 'c'))
+        self.assertEqual(tier.stats().evictions, 1)
+        self.assertEqual(tier.stats().bytes_used, 80)
+
+    def test_replace_entry(self):
+        tier = MemoryTier(byte_budget=100, max_entry_bytes=50)
+        tier.put('a', 'a', 40)
+        tier.put('a', 'b', 20)
+        self.assertEqual(tier.get('a'), (True, 'b'))
+        self.assertEqual(tier.stats().bytes_used, 20)
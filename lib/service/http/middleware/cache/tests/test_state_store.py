@@ -0,0 +1,82 @@
+import json
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, call
+
+from lib.service.io import IoService
+from lib.service.http.middleware.cache import CACHE_VERSION
+from lib.service.http.middleware.cache.state_store import JournalStateStore
+
+_entry_a = { 'expire': 'never', 'location': 'a.json', 'age': '2012-10-15 10:10:10' }
+_entry_b = { 'expire': 'never', 'location': 'b.json', 'age': '2012-10-15 10:10:10' }
+
+def _snapshot(files):
+    return json.dumps({ 'version': CACHE_VERSION, 'files': files })
+
+def _lines(*records):
+    async def gen(*args, **kwargs):
+        for r in records:
+            yield r
+    return gen
+
+class JournalStateStoreTestCase(IsolatedAsyncioTestCase):
+    mock_io = None
+
+    async def asyncSetUp(self):
+        self.mock_io = AsyncMock(spec=IoService)
+        self.mock_io.f_write.return_value = None
+        self.mock_io.f_append.return_value = None
+
+    def _get_instance(self, compact_every=10):
+        return JournalStateStore('state_path', 'journal_path', self.mock_io, compact_every)
+
+    async def test_load_migrates_snapshot_without_journal(self):
+        self.mock_io.f_exists.side_effect = lambda p: p == 'state_path'
+        self.mock_io.f_read.return_value = _snapshot({ 'a': { 'json': _entry_a } })
+
+        state = await self._get_instance().load()
+        self.assertEqual(state, { 'a': { 'json': _entry_a } })
+        self.mock_io.f_write.assert_not_called()
+
+    async def test_load_replays_journal(self):
+        self.mock_io.f_exists.return_value = True
+        self.mock_io.f_read.return_value = _snapshot({ 'a': { 'json': _entry_a } })
+        self.mock_io.f_read_lines = MagicMock(side_effect=_lines(
+            json.dumps({ 'op': 'write', 'url': 'b', 'fmt': 'json', 'value': _entry_b }) + '\n',
+            json.dumps({ 'op': 'forget', 'urls': ['a'] }) + '\n',
+            '{"op": "wri',
+        ))
+
+        state = await self._get_instance().load()
+        self.assertEqual(state, { 'b': { 'json': _entry_b } })
+
+    async def test_record_write_appends(self):
+        instance = self._get_instance()
+        state = { 'a': { 'json': _entry_a } }
+        await instance.record_write(state, 'a', 'json', _entry_a)
+        await instance.record_forget(state, ['a'])
+
+        self.assertEqual(self.mock_io.f_append.mock_calls, [
+            call('journal_path', json.dumps({ 'op': 'write', 'url': 'a', 'fmt': 'json', 'value': _entry_a }) + '\n'),
+            call('journal_path', json.dumps({ 'op': 'forget', 'urls': ['a'] }) + '\n'),
+        ])
+        self.mock_io.f_write.assert_not_called()
+
+    async def test_compacts_after_threshold(self):
+        instance = self._get_instance(compact_every=2)
+        state = { 'a': { 'json': _entry_a } }
+        await instance.record_write(state, 'a', 'json', _entry_a)
+        self.mock_io.f_write.assert_not_called()
+
+        await instance.record_write(state, 'a', 'json', _entry_a)
+        self.assertEqual(self.mock_io.f_write.mock_calls, [
+            call('state_path', json.dumps({ 'version': CACHE_VERSION, 'files': state }, indent=1)),
+            call('journal_path', ''),
+        ])
+
+    async def test_flush_compacts(self):
+        instance = self._get_instance()
+        await instance.flush({})
+        self.assertEqual(self.mock_io.f_write.mock_calls, [
+            call('state_path', json.dumps({ 'version': CACHE_VERSION, 'files': {} }, indent=1)),
+            call('journal_path', ''),
+        ])
@@ -0,0 +1,63 @@
+import gzip
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from lib.service.io import IoService
+from lib.service.http.middleware.cache import InstructionHeaders, NeverExpire
+from lib.service.http.middleware.cache.storage import (
+    CompressedStorage,
+    read_chunks,
+    read_text,
+)
+
+_meta = InstructionHeaders(format='json',
+                           expiry=NeverExpire(),
+                           disabled=False,
+                           partition='blah',
+                           request_label='fruitloop')
+
+class CompressedStorageTestCase(IsolatedAsyncioTestCase):
+    mock_io = None
+
+    async def asyncSetUp(self):
+        self.mock_io = AsyncMock(spec=IoService)
+        self.mock_io.f_write_bytes.return_value = None
+
+    async def test_put_dedupes_identical_bodies(self):
+        storage = CompressedStorage('cache_dir', self.mock_io)
+
+        self.mock_io.f_exists.return_value = False
+        fname_a = await storage.put(_meta, '{"count":2012}')
+        self.mock_io.f_exists.return_value = True
+        fname_b = await storage.put(_meta, '{"count":2012}')
+
+        self.assertEqual(fname_a, fname_b)
+        self.assertTrue(fname_a.endswith('.json.gz'))
+        self.mock_io.f_write_bytes.assert_called_once()
+        path, blob = self.mock_io.f_write_bytes.call_args.args
+        self.assertEqual(path, f'cache_dir/{fname_a}')
+        self.assertEqual(gzip.decompress(blob), b'{"count":2012}')
+
+    async def test_put_differing_bodies(self):
+        storage = CompressedStorage('cache_dir', self.mock_io)
+        self.mock_io.f_exists.return_value = False
+        fname_a = await storage.put(_meta, '{"count":2012}')
+        fname_b = await storage.put(_meta, '{"count":2013}')
+        self.assertNotEqual(fname_a, fname_b)
+
+    async def test_read_text(self):
+        self.mock_io.f_read.return_value = 'plain'
+        self.mock_io.f_read_bytes.return_value = gzip.compress(b'compressed')
+        self.assertEqual(await read_text(self.mock_io, 'a.json'), 'plain')
+        self.assertEqual(await read_text(self.mock_io, 'a.json.gz'), 'compressed')
+
+    async def test_read_chunks(self):
+        blob = gzip.compress(b'x' * 10_000)
+
+        async def chunks(path, chunk_size):
+            for i in range(0, len(blob), chunk_size):
+                yield blob[i:i + chunk_size]
+
+        self.mock_io.f_read_chunks = MagicMock(side_effect=chunks)
+        data = b''.join([c async for c in read_chunks(self.mock_io, 'a.json.gz', 16)])
+        self.assertEqual(data, b'x' * 10_000)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+from urllib.parse import urlencode
+
+from lib.service.http.middleware.cache.url_index import UrlClauseIndex
+
+_schema = 'https://host/rest/services/Theme/FeatureServer/8'
+
+def _page(where, offset):
+    return f'{_schema}/query?' + urlencode({ 'resultOffset': offset, 'where': where, 'f': 'json' })
+
+def _count(where):
+    return f'{_schema}/query?' + urlencode({ 'where': where, 'returnCountOnly': True })
+
+class UrlClauseIndexTestCase(TestCase):
+    def test_matches_page(self):
+        urls = [_page('a = 1', 0), _page('a = 1', 10), _page('a = 2', 0), _count('a = 1')]
+        index = UrlClauseIndex.build(urls)
+        clauses = [_schema, urlencode({ 'where': 'a = 1' }), urlencode({ 'resultOffset': 1 })]
+        self.assertEqual(index.match(clauses), set())
+
+        clauses = [_schema, urlencode({ 'where': 'a = 1' }), urlencode({ 'resultOffset': 10 })]
+        self.assertEqual(index.match(clauses), { _page('a = 1', 10) })
+
+    def test_matches_shard(self):
+        urls = [_page('a = 1', 0), _page('a = 1', 10), _page('a = 2', 0), _count('a = 1')]
+        index = UrlClauseIndex.build(urls)
+        clauses = [_schema, urlencode({ 'where': 'a = 1' })]
+        self.assertEqual(index.match(clauses), { urls[0], urls[1], urls[3] })
+
+    def test_remove(self):
+        urls = [_page('a = 1', 0), _page('a = 1', 10)]
+        index = UrlClauseIndex.build(urls)
+        index.remove(urls[0])
+        clauses = [_schema, urlencode({ 'where': 'a = 1' })]
+        self.assertEqual(index.match(clauses), { urls[1] })
+
+    def test_unindexable_clause(self):
+        index = UrlClauseIndex.build([_page('a = 1', 0)])
+        self.assertIsNone(index.match(['a=1&b=2']))
+        self.assertIsNone(index.match(['query?f=json']))
+        self.assertIsNone(index.match([]))
@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Optional, Self, Set
+
+class UrlClauseIndex:
+    """
+    An inverted index from url clauses to the urls containing
+    them, this allows `FileCacher.forget_by_clause` to find
+    the urls it needs to remove without scanning every url
+    in the cache.
+
+    A url is indexed under two kinds of clauses:
+
+      1. Each query parameter as it appears in the url, so
+         `a?where=1%3D1&f=json` is indexed under `where=1%3D1`
+         and `f=json`.
+      2. Each prefix of the url path ending on a path segment,
+         so `https://h/a/query?f=json` is indexed under
+         `https://h/a/query`, `https://h/a` and `https://h`.
+
+    Clauses match exactly, so `resultOffset=1` won't match
+    `resultOffset=10` the way a substring test would.
+    """
+
+    def __init__(self: Self):
+        self._postings: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def build(urls: Iterable[str]) -> 'UrlClauseIndex':
+        index = UrlClauseIndex()
+        for url in urls:
+            index.add(url)
+        return index
+
+    def add(self: Self, url: str) -> None:
+        for clause in _url_clauses(url):
+            self._postings.setdefault(clause, set()).add(url)
+
+    def remove(self: Self, url: str) -> None:
+        for clause in _url_clauses(url):
+            urls = self._postings.get(clause)
+            if urls is None:
+                continue
+            urls.discard(url)
+            if not urls:
+                del self._postings[clause]
+
+    def match(self: Self, clauses: List[str]) -> Optional[Set[str]]:
+        """
+        Returns every url containing all the clauses, or None
+        if any of the clauses isn't something this index can
+        answer, in which case the caller should fall back to
+        scanning the urls.
+        """
+        if not clauses or not all(_is_indexable(c) for c in clauses):
+            return None
+
+        postings = sorted(
+            (self._postings.get(c, set()) for c in clauses),
+            key=len,
+        )
+        return set(postings[0]).intersection(*postings[1:])
+
+def _url_clauses(url: str) -> List[str]:
+    base, _, query = url.partition('?')
+    clauses = [p for p in query.split('&') if p]
+
+    scheme, sep, rest = base.partition('://')
+    if not sep:
+        scheme, rest = '', base
+
+    segments = rest.split('/')
+    for i in range(len(segments), 0, -1):
+        path = '/'.join(segments[:i])
+        clauses.append(f'{scheme}{sep}{path}')
+    return clauses
+
+def _is_indexable(clause: str) -> bool:
+    if '?' in clause or '&' in clause:
+        return False
+    if '://' in clause:
+        return not clause.endswith('/')
+    return '=' in clause and '/' not in clause
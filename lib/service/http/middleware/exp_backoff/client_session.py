@@ -7,6 +7,7 @@ from lib.service.http.util import url_host
 from lib.service.http.client_session import *
 
 from .config import BackoffConfig, RetryPreference
+from ..throttled.limiter import HostLimiters
 from .host_state import HostStateDiscovery, HostState
 
 class ExpBackoffClientSession(AbstractClientSession):
@@ -23,10 +24,11 @@ class ExpBackoffClientSession(AbstractClientSession):
 
     @staticmethod
     def create(config: BackoffConfig,
-               session: AbstractClientSession | None = None):
+               session: AbstractClientSession | None = None,
+               limiters: HostLimiters | None = None):
         clock = ClockService()
         session = session or ClientSession.create()
-        state_discovery = HostStateDiscovery()
+        state_discovery = HostStateDiscovery(limiters)
         factory = ResponseFactory(session=session,
                                   state_discovery=state_discovery,
                                   clock=clock,
@@ -1,22 +1,36 @@
 import asyncio
 from typing import Dict
 
+from ..throttled.limiter import HostLimiter, HostLimiters
 from .config import RetryPreference
 
 class HostState:
     _config: RetryPreference
     _currently_failing: asyncio.Event | None = None
 
-    def __init__(self, config: RetryPreference) -> None:
+    """
+    If the host is also throttled with an adaptive limit,
+    failures that lead to retries lower the host's limit.
+    """
+    _limiter: HostLimiter | None = None
+
+    def __init__(self, config: RetryPreference, limiter: HostLimiter | None = None) -> None:
         self._config = config
+        self._limiter = limiter
 
     async def block_other_requests_to_host(self) -> asyncio.Event | None:
+        if self._limiter is not None:
+            self._limiter.on_overload()
+
         if not self._config.pause_other_requests_while_retrying:
             return None
 
+        return await self._block()
+
+    async def _block(self) -> asyncio.Event:
         if self._currently_failing is not None:
             await self._currently_failing.wait()
-            return await self.block_other_requests_to_host()
+            return await self._block()
         else:
             self._currently_failing = asyncio.Event()
             return self._currently_failing
@@ -39,12 +53,15 @@ class HostState:
 
 class HostStateDiscovery:
     _states: Dict[str, 'HostState']
+    _limiters: HostLimiters | None
 
-    def __init__(self) -> None:
+    def __init__(self, limiters: HostLimiters | None = None) -> None:
         self._states = {}
+        self._limiters = limiters
 
     def find(self, host, pref: RetryPreference) -> 'HostState':
         if host not in self._states:
-            self._states[host] = HostState(pref)
+            limiter = self._limiters.find(host) if self._limiters else None
+            self._states[host] = HostState(pref, limiter)
         return self._states[host]
 
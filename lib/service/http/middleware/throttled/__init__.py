@@ -1,2 +1,3 @@
-from .client_session import ThrottledClientSession
+from .client_session import ThrottledClientSession, create_host_limiters
+from .limiter import HostLimiters
 from .config import *
@@ -3,31 +3,37 @@ from dataclasses import dataclass, field
 from logging import getLogger
 from typing import Any, List, Dict, AsyncGenerator
 
+from lib.service.clock import AbstractClockService, ClockService
 from lib.service.http import ClientSession
 from lib.service.http.util import url_host
 from lib.service.http.client_session import AbstractClientSession, AbstractGetResponse
 
 from .config import HostSemaphoreConfig
+from .limiter import AdaptiveLimiter, FixedLimiter, HostLimiter, HostLimiters
 
 class ThrottledClientSession(AbstractClientSession):
     _logger = getLogger(f'{__name__}.ThrottledSession')
     """
     We want to throttle on a host basis to avoid getting rate
-    limited of blocked. So we have a different semaphore for
+    limited of blocked. So we have a different limiter for
     the different hosts.
     """
-    _semaphores: Dict[str, asyncio.Semaphore]
+    _limiters: HostLimiters
 
-    def __init__(self, session: ClientSession, semaphores):
-        self._semaphores = semaphores
+    def __init__(self, session: ClientSession, limiters: HostLimiters):
+        self._limiters = limiters
         self._session = session
 
     @staticmethod
     def create(host_configs: List[HostSemaphoreConfig],
-               session: ClientSession | None = None):
-        semaphores = { c.host: asyncio.Semaphore(c.limit) for c in host_configs }
+               session: ClientSession | None = None,
+               limiters: HostLimiters | None = None):
+        limiters = limiters or create_host_limiters(host_configs)
         session = session or ClientSession.create()
-        return ThrottledClientSession(session, semaphores)
+        return ThrottledClientSession(session, limiters)
+
+    def limits(self) -> Dict[str, int]:
+        return self._limiters.limits()
 
     async def __aenter__(self):
         await self._session.__aenter__()
@@ -39,12 +45,13 @@ class ThrottledClientSession(AbstractClientSession):
 
     def get(self, url: str, headers: Dict[str, str] | None =None):
         host = url_host(url)
-        if host not in self._semaphores:
+        limiter = self._limiters.find(host)
+        if limiter is None:
             return self._session.get(url)
 
         return ThrottledGetResponse(url=url,
                                     headers=headers,
-                                    semaphore=self._semaphores[host],
+                                    limiter=limiter,
                                     session=self._session)
 
     @property
@@ -55,15 +62,16 @@ class ThrottledGetResponse(AbstractGetResponse):
     url: str
     headers: Dict[str, str] | None
 
-    _semaphore: asyncio.Semaphore
+    _limiter: HostLimiter
     _session: ClientSession
     _response: AbstractGetResponse | None = None
+    _started: float | None = None
 
-    def __init__(self, url, headers, semaphore, session):
+    def __init__(self, url, headers, limiter, session):
         self.url = url
         self.headers = headers
         self._session = session
-        self._semaphore = semaphore
+        self._limiter = limiter
 
     @property
     def status(self):
@@ -87,21 +95,46 @@ class ThrottledGetResponse(AbstractGetResponse):
             yield chunk
 
     async def __aenter__(self):
-        await self._semaphore.__aenter__()
-
-        if self._session.closed:
-            raise RuntimeError("http session has been closed")
-
-        self._response = self._session.get(self.url, headers=self.headers)
-        await self._response.__aenter__()
+        self._started = await self._limiter.acquire()
+
+        try:
+            if self._session.closed:
+                raise RuntimeError("http session has been closed")
+
+            self._response = self._session.get(self.url, headers=self.headers)
+            await self._response.__aenter__()
+        except:
+            # __aexit__ isn't called when __aenter__ fails, so
+            # the slot is released here to avoid leaking it.
+            self._response = None
+            await self._release(None)
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        await self._semaphore.__aexit__(exc_type, exc_value, traceback)
+        await self._release(self._response.status if self._response else None)
 
         if self._response:
             await self._response.__aexit__(exc_type, exc_value, traceback)
 
         return False
 
+    async def _release(self, status: int | None):
+        if self._started is None:
+            return
+        started, self._started = self._started, None
+        await self._limiter.release(started, status)
+
+def create_host_limiters(host_configs: List[HostSemaphoreConfig],
+                         clock: AbstractClockService | None = None) -> HostLimiters:
+    clock = clock or ClockService()
+    return HostLimiters({
+        c.host: (
+            AdaptiveLimiter(c.host, c.limit, c.min_limit, c.max_limit, clock)
+            if c.max_limit is not None else
+            FixedLimiter(c.limit, clock)
+        )
+        for c in host_configs
+    })
+
 
@@ -1,7 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import namedtuple
 
 @dataclass
 class HostSemaphoreConfig:
     host: str
     limit: int
+
+    """
+    When set, the limit adapts to how the host responds,
+    starting at `limit` and staying between `min_limit`
+    and `max_limit`.
+    """
+    max_limit: int | None = field(default=None)
+    min_limit: int = field(default=1)
+
+    @property
+    def upper_limit(self) -> int:
+        return self.max_limit or self.limit
@@ -0,0 +1,164 @@
+import asyncio
+from abc import ABC, abstractmethod
+from logging import getLogger
+import math
+from typing import Dict, Self
+
+from lib.service.clock import AbstractClockService
+
+class HostLimiter(ABC):
+    """
+    Limits the number of active requests to a host. The
+    status of each response (None if the request failed to
+    connect) is reported on release, so limiters that adapt
+    can react to how the host is coping.
+    """
+
+    @property
+    @abstractmethod
+    def limit(self: Self) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def acquire(self: Self) -> float:
+        """
+        Returns the time the slot was acquired.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def release(self: Self, started: float, status: int | None) -> None:
+        raise NotImplementedError()
+
+    def on_overload(self: Self) -> None:
+        """
+        Lets things outside of this session (like the backoff
+        middleware) tell the limiter the host is struggling.
+        """
+        return
+
+class FixedLimiter(HostLimiter):
+    def __init__(self: Self, limit: int, clock: AbstractClockService):
+        self._limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self._clock = clock
+
+    @property
+    def limit(self: Self) -> int:
+        return self._limit
+
+    async def acquire(self: Self) -> float:
+        await self._semaphore.acquire()
+        return self._clock.time()
+
+    async def release(self: Self, started: float, status: int | None) -> None:
+        self._semaphore.release()
+
+class AdaptiveLimiter(HostLimiter):
+    """
+    An AIMD (additive increase, multiplicative decrease)
+    limiter. Each healthy response grows the limit by
+    `1 / limit`, so roughly one extra slot per round of
+    requests, while a 429, 5xx or failed connection cuts
+    it by `decrease_ratio`.
+
+    Responses slower than `latency_tolerance` times the
+    average latency hold the limit where it is, as that
+    tends to mean the host is queuing our requests.
+
+    Many requests in flight tend to fail together, so after
+    cutting the limit further overloads are ignored for
+    `cooldown` seconds, otherwise one bad moment would take
+    the limit straight to the floor.
+    """
+    _logger = getLogger(f'{__name__}.AdaptiveLimiter')
+
+    def __init__(self: Self,
+                 host: str,
+                 initial: int,
+                 min_limit: int,
+                 max_limit: int,
+                 clock: AbstractClockService,
+                 decrease_ratio: float = 0.5,
+                 latency_tolerance: float = 2.0,
+                 latency_smoothing: float = 0.1,
+                 cooldown: float = 1.0):
+        if not (1 <= min_limit <= initial <= max_limit):
+            raise ValueError(f'expected 1 <= min_limit <= initial <= max_limit for {host}')
+        self._host = host
+        self._limit = float(initial)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._clock = clock
+        self._decrease_ratio = decrease_ratio
+        self._latency_tolerance = latency_tolerance
+        self._latency_smoothing = latency_smoothing
+        self._cooldown = cooldown
+        self._latency: float | None = None
+        self._last_decrease: float | None = None
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self: Self) -> int:
+        return max(self._min_limit, math.floor(self._limit))
+
+    @property
+    def in_flight(self: Self) -> int:
+        return self._in_flight
+
+    async def acquire(self: Self) -> float:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return self._clock.time()
+
+    async def release(self: Self, started: float, status: int | None) -> None:
+        if status is None or status == 429 or status >= 500:
+            self.on_overload()
+        else:
+            self._on_healthy(self._clock.time() - started)
+
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_overload(self: Self) -> None:
+        now = self._clock.time()
+        if self._last_decrease is not None and now - self._last_decrease < self._cooldown:
+            return
+
+        before = self.limit
+        self._limit = max(float(self._min_limit), self._limit * self._decrease_ratio)
+        self._last_decrease = now
+        if self.limit != before:
+            self._logger.info(f'{self._host} limit {before} -> {self.limit}')
+
+    def _on_healthy(self: Self, latency: float) -> None:
+        baseline = self._latency
+        self._latency = latency if baseline is None else \
+            baseline + self._latency_smoothing * (latency - baseline)
+
+        if baseline is not None and latency > baseline * self._latency_tolerance:
+            return
+
+        before = self.limit
+        self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+        if self.limit != before:
+            self._logger.debug(f'{self._host} limit {before} -> {self.limit}')
+
+class HostLimiters:
+    """
+    The limiters for each throttled host, shared between the
+    throttled session and anything else that wants to report
+    on, or feed into, the current limits.
+    """
+
+    def __init__(self: Self, limiters: Dict[str, HostLimiter]):
+        self._limiters = limiters
+
+    def find(self: Self, host: str) -> HostLimiter | None:
+        return self._limiters.get(host)
+
+    def limits(self: Self) -> Dict[str, int]:
+        return { host: l.limit for host, l in self._limiters.items() }
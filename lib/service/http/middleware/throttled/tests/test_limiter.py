@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase
+
+from lib.service.clock.mocks import MockClockService
+from lib.service.http.middleware.throttled.limiter import AdaptiveLimiter
+
+class AdaptiveLimiterTestCase(IsolatedAsyncioTestCase):
+    def _instance(self, clock, initial=4, min_limit=1, max_limit=8):
+        return AdaptiveLimiter('host', initial, min_limit, max_limit, clock, cooldown=1.0)
+
+    async def test_additive_increase(self):
+        clock = MockClockService(dt=datetime(2012, 1, 1))
+        limiter = self._instance(clock)
+        for _ in range(4):
+            await limiter.release(await limiter.acquire(), 200)
+        self.assertEqual(limiter.limit, 4)
+
+        await limiter.release(await limiter.acquire(), 200)
+        self.assertEqual(limiter.limit, 5)
+
+    async def test_capped_at_max(self):
+        clock = MockClockService(dt=datetime(2012, 1, 1))
+        limiter = self._instance(clock, max_limit=5)
+        for _ in range(100):
+            await limiter.release(await limiter.acquire(), 200)
+        self.assertEqual(limiter.limit, 5)
+
+    async def test_multiplicative_decrease_with_cooldown(self):
+        clock = MockClockService(dt=datetime(2012, 1, 1))
+        limiter = self._instance(clock, initial=8)
+        await limiter.release(await limiter.acquire(), 429)
+        self.assertEqual(limiter.limit, 4)
+
+        await limiter.release(await limiter.acquire(), 503)
+        self.assertEqual(limiter.limit, 4)
+
+        clock.tick_time(2)
+        await limiter.release(await limiter.acquire(), None)
+        self.assertEqual(limiter.limit, 2)
+
+        clock.tick_time(2)
+        limiter.on_overload()
+        clock.tick_time(2)
+        limiter.on_overload()
+        self.assertEqual(limiter.limit, 1)
+
+    async def test_slow_responses_hold_limit(self):
+        clock = MockClockService(dt=datetime(2012, 1, 1))
+        limiter = self._instance(clock, initial=4)
+        started = await limiter.acquire()
+        clock.tick_time(1)
+        await limiter.release(started, 200)
+        self.assertEqual(limiter.limit, 4)
+
+        started = await limiter.acquire()
+        clock.tick_time(10)
+        await limiter.release(started, 200)
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_blocks_beyond_limit(self):
+        clock = MockClockService(dt=datetime(2012, 1, 1))
+        limiter = self._instance(clock, initial=1, max_limit=1)
+        started = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        await limiter.release(started, 200)
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(limiter.in_flight, 1)
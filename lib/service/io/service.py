@@ -62,6 +62,12 @@ class IoServiceImpl(IoService):
                 async for line in f:
                     yield line
 
+    async def f_read_bytes(self, file_path: str) -> bytes:
+        async with self._semaphore:
+            async with aiofiles.open(file_path, 'rb') as f:
+                data = await f.read()
+        return data
+
     async def f_read_slice(self, file_path: str, offset: int, length: int) -> bytes:
         async with self._semaphore:
             async with aiofiles.open(file_path, 'rb') as f:
@@ -88,6 +94,30 @@ class IoServiceImpl(IoService):
                         break
                     yield chunk
 
+    async def zip_members(self, zip_path: str) -> List[Tuple[str, int]]:
+        async with self._semaphore:
+            members = await asyncio.to_thread(_sync_zip_members, zip_path)
+        return members
+
+    async def f_read_zip_member_chunks(self,
+                                       zip_path: str,
+                                       member: str,
+                                       chunk_size=1024) -> AsyncGenerator[bytes, None]:
+        async with self._semaphore:
+            z = await asyncio.to_thread(ZipFile, zip_path, 'r')
+            try:
+                f = await asyncio.to_thread(z.open, member)
+                try:
+                    while True:
+                        chunk = await asyncio.to_thread(f.read, chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+                finally:
+                    f.close()
+            finally:
+                z.close()
+
     def f_writter(self: Self, file_path: str) -> FileWritter:
         return FileWritterImpl(aiofiles.open(file_path, mode='wb'), None)
 
@@ -96,6 +126,16 @@ class IoServiceImpl(IoService):
             async with aiofiles.open(file_path, 'w') as f:
                 await f.write(data)
 
+    async def f_write_bytes(self, file_path: str, data: bytes):
+        async with self._semaphore:
+            async with aiofiles.open(file_path, 'wb') as f:
+                await f.write(data)
+
+    async def f_append(self, file_path: str, data: str):
+        async with self._semaphore:
+            async with aiofiles.open(file_path, 'a') as f:
+                await f.write(data)
+
     async def f_delete(self, file_path: str):
         await asyncio.to_thread(os.remove, file_path)
 
@@ -165,6 +205,10 @@ def _sync_unzip(zipfile: str, unzip_to: str):
     with ZipFile(zipfile, 'r') as z:
         z.extractall(unzip_to)
 
+def _sync_zip_members(zip_path: str) -> List[Tuple[str, int]]:
+    with ZipFile(zip_path, 'r') as z:
+        return [(i.filename, i.file_size) for i in z.infolist() if not i.is_dir()]
+
 def _sync_check_if_dir_empty(dir_name: str) -> bool:
     with os.scandir(dir_name) as it:
         for entry in it:
@@ -58,9 +58,27 @@ class IoService(Protocol):
                       chunk_size=1024) -> AsyncGenerator[bytes, None]:
         ...
 
+    async def f_read_bytes(self, file_path: str) -> bytes:
+        ...
+
+    async def zip_members(self, zip_path: str) -> list[tuple[str, int]]:
+        ...
+
+    def f_read_zip_member_chunks(self,
+                                 zip_path: str,
+                                 member: str,
+                                 chunk_size=1024) -> AsyncGenerator[bytes, None]:
+        ...
+
     async def f_write(self, file_path: str, data: str):
         ...
 
+    async def f_write_bytes(self, file_path: str, data: bytes):
+        ...
+
+    async def f_append(self, file_path: str, data: str):
+        ...
+
     def f_writter(self, file_path: str) -> FileWritter:
         ...
 
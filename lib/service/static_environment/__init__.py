@@ -1,2 +1,2 @@
-from .initialiser import StaticEnvironmentInitialiser
+from .initialiser import StaticEnvironmentInitialiser, download_path
 from .config import *
@@ -16,6 +16,9 @@ CHUNKSIZE_16KB = 16384
 
 _T = TypeVar('_T', bound=Target)
 
+def download_path(target: Target) -> str:
+    return '_out_web/%s' % target.web_dst
+
 class StaticEnvironmentInitialiser:
     _logger = getLogger(f'{__name__}.StaticEnvironmentInitialiser')
 
@@ -40,9 +43,16 @@ class StaticEnvironmentInitialiser:
     def queue_target(self, target: Target):
         self._targets.append(target)
 
-    async def with_targets(self, targets: Sequence[_T]) -> AsyncIterator[_T]:
+    async def with_targets(self,
+                           targets: Sequence[_T],
+                           extract: bool = True) -> AsyncIterator[_T]:
+        """
+        Yields each target once it's installed. With `extract`
+        false targets are only downloaded, for callers reading
+        straight out of the zip at `download_path(target)`.
+        """
         async def install(t: _T) -> _T:
-            await self._install_target(t)
+            await self._install_target(t, extract)
             return t
 
         async with asyncio.TaskGroup() as tg:
@@ -58,10 +68,10 @@ class StaticEnvironmentInitialiser:
         if not await self._io.is_dir(dir_name):
             await self._io.mk_dir(dir_name)
 
-    async def _install_target(self, target: Target) -> None:
+    async def _install_target(self, target: Target, extract: bool = True) -> None:
         self._logger.info(f'Checking Target "{target.web_dst}"')
-        w_out = '_out_web/%s' % target.web_dst
-        z_out = target.zip_dst and '_out_zip/%s' % target.zip_dst
+        w_out = download_path(target)
+        z_out = extract and target.zip_dst and '_out_zip/%s' % target.zip_dst
 
         if not await self._io.is_file(w_out):
             self._logger.info(f'Downloading "{target.url} to {w_out}"')
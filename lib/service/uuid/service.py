@@ -1,11 +1,29 @@
-from typing import Protocol
+import os
+from typing import List, Protocol
 import uuid
 
+import numpy
+
 class UuidService(Protocol):
     def get_uuid4_hex(self) -> str:
         ...
 
+    def get_uuid4_hex_batch(self, n: int) -> List[str]:
+        return [self.get_uuid4_hex() for _ in range(n)]
+
 class UuidServiceImpl(UuidService):
     def get_uuid4_hex(self) -> str:
         return uuid.uuid4().hex
 
+    def get_uuid4_hex_batch(self, n: int) -> List[str]:
+        """
+        Same as `uuid.uuid4` (random bytes with the version &
+        variant bits set) but done in bulk.
+        """
+        if n <= 0:
+            return []
+        raw = numpy.frombuffer(os.urandom(16 * n), dtype=numpy.uint8).reshape((n, 16)).copy()
+        raw[:, 6] = (raw[:, 6] & 0x0f) | 0x40
+        raw[:, 8] = (raw[:, 8] & 0x3f) | 0x80
+        hex_s = raw.tobytes().hex()
+        return [hex_s[i:i + 32] for i in range(0, 32 * n, 32)]
@@ -2,6 +2,7 @@ from functools import reduce
 import json
 from typing import Any, Dict, List, Set, Tuple
 from lib.service.io import IoService, IoServiceImpl
+from lib.service.http.middleware.cache.state_store import replay_journal
 
 _CACHE_STATE = './_out_state/http-cache.json'
 _CACHE_DIR = '_out_cache'
@@ -22,6 +23,16 @@ async def fix_cache(io: IoService) -> None:
         async for f in io.grep_dir('./_out_state', '*-cache.json')
     }
 
+    # fold in any changes that were journaled but never
+    # compacted into the snapshot, typically from a crash.
+    journals: Dict[str, str] = {}
+    for f, state in cache_states.items():
+        journal = f.removesuffix('.json') + '.journal'
+        if await io.f_exists(journal):
+            print(f'Replaying {journal}')
+            await replay_journal(io, journal, state['files'])
+            journals[f] = journal
+
     files_referenced_in_cache: List[str] = reduce(lambda acc, it: [*acc, *[
         f'{_CACHE_DIR}/{fmt['location']}'
         for formats in it['files'].values()
@@ -54,6 +65,8 @@ async def fix_cache(io: IoService) -> None:
 
         print(f"Saving {f}")
         await io.f_write(f, json.dumps(state, indent=1))
+        if f in journals:
+            await io.f_write(journals[f], '')
 
 
 if __name__ == '__main__':
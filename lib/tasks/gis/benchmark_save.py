@@ -0,0 +1,128 @@
+from logging import getLogger
+import math
+from typing import Any, List, Tuple
+
+from lib.pipeline.gis.ingestion import copy_rows, parse_page
+from lib.service.clock import ClockService
+from lib.service.database import DatabaseConfig, DatabaseService, DatabaseServiceImpl
+from lib.utility.df import GeometryEncoding
+
+_logger = getLogger(__name__)
+
+_TABLE = 'pg_temp.gis_save_benchmark'
+
+_COLUMN_FORMATS: Any = {
+    'geometry': 'geometry',
+    'create_date': 'timestamp_ms',
+    'shape_area': 'number',
+}
+
+def _synthetic_page(size: int, vertices: int) -> List[Any]:
+    def ring(i: int):
+        cx, cy = 150 + (i % 100) * 0.01, -33 - (i // 100) * 0.01
+        pts = [
+            [cx + math.cos(v / vertices * math.tau) * 0.001,
+             cy + math.sin(v / vertices * math.tau) * 0.001]
+            for v in range(vertices)
+        ]
+        return [*pts, pts[0]]
+
+    return [
+        {
+            'attributes': {
+                'object_id': i,
+                'lot_id_string': f'{i}//DP{i}',
+                'create_date': 1_600_000_000_000 + i,
+                'shape_area': float(i),
+            },
+            'geometry': { 'rings': [ring(i)] },
+        }
+        for i in range(size)
+    ]
+
+async def benchmark_save(
+    db: DatabaseService,
+    clock: ClockService,
+    pages: int,
+    page_size: int,
+    vertices: int,
+    geometry_encoding: GeometryEncoding = 'wkt',
+) -> List[Tuple[str, float]]:
+    """
+    Compares the rows per second of the executemany path
+    against the COPY path used by `GisIngestion._save`, on
+    the same prepared rows, into a temporary table.
+
+    No numbers have been recorded for this yet, so the copy
+    mode's speed up over write is unmeasured.
+    """
+    df, prepared = parse_page(_synthetic_page(page_size, vertices), 7844, {},
+                              (_TABLE, 7844, _COLUMN_FORMATS, geometry_encoding))
+    assert prepared is not None
+    df_copy, query = prepared
+    rows = df_copy.to_records(index=False).tolist()
+    columns = list(df_copy.columns)
+    results: List[Tuple[str, float]] = []
+
+    async with db.async_connect() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f'''
+                CREATE TEMP TABLE gis_save_benchmark (
+                  object_id BIGINT NOT NULL,
+                  lot_id_string TEXT NOT NULL,
+                  create_date TIMESTAMP NOT NULL,
+                  shape_area FLOAT,
+                  geometry GEOMETRY)
+            ''')
+
+            for mode in ['executemany', 'copy']:
+                await cur.execute(f'TRUNCATE {_TABLE}')
+                t_start = clock.time()
+                for _ in range(pages):
+                    if mode == 'copy':
+                        await copy_rows(cur, _TABLE, columns, rows)
+                    else:
+                        await cur.executemany(query, rows)
+                    await conn.commit()
+                elapsed = clock.time() - t_start
+                rows_per_sec = (pages * len(rows)) / elapsed
+                _logger.info(f'{mode.rjust(11)}: {rows_per_sec:.0f} rows/sec ({elapsed:.2f}s)')
+                results.append((mode, rows_per_sec))
+    return results
+
+async def _cli_main(db_cfg: DatabaseConfig,
+                    pages: int,
+                    page_size: int,
+                    vertices: int,
+                    geometry_encoding: GeometryEncoding):
+    db = DatabaseServiceImpl.create(db_cfg, 1)
+    await db.open()
+    try:
+        await benchmark_save(db, ClockService(), pages, page_size, vertices, geometry_encoding)
+    finally:
+        await db.close()
+
+if __name__ == '__main__':
+    import asyncio
+    import argparse
+    import logging
+
+    from lib.defaults import INSTANCE_CFG
+
+    parser = argparse.ArgumentParser(description="benchmark gis page saving")
+    parser.add_argument("--instance", type=int, required=True)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=40)
+    parser.add_argument("--geometry-encoding", choices=['wkt', 'wkb'], default='wkt')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    instance_cfg = INSTANCE_CFG[args.instance]
+    asyncio.run(_cli_main(instance_cfg.database,
+                          args.pages,
+                          args.page_size,
+                          args.vertices,
+                          args.geometry_encoding))
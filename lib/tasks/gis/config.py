@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Literal
 from lib.pipeline.gis import DateRangeParam, GisWorkerDbMode
+from lib.service.http.middleware.cache import HttpCacheStorageFormat
+from lib.utility.df import GeometryEncoding
 
 
 class GisTaskConfig:
@@ -16,6 +18,14 @@ class GisTaskConfig:
         projections: List['GisTaskConfig.ProjectionKind']
         exp_backoff_attempts: int
         disable_cache: bool
+        cache_format: HttpCacheStorageFormat = 'plain'
+        parse_workers: int = 0
+        geometry_encoding: GeometryEncoding = 'wkt'
+        """
+        Continue a scrape from its checkpoint, skipping pages
+        saved by an earlier run rather than starting afresh.
+        """
+        resume: bool = False
 
     @dataclass
     class Deduplication:
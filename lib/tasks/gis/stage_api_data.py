@@ -16,6 +16,7 @@ from lib.pipeline.gis import (
     FeaturePaginationSharderFactory,
     FeatureServerClient,
     FeatureExpBackoff,
+    GisCheckpoint,
     GisIngestion,
     GisIngestionConfig,
     GisPipeline,
@@ -34,7 +35,9 @@ from lib.service.http import (
     ExpBackoffClientSession,
     HostSemaphoreConfig,
     HttpLocalCache,
+    HttpMemoryTier,
     ThrottledClientSession,
+    create_host_limiters,
 )
 from lib.service.http.middleware.exp_backoff import BackoffConfig, RetryPreference
 from lib.service.uuid import *
@@ -42,8 +45,12 @@ from lib.tooling.schema import create_schema_controller, SchemaCommand
 
 from .config import GisTaskConfig
 
+_logger = getLogger(__name__)
+
+_CHECKPOINT_PATH = './_out_state/gis-checkpoint.jsonl'
+
 def http_limits_of(ss: List[HostSemaphoreConfig]) -> int:
-    return reduce(lambda acc, it: acc + it.limit, ss, 0)
+    return reduce(lambda acc, it: acc + it.upper_limit, ss, 0)
 
 def _parse_date_range(s: Optional[str], clock: ClockService) -> Optional[DateRangeParam]:
     match s:
@@ -87,10 +94,13 @@ async def stage_gis_api_data(
         active requests is set on a host basis.
     """
 
+    host_limiters = create_host_limiters(HOST_SEMAPHORE_CONFIG)
+
     def get_session(cacher: Optional[HttpLocalCache]):
         exp_boff_sesh = ExpBackoffClientSession.create(
-            session=ThrottledClientSession.create(HOST_SEMAPHORE_CONFIG),
+            session=ThrottledClientSession.create(HOST_SEMAPHORE_CONFIG, limiters=host_limiters),
             config=BACKOFF_CONFIG,
+            limiters=host_limiters,
         )
 
         if cacher is None:
@@ -100,6 +110,10 @@ async def stage_gis_api_data(
                 session=exp_boff_sesh,
                 file_cache=cacher,
                 io_service=io,
+                memory_tier=HttpMemoryTier(
+                    byte_budget=64 * 1024 ** 2,
+                    max_entry_bytes=16 * 1024,
+                ),
             )
 
     cache_cleaner: AbstractCacheCleaner
@@ -108,7 +122,8 @@ async def stage_gis_api_data(
         http_file_cache = None
         cache_cleaner = DisabledCacheCleaner()
     else:
-        http_file_cache = HttpLocalCache.create(io, uuid, 'gis')
+        http_file_cache = HttpLocalCache.create(
+            io, uuid, 'gis', storage_format=conf.cache_format)
         cache_cleaner = CacheCleaner(http_file_cache)
 
     projections: List[GisProjection] = []
@@ -118,10 +133,17 @@ async def stage_gis_api_data(
     if 'snsw_prop' in conf.projections:
         projections.append(defaults.SNSW_PROP_PROJECTION)
 
+    checkpoint: Optional[GisCheckpoint] = None
+
     match conf.db_mode:
-        case 'write':
+        case 'write' | 'copy':
             api_workers = http_limits_of(HOST_SEMAPHORE_CONFIG)
             db_workers = conf.db_workers
+            checkpoint = GisCheckpoint(io, _CHECKPOINT_PATH)
+            if conf.resume:
+                await checkpoint.load()
+            else:
+                await checkpoint.reset()
         case 'skip':
             api_workers = http_limits_of(HOST_SEMAPHORE_CONFIG)
             db_workers = 1
@@ -140,19 +162,27 @@ async def stage_gis_api_data(
                 api_worker_backpressure=db_workers * 4,
                 db_mode=conf.db_mode,
                 db_workers=db_workers,
-                chunk_size=None),
+                chunk_size=None,
+                parse_workers=conf.parse_workers,
+                geometry_encoding=conf.geometry_encoding),
             feature_client,
             db,
             telemetry,
-            cache_cleaner)
-        sharder_factory = FeaturePaginationSharderFactory(feature_client, telemetry)
-        pipeline = GisPipeline(sharder_factory, ingestion)
+            cache_cleaner,
+            checkpoint)
+        sharder_factory = FeaturePaginationSharderFactory(
+            feature_client, telemetry, checkpoint=checkpoint)
+        pipeline = GisPipeline(sharder_factory, ingestion, telemetry, checkpoint)
 
         await pipeline.start([
             (p, conf.gis_params)
             for p in projections
         ])
 
+        if isinstance(session, CachedClientSession):
+            _logger.info(f'http memory tier, {session.memory_tier_stats()}')
+        _logger.info(f'http host limits, {host_limiters.limits()}')
+
 async def run_in_console(
     open_file_limit: int,
     db_config: DatabaseConfig,
@@ -164,7 +194,7 @@ async def run_in_console(
     clock = ClockService()
     controller = create_schema_controller(io, db, uuid)
     match config.db_mode:
-        case 'write':
+        case 'write' | 'copy' if not config.resume:
             await controller.command(SchemaCommand.drop(ns='nsw_spatial'))
             await controller.command(SchemaCommand.create(ns='nsw_spatial'))
     await stage_gis_api_data(io, db, uuid, clock, config)
@@ -183,9 +213,13 @@ if __name__ == '__main__':
     parser.add_argument("--gis-range", type=str)
     parser.add_argument("--instance", type=int, required=True)
     parser.add_argument("--db-connections", type=int, default=32)
-    parser.add_argument("--db-mode", choices=['write', 'print_head_then_quit', 'skip'], required=True)
+    parser.add_argument("--db-mode", choices=['write', 'copy', 'print_head_then_quit', 'skip'], required=True)
     parser.add_argument("--exp-backoff-attempts", type=int, default=8)
     parser.add_argument("--disable-cache", action='store_true', required=False)
+    parser.add_argument("--cache-format", choices=['plain', 'gzip'], default='plain')
+    parser.add_argument("--parse-workers", type=int, default=0)
+    parser.add_argument("--geometry-encoding", choices=['wkt', 'wkb'], default='wkt')
+    parser.add_argument("--resume", action='store_true', default=False)
     parser.add_argument('--projections', nargs='*', choices=GisTaskConfig.projection_kinds)
 
     args = parser.parse_args()
@@ -218,6 +252,10 @@ if __name__ == '__main__':
                     gis_params=params,
                     exp_backoff_attempts=args.exp_backoff_attempts,
                     disable_cache=args.disable_cache,
+                    cache_format=args.cache_format,
+                    parse_workers=args.parse_workers,
+                    geometry_encoding=args.geometry_encoding,
+                    resume=args.resume,
                     projections=args.projections or GisTaskConfig.projection_kinds,
                 ),
             ),
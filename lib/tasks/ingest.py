@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
+import os
 import shutil
-from typing import Optional, Set
+from typing import List, Optional, Set
 
 import lib.pipeline.abs.config as abs_config
 from lib.pipeline.abs import *
@@ -13,10 +14,10 @@ from lib.pipeline.nsw_vg.land_values import NswVgLvCsvDiscoveryMode
 from lib.pipeline.nsw_vg.property_sales.ingestion import NSW_VG_PS_INGESTION_CONFIG
 from lib.service.clock import ClockService
 from lib.service.docker import DockerService, ImageConfig, ContainerConfig
-from lib.service.database import DatabaseServiceImpl, DatabaseConfig
+from lib.service.database import DatabaseService, DatabaseServiceImpl, DatabaseConfig
 from lib.service.io import IoService, IoServiceImpl
-from lib.service.uuid import UuidServiceImpl
-from lib.tasks.fetch_static_files import initialise, get_session
+from lib.service.uuid import UuidService, UuidServiceImpl
+from lib.tasks.fetch_static_files import Environment, initialise, get_session
 from lib.tasks.gis import ingest_gis, GisTaskConfig, http_limits_of
 from lib.tasks.ingest_gnaf import ingest_gnaf
 from lib.tasks.ingest_abs import ingest_all as ingest_abs
@@ -27,6 +28,7 @@ from lib.tasks.schema.update import update_schema, UpdateSchemaConfig
 from lib.tasks.schema.clean_staging import clean_staging_data
 from lib.tasks.schema.partition import config_partitions, ConfigPartitionsCfg
 from lib.tooling.schema.config import ns_dependency_order
+from lib.utility.concurrent import Stage, StageResources, StageScheduler
 from lib.utility.format import fmt_time_elapsed
 
 @dataclass
@@ -45,6 +47,11 @@ class IngestConfig:
     enable_gnaf: bool
     enable_clean_staging_data: bool
 
+    # budget shared by stages running at the same time, on top
+    # of the `db_connections` held by the parent process.
+    stage_db_connections: int = field(default=160)
+    stage_cpu_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+
 _logger = logging.getLogger(__name__)
 
 async def ingest_all(config: IngestConfig):
@@ -90,128 +97,237 @@ async def ingest_all(config: IngestConfig):
         io_service,
     )
 
-    if config.enable_abs:
-        await ingest_abs(
-            AbsIngestionConfig(
-                ingest_sources=[
-                    ABS_MAIN_STRUCTURES,
-                    NON_ABS_MAIN_STRUCTURES,
-                    INDIGENOUS_STRUCTURES,
-                ],
-                worker_count=4,
-                worker_config=AbsWorkerConfig(
-                    db_config=db_service_config,
-                    db_connections=2,
-                    enable_logging=True,
-                    enable_logging_debug=False,
-                ),
-            ),
+    stages = ingest_stages(config, environment, clock, db_service, io_service, uuid)
+    scheduler = StageScheduler(
+        db_connections=config.stage_db_connections,
+        cpu_workers=config.stage_cpu_workers,
+    )
+    await scheduler.run(stages)
+
+    if not config.enable_clean_staging_data:
+        _logger.info('staging data not cleaned')
+
+    _logger.info(f"({fmt_time_elapsed(t_start, clock.time(), format="hms")}) Done")
+    _logger.debug(repr(config))
+
+def ingest_stages(config: IngestConfig,
+                  environment: Environment,
+                  clock: ClockService,
+                  db_service: DatabaseService,
+                  io_service: IoService,
+                  uuid: UuidService) -> List[Stage]:
+    """
+    Everything loaded after the schema is set up, as stages
+    for the `StageScheduler`, so stages that don't depend on
+    each other's data can run at the same time.
+    """
+    db_service_config = config.db_config
+    abs_cfg = AbsIngestionConfig(
+        ingest_sources=[
+            ABS_MAIN_STRUCTURES,
+            NON_ABS_MAIN_STRUCTURES,
+            INDIGENOUS_STRUCTURES,
+        ],
+        worker_count=4,
+        worker_config=AbsWorkerConfig(
+            db_config=db_service_config,
+            db_connections=2,
+            enable_logging=True,
+            enable_logging_debug=False,
+        ),
+    )
+    lv_cfg = NswVgTaskConfig.LandValue.Main(
+        land_value_source='byo',
+        discovery_mode=config.nswvg_lv_depth,
+        truncate_raw_earlier=False,
+        child_n=8,
+        child_cfg=NswVgTaskConfig.LandValue.Child(
+            debug=False,
+            db_conn=16,
+            chunk_size=1000,
+            db_config=db_service_config,
+        ),
+    )
+    psi_cfg = NswVgTaskConfig.PsiIngest(
+        worker_count=8,
+        worker_config=NswVgPsiWorkerConfig(
+            db_config=db_service_config,
+            db_pool_size=16,
+            db_batch_size=1000,
+            file_limit=None,
+            ingestion_config=NSW_VG_PS_INGESTION_CONFIG,
+            parser_chunk_size=8 * 2 ** 10,
+            log_config=None,
+        ),
+        parent_config=NswVgPsiSupervisorConfig(
+            target_root_dir='./_out_zip',
+            publish_min=config.nswvg_psi_publish_min,
+            publish_max=None,
+            download_min=None,
+            download_max=None,
+            split_size=32 * 2 ** 20,
+        ),
+    )
+    prop_desc_cfg = NswVgTaskConfig.PropDescIngest(
+        truncate_earlier=False,
+        worker_debug=False,
+        workers=8,
+        sub_workers=8,
+        db_config=db_service_config,
+    )
+
+    async def run_nswvg(**parts) -> None:
+        await ingest_nswvg(
+            environment,
+            clock,
             db_service,
             io_service,
             uuid,
+            NswVgTaskConfig.Ingestion(**{
+                'load_raw_land_values': None,
+                'load_raw_property_sales': None,
+                'deduplicate': None,
+                'property_descriptions': None,
+                **parts,
+            }),
         )
 
+    async def run_gis(**parts) -> None:
+        await ingest_gis(
+            io_service,
+            db_service,
+            uuid,
+            clock,
+            GisTaskConfig.Ingestion(**{
+                'staging': None,
+                'deduplication': None,
+                **parts,
+            }),
+        )
 
-    await ingest_nswvg(
-        environment,
-        clock,
-        db_service,
-        io_service,
-        uuid,
-        NswVgTaskConfig.Ingestion(
-            load_raw_land_values=NswVgTaskConfig.LandValue.Main(
-                land_value_source='byo',
-                discovery_mode=config.nswvg_lv_depth,
-                truncate_raw_earlier=False,
-                child_n=8,
-                child_cfg=NswVgTaskConfig.LandValue.Child(
-                    debug=False,
-                    db_conn=16,
-                    chunk_size=1000,
-                    db_config=db_service_config,
-                ),
+    # Stage outputs are what later stages wait on, the stages
+    # writing to the same nsw_lrs tables are chained so they
+    # never write to them at the same time. Each stage's db
+    # connections are the size of the pools it opens, so with
+    # the default budget the land value & property sale loads
+    # (128 each) still run one after the other.
+    stages: List[Stage] = [
+        Stage(
+            name='nswvg_land_values',
+            run=lambda: run_nswvg(load_raw_land_values=lv_cfg),
+            outputs=frozenset({'nsw_vg_raw.land_value_row'}),
+            needs=StageResources(
+                db_connections=lv_cfg.child_n * lv_cfg.child_cfg.db_conn,
+                cpu_workers=lv_cfg.child_n,
             ),
-            load_raw_property_sales=NswVgTaskConfig.PsiIngest(
-                worker_count=8,
-                worker_config=NswVgPsiWorkerConfig(
-                    db_config=db_service_config,
-                    db_pool_size=16,
-                    db_batch_size=1000,
-                    file_limit=None,
-                    ingestion_config=NSW_VG_PS_INGESTION_CONFIG,
-                    parser_chunk_size=8 * 2 ** 10,
-                    log_config=None,
-                ),
-                parent_config=NswVgPsiSupervisorConfig(
-                    target_root_dir='./_out_zip',
-                    publish_min=config.nswvg_psi_publish_min,
-                    publish_max=None,
-                    download_min=None,
-                    download_max=None,
-                ),
-            ),
-            deduplicate=NswVgTaskConfig.Dedup(
-                run_from=None,
-                run_till=None,
+        ),
+        Stage(
+            name='nswvg_property_sales',
+            run=lambda: run_nswvg(load_raw_property_sales=psi_cfg),
+            outputs=frozenset({'nsw_vg_raw.ps_row'}),
+            needs=StageResources(
+                db_connections=psi_cfg.worker_count * psi_cfg.worker_config.db_pool_size,
+                cpu_workers=psi_cfg.worker_count,
             ),
-            property_descriptions=NswVgTaskConfig.PropDescIngest(
-                truncate_earlier=False,
-                worker_debug=False,
-                workers=8,
-                sub_workers=8,
-                db_config=db_service_config,
+        ),
+        Stage(
+            name='nswvg_deduplicate',
+            run=lambda: run_nswvg(deduplicate=NswVgTaskConfig.Dedup(run_from=None, run_till=None)),
+            inputs=frozenset({'nsw_vg_raw.land_value_row', 'nsw_vg_raw.ps_row'}),
+            outputs=frozenset({'nsw_lrs.deduplicated'}),
+            needs=StageResources(cpu_workers=1),
+        ),
+        Stage(
+            name='nswvg_property_descriptions',
+            run=lambda: run_nswvg(property_descriptions=prop_desc_cfg),
+            inputs=frozenset({'nsw_lrs.deduplicated'}),
+            outputs=frozenset({'nsw_lrs.property_description'}),
+            needs=StageResources(
+                # each sub worker reads & writes over separate connections
+                db_connections=prop_desc_cfg.workers * prop_desc_cfg.sub_workers * 2,
+                cpu_workers=prop_desc_cfg.workers,
             ),
         ),
-    )
+    ]
+
+    if config.enable_abs:
+        stages.append(Stage(
+            name='abs',
+            run=lambda: ingest_abs(abs_cfg, db_service, io_service, uuid),
+            outputs=frozenset({'abs'}),
+            needs=StageResources(
+                db_connections=abs_cfg.worker_count * abs_cfg.worker_config.db_connections,
+                cpu_workers=abs_cfg.worker_count,
+            ),
+        ))
 
     if config.enable_gnaf:
-        await ingest_gnaf(
-            GnafConfig(
-                target=environment.gnaf.publication,
-                states=config.gnaf_states,
-                workers=8,
-                worker_config=GnafWorkerConfig(
-                    db_config=instance_cfg.database,
-                    db_poolsize=8,
-                    batch_size=1000,
-                ),
+        if environment.gnaf.publication is None:
+            raise TypeError('missing gnaf publication')
+
+        gnaf_cfg = GnafConfig(
+            target=environment.gnaf.publication,
+            states=config.gnaf_states,
+            workers=8,
+            worker_config=GnafWorkerConfig(
+                db_config=db_service_config,
+                db_poolsize=8,
+                batch_size=1000,
             ),
-            db_service,
-            io_service,
         )
+        stages.append(Stage(
+            name='gnaf',
+            run=lambda: ingest_gnaf(gnaf_cfg, db_service, io_service),
+            outputs=frozenset({'gnaf'}),
+            needs=StageResources(
+                db_connections=gnaf_cfg.workers * gnaf_cfg.worker_config.db_poolsize,
+                cpu_workers=gnaf_cfg.workers,
+            ),
+        ))
 
     if config.enable_gis:
-        await ingest_gis(
-            io_service,
-            db_service,
-            uuid,
-            clock,
-            GisTaskConfig.Ingestion(
-                deduplication=GisTaskConfig.Deduplication(
-                    run_from=None,
-                    run_till=None,
-                    truncate=False,
-                ),
-                staging=GisTaskConfig.StageApiData(
-                    db_workers=config.db_connections,
-                    db_mode='write',
-                    gis_params=[],
-                    exp_backoff_attempts=8,
-                    disable_cache=False,
-                    projections=GisTaskConfig.projection_kinds,
-                ),
-            )
-        )
+        stages.append(Stage(
+            name='gis_staging',
+            run=lambda: run_gis(staging=GisTaskConfig.StageApiData(
+                db_workers=config.db_connections,
+                db_mode='write',
+                gis_params=[],
+                exp_backoff_attempts=8,
+                disable_cache=False,
+                projections=GisTaskConfig.projection_kinds,
+            )),
+            outputs=frozenset({'nsw_spatial.staging'}),
+            needs=StageResources(
+                cpu_workers=1,
+                http_hosts=frozenset(h.host for h in HOST_SEMAPHORE_CONFIG),
+            ),
+        ))
+        stages.append(Stage(
+            name='gis_deduplicate',
+            run=lambda: run_gis(deduplication=GisTaskConfig.Deduplication(
+                run_from=None,
+                run_till=None,
+                truncate=False,
+            )),
+            inputs=frozenset({'nsw_spatial.staging', 'nsw_lrs.property_description'}),
+            outputs=frozenset({'nsw_lrs.geometry'}),
+            needs=StageResources(cpu_workers=1),
+        ))
 
-    await run_count_for_schemas(db_service_config, ns_dependency_order)
+    stages.append(Stage(
+        name='count',
+        run=lambda: run_count_for_schemas(db_service_config, ns_dependency_order),
+        inputs=frozenset(o for stage in stages for o in stage.outputs),
+        outputs=frozenset({'counts'}),
+    ))
 
     if config.enable_clean_staging_data:
-        await clean_staging_data(db_service, io_service, uuid)
-    else:
-        _logger.info('staging data not cleaned')
-
-    _logger.info(f"({fmt_time_elapsed(t_start, clock.time(), format="hms")}) Done")
-    _logger.debug(repr(config))
+        stages.append(Stage(
+            name='clean_staging',
+            run=lambda: clean_staging_data(db_service, io_service, uuid),
+            inputs=frozenset({'counts'}),
+        ))
+    return stages
 
 if __name__ == '__main__':
     import asyncio
@@ -224,6 +340,8 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="db schema tool")
     parser.add_argument("--debug", action='store_true', default=False)
     parser.add_argument("--instance", type=int, required=True)
+    parser.add_argument("--stage-db-connections", type=int, default=160)
+    parser.add_argument("--stage-cpu-workers", type=int, default=os.cpu_count() or 1)
 
     args = parser.parse_args()
 
@@ -249,6 +367,8 @@ if __name__ == '__main__':
         enable_gnaf=instance_cfg.enable_gnaf,
         enable_gis=instance_cfg.enable_gis,
         enable_clean_staging_data=instance_cfg.clean_staging_data,
+        stage_db_connections=args.stage_db_connections,
+        stage_cpu_workers=args.stage_cpu_workers,
     )
 
     asyncio.run(ingest_all(config))
@@ -63,6 +63,7 @@ if __name__ == '__main__':
     parser.add_argument("--workers", type=int, required=True)
     parser.add_argument("--worker-logs", action='store_true', default=False)
     parser.add_argument("--worker-db-connections", type=int, default=8)
+    parser.add_argument("--geometry-encoding", choices=['wkt', 'wkb'], default='wkt')
     parser.add_argument("--debug", action='store_true', default=False)
 
     args = parser.parse_args()
@@ -86,6 +87,7 @@ if __name__ == '__main__':
             db_connections=args.worker_db_connections,
             enable_logging=args.worker_logs,
             enable_logging_debug=args.debug,
+            geometry_encoding=args.geometry_encoding,
         ),
     )
 
@@ -0,0 +1,100 @@
+from datetime import datetime
+from logging import getLogger
+from typing import List, Optional, Tuple, Type
+
+from lib.pipeline.nsw_vg.property_sales.data import PropertySaleDatFileMetaData
+from lib.pipeline.nsw_vg.property_sales.file_format import (
+    BufferedFileReaderTextSource,
+    MmapTextSource,
+    PropertySalesRowParserFactory,
+    StringTextSource,
+)
+from lib.pipeline.nsw_vg.property_sales.file_format.text_source import AbstractTextSource
+from lib.service.clock import ClockService
+from lib.service.io import IoService, IoServiceImpl
+from lib.service.uuid import UuidServiceImpl
+
+_logger = getLogger(__name__)
+
+_FIXTURES: List[Tuple[str, int, Optional[datetime]]] = [
+    ('./_fixtures/ps_2021_20210823.dat', 2021, datetime(2021, 8, 23)),
+    ('./_fixtures/ps_2011_20111003.dat', 2011, datetime(2011, 10, 3)),
+    ('./_fixtures/ps_2004_20040916.dat', 2004, datetime(2004, 9, 16)),
+    ('./_fixtures/ps_2001_20010822.dat', 2001, datetime(2001, 8, 22)),
+    ('./_fixtures/ps_2001_20010720.dat', 2001, datetime(2001, 7, 20)),
+    ('./_fixtures/ps_2001_20010720_2.dat', 2001, datetime(2001, 7, 20)),
+    ('./_fixtures/ps_1990_fake.dat', 1990, None),
+]
+
+_SOURCES: List[Tuple[str, Type[AbstractTextSource]]] = [
+    ('string', StringTextSource),
+    ('buffered', BufferedFileReaderTextSource),
+    ('mmap', MmapTextSource),
+]
+
+async def benchmark_ps_parse(
+    io: IoService,
+    clock: ClockService,
+    rounds: int,
+    chunk_size: int,
+) -> List[Tuple[str, float]]:
+    """
+    Compares the rows per second of each text source when
+    parsing the property sales DAT files in `_fixtures`. Both
+    tokenising the rows alone, and building the records from
+    them, are measured, as the later dilutes the difference.
+    Building columns is measured against building records.
+    """
+    factory_args = (io, UuidServiceImpl())
+    files = [
+        PropertySaleDatFileMetaData(
+            file_path=path,
+            published_year=year,
+            download_date=date,
+            size=await io.f_size(path))
+        for path, year, date in _FIXTURES
+    ]
+    results: List[Tuple[str, float]] = []
+
+    for stage in ['tokenise', 'parse', 'columns']:
+        for name, Source in _SOURCES:
+            factory = PropertySalesRowParserFactory(*factory_args, Source, chunk_size)
+            rows = 0
+            t_start = clock.time()
+            for _ in range(rounds):
+                for file_data in files:
+                    parser = await factory.create_parser(file_data)
+                    match stage:
+                        case 'tokenise':
+                            async for _ in parser.get_rows():
+                                rows += 1
+                        case 'parse':
+                            async for _ in parser.get_data_from_file():
+                                rows += 1
+                        case 'columns':
+                            async for batches in parser.get_batches_from_file():
+                                rows += sum(len(b) for b in batches)
+                    parser.close()
+            elapsed = clock.time() - t_start
+            rows_per_sec = rows / elapsed
+            _logger.info(f'{stage} {name.rjust(8)}: {rows_per_sec:.0f} rows/sec ({elapsed:.2f}s)')
+            results.append((f'{stage}/{name}', rows_per_sec))
+    return results
+
+if __name__ == '__main__':
+    import asyncio
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="benchmark property sales parsing")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=8 * 2 ** 10)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    asyncio.run(benchmark_ps_parse(IoServiceImpl.create(None),
+                                   ClockService(),
+                                   args.rounds,
+                                   args.chunk_size))
@@ -1,7 +1,11 @@
 from dataclasses import dataclass, field
 from typing import Optional, Literal
 from lib.pipeline.nsw_vg.config import *
-from lib.pipeline.nsw_vg.land_values import NswVgLvCsvDiscoveryMode
+from lib.pipeline.nsw_vg.land_values import (
+    NswVgLvCsvDiscoveryMode,
+    NswVgLvLoadMode,
+    NswVgLvParseMode,
+)
 from lib.service.database import DatabaseConfig
 
 class NswVgTaskConfig:
@@ -12,6 +16,9 @@ class NswVgTaskConfig:
         sub_workers: int
         db_config: DatabaseConfig
         truncate_earlier: bool
+        fetch_size: int = field(default=100)
+        parse_cache_size: int = field(default=2 ** 16)
+        parse_cache_path: Optional[str] = field(default=None)
 
     @dataclass
     class PsiIngest:
@@ -38,6 +45,8 @@ class NswVgTaskConfig:
             debug: bool
             db_config: DatabaseConfig
             db_conn: int
+            parse_mode: NswVgLvParseMode = field(default='rows')
+            load_mode: NswVgLvLoadMode = field(default='insert')
 
         @dataclass
         class Main:
@@ -46,6 +55,7 @@ class NswVgTaskConfig:
             land_value_source: Literal['byo', 'web']
             child_cfg: 'NswVgTaskConfig.LandValue.Child'
             child_n: int
+            read_from_zip: bool = field(default=False)
 
     @dataclass
     class Ingestion:
@@ -71,7 +71,10 @@ if __name__ == '__main__':
     parser.add_argument("--lv-worker-debug", action='store_true', default=False)
     parser.add_argument("--lv-worker-db-pool-size", type=int, default=1)
     parser.add_argument("--lv-worker-chunk-size", type=int, default=1000)
+    parser.add_argument("--lv-worker-parse-mode", choices=['rows', 'columns'], default='rows')
+    parser.add_argument("--lv-worker-load-mode", choices=['insert', 'copy'], default='insert')
     parser.add_argument("--lv-truncate-earlier", action='store_true', default=False)
+    parser.add_argument("--lv-read-from-zip", action='store_true', default=False)
 
     parser.add_argument("--load-property-sales", action='store_true', default=False)
     parser.add_argument("--ps-publish-min", type=int, default=None)
@@ -84,11 +87,16 @@ if __name__ == '__main__':
     parser.add_argument("--ps-worker-db-pool-size", type=int, default=None)
     parser.add_argument("--ps-worker-db-batch-size", type=int, default=50)
     parser.add_argument("--ps-worker-parser-chunk-size", type=int, default=8 * 2 ** 10)
+    parser.add_argument("--ps-worker-db-mode", choices=['insert', 'copy'], default='insert')
+    parser.add_argument("--ps-split-size", type=int, default=32 * 2 ** 20)
 
     parser.add_argument("--nswlrs-propdesc", action='store_true', default=False)
     parser.add_argument("--nswlrs-propdesc-workers", type=int, default=1)
     parser.add_argument("--nswlrs-propdesc-subworkers", type=int, default=1)
     parser.add_argument("--nswlrs-propdesc-child-debug", action='store_true', default=False)
+    parser.add_argument("--nswlrs-propdesc-fetch-size", type=int, default=100)
+    parser.add_argument("--nswlrs-propdesc-parse-cache-size", type=int, default=2 ** 16)
+    parser.add_argument("--nswlrs-propdesc-parse-cache-path", type=str, default=None)
 
     parser.add_argument("--dedup", action='store_true', default=False)
     parser.add_argument("--dedup-reinitialise-destination-schema", action='store_true', default=False)
@@ -116,11 +124,14 @@ if __name__ == '__main__':
             discovery_mode=instance_cfg.nswvg_lv_discovery_mode,
             truncate_raw_earlier=args.lv_truncate_earlier,
             child_n=args.lv_workers,
+            read_from_zip=args.lv_read_from_zip,
             child_cfg=NswVgTaskConfig.LandValue.Child(
                 debug=args.lv_worker_debug,
                 db_conn=args.lv_worker_db_pool_size,
                 db_config=instance_cfg.database,
                 chunk_size=args.lv_worker_chunk_size,
+                parse_mode=args.lv_worker_parse_mode,
+                load_mode=args.lv_worker_load_mode,
             ),
         )
 
@@ -143,6 +154,7 @@ if __name__ == '__main__':
                 db_config=instance_cfg.database,
                 db_pool_size=args.ps_worker_db_pool_size,
                 db_batch_size=args.ps_worker_db_batch_size,
+                db_mode=args.ps_worker_db_mode,
                 file_limit=args.ps_worker_file_limit,
                 ingestion_config=NSW_VG_PS_INGESTION_CONFIG,
                 parser_chunk_size=args.ps_worker_parser_chunk_size,
@@ -158,6 +170,7 @@ if __name__ == '__main__':
                 publish_max=args.ps_publish_max,
                 download_min=args.ps_download_min,
                 download_max=args.ps_download_max,
+                split_size=args.ps_split_size,
             ),
         )
 
@@ -179,6 +192,9 @@ if __name__ == '__main__':
             workers=args.nswlrs_propdesc_workers,
             sub_workers=args.nswlrs_propdesc_subworkers,
             truncate_earlier=False,
+            fetch_size=args.nswlrs_propdesc_fetch_size,
+            parse_cache_size=args.nswlrs_propdesc_parse_cache_size,
+            parse_cache_path=args.nswlrs_propdesc_parse_cache_path,
         )
 
     config = NswVgTaskConfig.Ingestion(
@@ -1,7 +1,7 @@
 import asyncio
 from dataclasses import dataclass
 import logging
-from multiprocessing import Process, Queue as MpQueue
+from multiprocessing import Process
 import resource
 
 from lib.pipeline.nsw_vg.discovery import NswVgPublicationDiscovery
@@ -11,9 +11,11 @@ from lib.pipeline.nsw_vg.land_values import (
     NswVgLvAbstractCsvDiscovery,
     NswVgLvWebCsvDiscovery,
     NswVgLvByoCsvDiscovery,
+    NswVgLvChildMsg,
     NswVgLvCsvDiscoveryConfig,
     NswVgLvCsvDiscoveryMode,
     NswVgLvIngestion,
+    NswVgLvParentMsg,
     NswVgLvPipeline,
     NswVgLvTelemetry,
     NswVgLvWorker,
@@ -27,11 +29,13 @@ from lib.service.static_environment import StaticEnvironmentInitialiser
 from lib.service.uuid import *
 from lib.tasks.fetch_static_files import get_session
 from lib.tooling.schema import create_schema_controller, SchemaCommand
+from lib.utility.process import IpcReceiver, IpcSender, ipc_channel
 
 from .config import NswVgTaskConfig
 
 _BYO_LV_DIR = '_cfg_byo_lv'
 _ZIPDIR = './_out_zip'
+_TELEMETRY_BATCH = 8
 
 async def cli_main(cfg: NswVgTaskConfig.LandValue.Main) -> None:
     soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
@@ -60,13 +64,14 @@ async def ingest_land_values(cfg: NswVgTaskConfig.LandValue.Main,
             ns_range=range(2, 3),
             cascade=True,
         ))
-    recv_q: MpQueue = MpQueue()
+    recv_q = IpcReceiver[NswVgLvParentMsg.Base]([])
     telemetry = NswVgLvTelemetry.create(clock)
 
     discovery_cfg = NswVgLvCsvDiscoveryConfig(
         cfg.discovery_mode,
         unzip_dir=_ZIPDIR,
         byo_dir=_BYO_LV_DIR,
+        read_from_zip=cfg.read_from_zip,
     )
     discovery: NswVgLvAbstractCsvDiscovery
     match cfg.land_value_source:
@@ -89,17 +94,27 @@ async def ingest_land_values(cfg: NswVgTaskConfig.LandValue.Main,
     pipeline = NswVgLvPipeline(recv_q, telemetry, discovery)
 
     for id in range(0, cfg.child_n):
-        send_q: MpQueue = MpQueue()
-        proc = Process(target=spawn_worker, args=(id, cfg.child_cfg, recv_q, send_q))
+        child_recv: IpcReceiver[NswVgLvChildMsg.Base]
+        send_q: IpcSender[NswVgLvChildMsg.Base]
+        worker_recv: IpcReceiver[NswVgLvParentMsg.Base]
+        child_send: IpcSender[NswVgLvParentMsg.Base]
+        child_recv, send_q = ipc_channel()
+        worker_recv, child_send = ipc_channel(batch_size=_TELEMETRY_BATCH)
+        recv_q.merge(worker_recv)
+        proc = Process(target=spawn_worker, args=(id, cfg.child_cfg, child_send, child_recv))
         proc.start()
+
+        # the child has its own copy of these ends
+        child_recv.close()
+        child_send.close()
         pipeline.add_worker(NswVgLvWorkerClient(id, proc, send_q))
 
     await pipeline.start()
 
 def spawn_worker(id: int,
                  cfg: NswVgTaskConfig.LandValue.Child,
-                 send_q: MpQueue,
-                 recv_q: MpQueue):
+                 send_q: IpcSender[NswVgLvParentMsg.Base],
+                 recv_q: IpcReceiver[NswVgLvChildMsg.Base]):
 
     soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
     file_limit = int(soft_limit * 0.8)
@@ -109,7 +124,9 @@ def spawn_worker(id: int,
         io = IoServiceImpl.create(file_limit)
         db = DatabaseServiceImpl.create(cfg.db_config, cfg.db_conn)
         uuid = UuidServiceImpl()
-        ingestion = NswVgLvIngestion(cfg.chunk_size, uuid, io, db)
+        ingestion = NswVgLvIngestion(cfg.chunk_size, uuid, io, db,
+                                     parse_mode=cfg.parse_mode,
+                                     load_mode=cfg.load_mode)
         coordinator = NswVgLvCoordinatorClient(recv_q=recv_q, send_q=send_q)
         worker = NswVgLvWorker.create(id, ingestion, coordinator, cfg.db_conn * (2 ** 4))
         try:
@@ -139,7 +156,10 @@ if __name__ == '__main__':
     parser.add_argument("--workers", type=int, required=True)
     parser.add_argument("--worker-db-conn", type=int, default=8)
     parser.add_argument("--worker-chunk-size", type=int, default=1000)
+    parser.add_argument("--worker-parse-mode", choices=['rows', 'columns'], default='rows')
+    parser.add_argument("--worker-load-mode", choices=['insert', 'copy'], default='insert')
     parser.add_argument("--truncate-raw-earlier", action='store_true', default=False)
+    parser.add_argument("--read-from-zip", action='store_true', default=False)
 
     args = parser.parse_args()
 
@@ -160,11 +180,14 @@ if __name__ == '__main__':
         discovery_mode=mode,
         truncate_raw_earlier=args.truncate_raw_earlier,
         child_n=args.workers,
+        read_from_zip=args.read_from_zip,
         child_cfg=NswVgTaskConfig.LandValue.Child(
             debug=args.debug_worker,
             db_conn=args.worker_db_conn,
             db_config=db_config,
             chunk_size=args.worker_chunk_size,
+            parse_mode=args.worker_parse_mode,
+            load_mode=args.worker_load_mode,
         ),
     )
     asyncio.run(cli_main(cfg))
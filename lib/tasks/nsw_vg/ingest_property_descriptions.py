@@ -3,8 +3,9 @@ from dataclasses import dataclass, field
 import logging
 from multiprocessing import Process, Semaphore as MpSemaphore, Queue as MpQueue
 from multiprocessing.synchronize import Semaphore as SemaphoreT
-from typing import Callable
+from typing import Callable, Optional
 
+from lib.pipeline.nsw_lrs.property_description.parse import ParseCache, ParseCacheFile
 from lib.pipeline.nsw_vg.property_description import (
     PropDescIngestionSupervisor,
     PropDescIngestionWorker,
@@ -55,7 +56,9 @@ async def ingest_property_description(
         spawn_worker_with_worker_config = \
             lambda w_config: Process(target=spawn_worker, args=(
                 queue, w_config, semaphore,
-                config.worker_debug, config.db_config))
+                config.worker_debug, config.db_config,
+                config.fetch_size, config.parse_cache_size,
+                config.parse_cache_path))
 
         telemetry_listener.listen()
         pool = PropDescIngestionWorkerPool(semaphore, spawn_worker_with_worker_config)
@@ -73,13 +76,24 @@ def spawn_worker(
     semaphore: SemaphoreT,
     worker_debug: bool,
     db_config: DatabaseConfig,
+    fetch_size: int,
+    parse_cache_size: int,
+    parse_cache_path: Optional[str],
 ):
     async def worker_runtime(config: WorkerProcessConfig, semaphore: SemaphoreT, db_config: DatabaseConfig):
         config_vendor_logging({'sqlglot', 'psycopg.pool'})
         config_logging(config.worker_no, worker_debug)
-        db = DatabaseServiceImpl.create(db_config, len(config.quantiles))
-        worker = PropDescIngestionWorker(config.worker_no, queue, semaphore, db)
-        await worker.ingest(config.quantiles)
+        # each sub worker reads & writes over separate connections
+        db = DatabaseServiceImpl.create(db_config, len(config.quantiles) * 2)
+        parse_cache = ParseCache(
+            parse_cache_size,
+            ParseCacheFile.open(parse_cache_path) if parse_cache_path else None)
+        worker = PropDescIngestionWorker(config.worker_no, queue, semaphore, db,
+                                         fetch_size, parse_cache=parse_cache)
+        try:
+            await worker.ingest(config.quantiles)
+        finally:
+            parse_cache.close()
     asyncio.run(worker_runtime(config, semaphore, db_config))
 
 if __name__ == '__main__':
@@ -93,6 +107,9 @@ if __name__ == '__main__':
     parser.add_argument("--workers", type=int, required=True)
     parser.add_argument("--sub-workers", type=int, required=True)
     parser.add_argument("--truncate-earlier", action='store_true', default=False)
+    parser.add_argument("--fetch-size", type=int, default=100)
+    parser.add_argument("--parse-cache-size", type=int, default=2 ** 16)
+    parser.add_argument("--parse-cache-path", type=str, default=None)
 
     args = parser.parse_args()
 
@@ -106,6 +123,9 @@ if __name__ == '__main__':
             workers=args.workers,
             sub_workers=args.sub_workers,
             db_config=INSTANCE_CFG[args.instance].database,
+            fetch_size=args.fetch_size,
+            parse_cache_size=args.parse_cache_size,
+            parse_cache_path=args.parse_cache_path,
         ),
     ))
 
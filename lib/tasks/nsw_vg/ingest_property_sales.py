@@ -3,7 +3,7 @@ from datetime import datetime, date
 from dataclasses import dataclass
 from functools import reduce
 import logging
-from multiprocessing import Process, Queue as IpcQueue
+from multiprocessing import Process
 from time import time
 from typing import List, Optional, Self, Tuple
 from pathlib import Path
@@ -12,13 +12,14 @@ import resource
 import os
 
 from lib.pipeline.nsw_vg.property_sales.data import *
-from lib.pipeline.nsw_vg.property_sales.file_format import PropertySalesRowParserFactory, BufferedFileReaderTextSource
+from lib.pipeline.nsw_vg.property_sales.file_format import PropertySalesRowParserFactory, MmapTextSource
 from lib.pipeline.nsw_vg.property_sales.ingestion import NSW_VG_PS_INGESTION_CONFIG, PropertySalesIngestion
 from lib.pipeline.nsw_vg.property_sales.orchestration import *
 from lib.service.clock import ClockService
 from lib.service.io import IoService, IoServiceImpl
 from lib.service.database import *
 from lib.service.uuid import *
+from lib.utility.process import IpcReceiver, IpcSender, ipc_channel
 from lib.utility.sampling import Sampler, SamplingConfig
 
 from .config import NswVgTaskConfig
@@ -43,15 +44,25 @@ async def ingest_property_sales_rows(
         IngestionSample(),
     )
 
-    q_recv: IpcQueue = IpcQueue()
+    q_recv = IpcReceiver[ParentMessage.Message]([])
     p_children: List[NswVgPsChildClient] = []
     try:
         for idx in range(0, worker_count):
-            q_send: IpcQueue = IpcQueue()
-            worker_args = (idx, worker_config, q_send, q_recv)
+            child_recv: IpcReceiver[ChildMessage.Message]
+            q_send: IpcSender[ChildMessage.Message]
+            child_q_recv: IpcReceiver[ParentMessage.Message]
+            child_send: IpcSender[ParentMessage.Message]
+            child_recv, q_send = ipc_channel()
+            child_q_recv, child_send = ipc_channel()
+            q_recv.merge(child_q_recv)
+            worker_args = (idx, worker_config, child_recv, child_send)
             p_child = Process(target=_child_proc_entry, args=worker_args)
             p_children.append(NswVgPsChildClient(q_send, p_child))
             p_child.start()
+
+            # the child has its own copy of these ends
+            child_recv.close()
+            child_send.close()
     except Exception as e:
         for p in p_children:
             p.terminate()
@@ -65,6 +76,7 @@ async def ingest_property_sales_rows(
             p_children,
             tg,
             io,
+            UuidServiceImpl(),
         )
         await orchestrator.process([
             *environment.sale_price_annual.links,
@@ -77,8 +89,8 @@ async def ingest_property_sales_rows(
 def _child_proc_entry(
     idx: int,
     worker_config: NswVgPsiWorkerConfig,
-    recv_msgs: IpcQueue,
-    send_msgs: IpcQueue,
+    recv_msgs: IpcReceiver[ChildMessage.Message],
+    send_msgs: IpcSender[ParentMessage.Message],
 ) -> None:
     if worker_config.log_config:
         logging.basicConfig(
@@ -93,8 +105,8 @@ def _child_proc_entry(
 
 async def _child_main(
     config: NswVgPsiWorkerConfig,
-    recv_msgs: IpcQueue,
-    send_msgs: IpcQueue,
+    recv_msgs: IpcReceiver[ChildMessage.Message],
+    send_msgs: IpcSender[ParentMessage.Message],
 ) -> None:
     soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
 
@@ -114,7 +126,7 @@ async def _child_main(
             factory = PropertySalesRowParserFactory(
                 io,
                 uuid,
-                BufferedFileReaderTextSource,
+                MmapTextSource,
                 config.parser_chunk_size,
             )
             ingestion = PropertySalesIngestion.create(
@@ -122,6 +134,8 @@ async def _child_main(
                 tg,
                 config.ingestion_config,
                 config.db_batch_size,
+                config.db_mode,
+                str(os.getpid()),
             )
             server = NswVgPsChildServer(
                 tg,
@@ -137,7 +151,10 @@ async def _child_main(
             server.start_ingestion()
 
             while not server.closing:
-                message = await asyncio.to_thread(recv_msgs.get)
+                message = await recv_msgs.get()
+                if message is None:
+                    logging.warning('parent hung up without closing')
+                    message = ChildMessage.RequestClose()
                 await tg.create_task(server.on_message(message))
             await tg.create_task(server.flush())
         logging.info('this child has finished')
@@ -146,6 +163,8 @@ async def _child_main(
         logging.exception(e)
         raise e
     finally:
+        send_msgs.close()
+        recv_msgs.close()
         await db.close()
 
 async def _cli_main(
@@ -201,6 +220,8 @@ if __name__ == '__main__':
     parser.add_argument("--worker-db-pool-size", type=int, default=16)
     parser.add_argument("--worker-db-batch-size", type=int, default=1000)
     parser.add_argument("--worker-parser-chunk-size", type=int, default=8 * 2 ** 10)
+    parser.add_argument("--worker-db-mode", choices=['insert', 'copy'], default='insert')
+    parser.add_argument("--split-size", type=int, default=32 * 2 ** 20)
 
     args = parser.parse_args()
     config_logging(worker=None, debug=args.debug)
@@ -217,6 +238,7 @@ if __name__ == '__main__':
             db_config=instance_cfg.database,
             db_pool_size=args.worker_db_pool_size,
             db_batch_size=args.worker_db_batch_size,
+            db_mode=args.worker_db_mode,
             file_limit=args.worker_file_limit,
             ingestion_config=NSW_VG_PS_INGESTION_CONFIG,
             parser_chunk_size=args.worker_parser_chunk_size,
@@ -232,6 +254,7 @@ if __name__ == '__main__':
             publish_max=args.publish_max,
             download_min=args.download_min,
             download_max=args.download_max,
+            split_size=args.split_size,
         ),
     )
 
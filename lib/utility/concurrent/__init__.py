@@ -3,4 +3,5 @@ from .iterator_thread import iterator_thread
 from .merge import merge_async_iters
 from .partition_lock import PartitionLock, VoidPartitionLock
 from .pipe import pipe
+from .stage_scheduler import Stage, StageResources, StageScheduler, stage_dependencies
 from .null_semaphore import NullableSemaphore
@@ -0,0 +1,137 @@
+import asyncio
+from dataclasses import dataclass, field
+from logging import getLogger
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Self, Sequence, Set, Tuple
+
+from lib.utility.format import fmt_time_elapsed
+
+@dataclass(frozen=True)
+class StageResources:
+    """
+    What a stage holds while it runs. Connections & workers
+    are counted against the scheduler's budget, while hosts are
+    exclusive, so two stages never hit the same host at once.
+    """
+    db_connections: int = field(default=0)
+    cpu_workers: int = field(default=0)
+    http_hosts: FrozenSet[str] = field(default=frozenset())
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A stage runs once every stage producing one of its
+    `inputs` has finished.
+    """
+    name: str
+    run: Callable[[], Awaitable[Any]] = field(repr=False)
+    inputs: FrozenSet[str] = field(default=frozenset())
+    outputs: FrozenSet[str] = field(default=frozenset())
+    needs: StageResources = field(default=StageResources())
+
+class StageScheduler:
+    """
+    Runs stages as soon as their inputs are ready and their
+    resources fit in what's left of the budget, in the order
+    they're given when more than one could start. A stage
+    needing more than the whole budget runs once it's the only
+    thing running.
+
+    If a stage fails, the stages still running are cancelled
+    and the error is raised.
+    """
+    _logger = getLogger(f'{__name__}.StageScheduler')
+
+    def __init__(self: Self, db_connections: int, cpu_workers: int) -> None:
+        self._db_connections = db_connections
+        self._cpu_workers = cpu_workers
+
+    async def run(self: Self, stages: Sequence[Stage]) -> None:
+        dependencies = stage_dependencies(stages)
+        pending: List[Stage] = list(stages)
+        running: Dict[asyncio.Task, Tuple[Stage, float]] = {}
+        done: Set[str] = set()
+        free_db, free_cpu = self._db_connections, self._cpu_workers
+        busy_hosts: Set[str] = set()
+        t_start = time.time()
+
+        try:
+            while pending or running:
+                for stage in list(pending):
+                    if not dependencies[stage.name] <= done:
+                        continue
+
+                    db, cpu = self._clamp(stage.needs)
+                    if db > free_db or cpu > free_cpu or stage.needs.http_hosts & busy_hosts:
+                        continue
+
+                    free_db, free_cpu = free_db - db, free_cpu - cpu
+                    busy_hosts |= stage.needs.http_hosts
+                    pending.remove(stage)
+                    task = asyncio.create_task(_run_stage(stage), name=stage.name)
+                    running[task] = (stage, time.time())
+                    self._logger.info(f'starting {stage.name} (db {db}, cpu {cpu}, '
+                                      f'running {", ".join(s.name for s, _ in running.values())})')
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    stage, t_stage = running.pop(task)
+                    db, cpu = self._clamp(stage.needs)
+                    free_db, free_cpu = free_db + db, free_cpu + cpu
+                    busy_hosts -= stage.needs.http_hosts
+                    task.result()
+
+                    done.add(stage.name)
+                    t_now = time.time()
+                    self._logger.info(f'finished {stage.name} in {fmt_time_elapsed(t_stage, t_now, "hms")} '
+                                      f'({fmt_time_elapsed(t_start, t_now, "hms")} since start)')
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+    def _clamp(self: Self, needs: StageResources) -> Tuple[int, int]:
+        return (
+            min(needs.db_connections, self._db_connections),
+            min(needs.cpu_workers, self._cpu_workers),
+        )
+
+async def _run_stage(stage: Stage) -> None:
+    await stage.run()
+
+def stage_dependencies(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    """
+    The names of the stages each stage waits on. Raises a
+    ValueError if a name or output is used twice, if an input
+    isn't the output of any stage, or if stages wait on each
+    other.
+    """
+    names: Set[str] = set()
+    producers: Dict[str, str] = {}
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f'stage {stage.name} defined more than once')
+        names.add(stage.name)
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f'{output} is output by both {producers[output]} and {stage.name}')
+            producers[output] = stage.name
+
+    dependencies: Dict[str, Set[str]] = {}
+    for stage in stages:
+        missing = stage.inputs - producers.keys()
+        if missing:
+            raise ValueError(f'{stage.name} has inputs no stage outputs, {sorted(missing)}')
+        dependencies[stage.name] = { producers[i] for i in stage.inputs }
+
+    resolved: Set[str] = set()
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [name for name, deps in remaining.items() if deps <= resolved]
+        if not ready:
+            raise ValueError(f'stages depend on each other, {sorted(remaining)}')
+        for name in ready:
+            resolved.add(name)
+            del remaining[name]
+    return dependencies
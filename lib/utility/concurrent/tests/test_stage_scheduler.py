@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from typing import List
+
+from ..stage_scheduler import Stage, StageResources, StageScheduler, stage_dependencies
+
+def _stage(name: str, log: List[str], inputs=(), outputs=(), delay=0.01, **needs) -> Stage:
+    async def run():
+        log.append(f'start {name}')
+        await asyncio.sleep(delay)
+        log.append(f'end {name}')
+    return Stage(
+        name=name,
+        run=run,
+        inputs=frozenset(inputs),
+        outputs=frozenset(outputs),
+        needs=StageResources(**needs),
+    )
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap():
+    log: List[str] = []
+    await StageScheduler(db_connections=8, cpu_workers=8).run([
+        _stage('a', log, outputs=['a'], db_connections=4),
+        _stage('b', log, outputs=['b'], db_connections=4),
+        _stage('c', log, inputs=['a', 'b']),
+    ])
+    assert log == ['start a', 'start b', 'end a', 'end b', 'start c', 'end c']
+
+@pytest.mark.asyncio
+async def test_stages_wait_for_budget_and_hosts():
+    log: List[str] = []
+    await StageScheduler(db_connections=8, cpu_workers=8).run([
+        _stage('a', log, db_connections=6, delay=0.02),
+        _stage('b', log, db_connections=6),
+        _stage('c', log, http_hosts=frozenset({'host'}), delay=0.03),
+        _stage('d', log, http_hosts=frozenset({'host'})),
+    ])
+    assert log.index('start b') > log.index('end a')
+    assert log.index('start d') > log.index('end c')
+    assert log.index('start c') < log.index('end a')
+
+@pytest.mark.asyncio
+async def test_oversized_stage_runs_alone():
+    log: List[str] = []
+    await StageScheduler(db_connections=8, cpu_workers=2).run([
+        _stage('a', log, cpu_workers=1),
+        _stage('b', log, cpu_workers=32),
+    ])
+    assert log == ['start a', 'end a', 'start b', 'end b']
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_stages():
+    log: List[str] = []
+
+    async def fail():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError, match='failed'):
+        await StageScheduler(db_connections=8, cpu_workers=8).run([
+            _stage('slow', log, delay=10),
+            Stage(name='fail', run=fail, outputs=frozenset({'x'})),
+            _stage('after', log, inputs=['x']),
+        ])
+    assert log == ['start slow']
+
+def test_invalid_graphs():
+    async def run():
+        return
+
+    with pytest.raises(ValueError, match='no stage outputs'):
+        stage_dependencies([Stage('a', run, inputs=frozenset({'x'}))])
+    with pytest.raises(ValueError, match='output by both'):
+        stage_dependencies([
+            Stage('a', run, outputs=frozenset({'x'})),
+            Stage('b', run, outputs=frozenset({'x'})),
+        ])
+    with pytest.raises(ValueError, match='depend on each other'):
+        stage_dependencies([
+            Stage('a', run, inputs=frozenset({'y'}), outputs=frozenset({'x'})),
+            Stage('b', run, inputs=frozenset({'x'}), outputs=frozenset({'y'})),
+        ])
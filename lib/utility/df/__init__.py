@@ -1,2 +1,2 @@
 from .fmt import fmt_head
-from .prepare_for_sql import FieldFormat, prepare_postgis_insert
+from .prepare_for_sql import FieldFormat, GeometryEncoding, prepare_postgis_insert
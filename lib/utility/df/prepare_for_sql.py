@@ -3,6 +3,7 @@ import geopandas as gpd
 from logging import getLogger
 import numpy
 import pandas as pd
+import shapely
 import warnings
 from typing import (
     Dict,
@@ -19,8 +20,17 @@ FieldFormat = Literal[
     'text',
 ]
 
+GeometryEncoding = Literal['wkt', 'wkb']
+"""
+How geometries are sent to the database, either as WKT or
+as hex encoded WKB, which postgis reads as readily as WKT
+but is smaller and cheaper to write.
+"""
+
 _FormatDict = Dict[str, FieldFormat]
 
+_MAX_TIMESTAMP_MS = 2147483647000
+
 _logger = getLogger(__name__)
 
 def prepare_postgis_insert(
@@ -28,24 +38,12 @@ def prepare_postgis_insert(
     relation: str,
     epsg_crs: int,
     column_formats: _FormatDict,
-    clone = True
+    clone = True,
+    geometry_encoding: GeometryEncoding = 'wkt',
 ) -> Tuple[gpd.GeoDataFrame, str]:
     def create_placeholder(col: Optional[FieldFormat], crs: int) -> str:
         return '%s'
 
-    def apply_dt(x: Optional[int]) -> Optional[str]:
-        max_ms = 2147483647000
-        if x is None or x > max_ms or numpy.isnan(x):
-            return None
-        return datetime.fromtimestamp(x // 1000).strftime('%Y-%m-%d %H:%M:%S')
-
-    def apply_geometry(g):
-        if g is None:
-            return None
-        if not g.is_valid:
-            g = g.buffer(0)
-        return g.wkt
-
     try:
         placeholders = ", ".join(create_placeholder(column_formats.get(c, None), epsg_crs) for c in df.columns)
     except Exception as e:
@@ -64,12 +62,14 @@ def prepare_postgis_insert(
             try:
                 match fmt:
                     case 'bool':
-                        copy[k] = copy[k].apply(lambda x: 'true' if x else 'false')
+                        copy[k] = _series(copy[k], numpy.where(
+                            copy[k].to_numpy(dtype=bool), 'true', 'false'))
                     case 'geometry':
-                        copy[k] = copy[k].apply(apply_geometry)
+                        copy[k] = _series(copy[k], _prepare_geometry(
+                            copy[k].to_numpy(dtype=object), geometry_encoding))
                     case 'timestamp_ms':
-                        max_ms = 2147483647000
-                        copy[k] = copy[k].apply(apply_dt)
+                        copy[k] = _series(copy[k], _prepare_timestamp_ms(
+                            pd.to_numeric(copy[k]).to_numpy(dtype=float)))
                     case 'text':
                         copy[k] = copy[k].astype(object)
                     case 'number':
@@ -81,4 +81,43 @@ def prepare_postgis_insert(
                 raise e
     return copy, query
 
+def _series(column: pd.Series, values: numpy.ndarray) -> pd.Series:
+    return pd.Series(values, index=column.index, dtype=object)
+
+def _prepare_geometry(geometries: numpy.ndarray, encoding: GeometryEncoding) -> numpy.ndarray:
+    """
+    Invalid geometries are repaired with a zero width buffer,
+    same as it's always been done here, rather than with
+    `make_valid` which can turn a polygon into a collection
+    the destination column won't accept.
+    """
+    geometries = geometries.copy()
+    invalid = ~shapely.is_missing(geometries) & ~shapely.is_valid(geometries)
+    if invalid.any():
+        geometries[invalid] = shapely.buffer(geometries[invalid], 0)
+
+    match encoding:
+        case 'wkt':
+            return shapely.to_wkt(geometries, rounding_precision=-1)
+        case 'wkb':
+            return shapely.to_wkb(geometries, hex=True)
+
+def _prepare_timestamp_ms(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Times are formatted in local time, which isn't something
+    numpy or pandas can do without knowing the name of the
+    zone, so each distinct second is only formatted once.
+    """
+    out = numpy.full(len(values), None, dtype=object)
+    with numpy.errstate(invalid='ignore'):
+        present = ~numpy.isnan(values) & (values <= _MAX_TIMESTAMP_MS)
+    if not present.any():
+        return out
 
+    seconds, inverse = numpy.unique(values[present] // 1000, return_inverse=True)
+    formatted = numpy.array([
+        datetime.fromtimestamp(s).strftime('%Y-%m-%d %H:%M:%S')
+        for s in seconds.tolist()
+    ], dtype=object)
+    out[present] = formatted[inverse]
+    return out
@@ -0,0 +1,46 @@
+from datetime import datetime
+import geopandas as gpd
+import shapely
+from shapely.geometry import Point, Polygon
+
+from ..prepare_for_sql import prepare_postgis_insert
+
+_BOWTIE = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+
+_FORMATS = {
+    'flag': 'bool',
+    'created': 'timestamp_ms',
+    'area': 'number',
+    'geometry': 'geometry',
+}
+
+def _df() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame({
+        'flag': [True, None, 0],
+        'created': [1600000000123, None, 2147483647001],
+        'area': [1.5, None, 2.0],
+        'geometry': gpd.GeoSeries([Point(1.25, 2), None, _BOWTIE]),
+    })
+
+def test_prepare_postgis_insert():
+    df, query = prepare_postgis_insert(_df(), 'a.b', 7844, _FORMATS)
+    assert query == 'INSERT INTO a.b (flag, created, area, geometry) VALUES (%s, %s, %s, %s)'
+    assert df['flag'].tolist() == ['true', 'false', 'false']
+    assert df['created'].tolist() == [
+        datetime.fromtimestamp(1600000000).strftime('%Y-%m-%d %H:%M:%S'),
+        None,
+        None,
+    ]
+    assert df['area'].tolist() == [1.5, None, 2.0]
+    assert df['geometry'].tolist() == [
+        Point(1.25, 2).wkt,
+        None,
+        _BOWTIE.buffer(0).wkt,
+    ]
+
+def test_geometries_as_wkb():
+    df, _ = prepare_postgis_insert(_df(), 'a.b', 7844, _FORMATS, geometry_encoding='wkb')
+    point, missing, bowtie = df['geometry'].tolist()
+    assert shapely.from_wkb(point) == Point(1.25, 2)
+    assert missing is None
+    assert shapely.from_wkb(bowtie).is_valid
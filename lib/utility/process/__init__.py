@@ -1 +1,2 @@
 from .iterator import AsyncProcessIter
+from .channel import IpcReceiver, IpcSender, ipc_channel
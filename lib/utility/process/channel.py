@@ -0,0 +1,237 @@
+import asyncio
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+import os
+import struct
+from typing import Any, Dict, Generic, List, Self, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+
+def ipc_channel(batch_size: int = 1) -> Tuple['IpcReceiver[T]', 'IpcSender[T]']:
+    """
+    Creates a one way channel between two processes. Once
+    the sending end has been handed to the other process, the
+    process that created it should `close` its copy, otherwise
+    the receiver never sees the channel close.
+
+    Forked processes also inherit every other pipe open at the
+    time, so a channel only closes once those processes have
+    exited too. Anything that needs to know when to stop should
+    be sent an explicit message rather than wait for the close.
+    """
+    recv_conn, send_conn = Pipe(duplex=False)
+    return IpcReceiver([recv_conn]), IpcSender(send_conn, batch_size)
+
+class IpcSender(Generic[T]):
+    """
+    Messages are sent as lists of up to `batch_size` messages,
+    which cuts the number of writes (and wake ups on the other
+    end) for chatty senders like telemetry. Anything buffered
+    is only sent once the batch fills or on `flush`.
+
+    Sending never blocks the event loop, whatever the pipe
+    can't take yet is kept & written as the other end reads,
+    so a slow reader only holds up its own messages. Outside
+    of an event loop, and on `close`, writes block until the
+    whole message is written.
+    """
+
+    def __init__(self: Self, conn: Connection, batch_size: int = 1):
+        self._conn = conn
+        self._batch_size = batch_size
+        self._buffer: List[T] = []
+        self._unsent = bytearray()
+        self._writer: asyncio.AbstractEventLoop | None = None
+        self._error: OSError | None = None
+
+    def send(self: Self, message: T) -> None:
+        self._buffer.append(message)
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self: Self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._unsent += _frame(batch)
+        if not self._unsent or self._writer is not None:
+            # the writer sends this once the pipe has room
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_all()
+            return
+
+        os.set_blocking(self._conn.fileno(), False)
+        self._write_some()
+        if self._unsent:
+            loop.add_writer(self._conn.fileno(), self._on_writable)
+            self._writer = loop
+
+    def close(self: Self) -> None:
+        if self._conn.closed:
+            return
+        self._stop_writing()
+        try:
+            if self._error is None:
+                if self._buffer:
+                    batch, self._buffer = self._buffer, []
+                    self._unsent += _frame(batch)
+                self._write_all()
+        finally:
+            self._conn.close()
+
+    def _on_writable(self: Self) -> None:
+        try:
+            self._write_some()
+        except OSError as e:
+            # raised on the next send, same as a failed write
+            self._error = e
+            self._unsent.clear()
+        if not self._unsent:
+            self._stop_writing()
+
+    def _write_some(self: Self) -> None:
+        try:
+            written = os.write(self._conn.fileno(), self._unsent)
+        except BlockingIOError:
+            return
+        del self._unsent[:written]
+
+    def _write_all(self: Self) -> None:
+        os.set_blocking(self._conn.fileno(), True)
+        while self._unsent:
+            written = os.write(self._conn.fileno(), self._unsent)
+            del self._unsent[:written]
+
+    def _stop_writing(self: Self) -> None:
+        if self._writer is None:
+            return
+        self._writer.remove_writer(self._conn.fileno())
+        self._writer = None
+
+class IpcReceiver(Generic[T]):
+    """
+    Receives from one or more channels without polling, the
+    pipes are registered with the event loop which reads them
+    when there's something to read. `get` returns None once
+    every sender has closed.
+
+    Pipes are read without blocking, a message only partly
+    written is kept until the rest of it arrives.
+    """
+
+    def __init__(self: Self, conns: List[Connection]):
+        self._conns = conns
+        self._open: Set[Connection] = set()
+        self._partial: Dict[Connection, bytearray] = {}
+        self._queue: asyncio.Queue[T | None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def merge(self: Self, other: 'IpcReceiver[T]') -> None:
+        """
+        Receives the messages of another receiver along with
+        this one's, so a parent can listen to all its children
+        in one place. Must be done before the first `get`.
+        """
+        if self._queue is not None:
+            raise ValueError('cannot merge a receiver that has started')
+        self._conns.extend(other._conns)
+        other._conns = []
+
+    async def get(self: Self) -> T | None:
+        queue = self._attach()
+        if not self._open and queue.empty():
+            return None
+        return await queue.get()
+
+    def close(self: Self) -> None:
+        for conn in self._conns:
+            if conn in self._open:
+                self._detach(conn)
+            else:
+                conn.close()
+        if self._queue is not None:
+            self._queue.put_nowait(None)
+
+    def _attach(self: Self) -> asyncio.Queue[T | None]:
+        if self._queue is not None:
+            return self._queue
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        for conn in self._conns:
+            if conn.closed:
+                continue
+            os.set_blocking(conn.fileno(), False)
+            self._open.add(conn)
+            self._partial[conn] = bytearray()
+            self._loop.add_reader(conn.fileno(), self._on_readable, conn)
+        return self._queue
+
+    def _on_readable(self: Self, conn: Connection) -> None:
+        assert self._queue is not None
+        try:
+            data = os.read(conn.fileno(), _READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+
+        if not data:
+            self._detach(conn)
+            if not self._open:
+                self._queue.put_nowait(None)
+            return
+
+        partial = self._partial[conn]
+        partial += data
+        for batch in _unframe(partial):
+            for message in batch:
+                self._queue.put_nowait(message)
+
+    def _detach(self: Self, conn: Connection) -> None:
+        if conn not in self._open:
+            return
+        assert self._loop is not None
+        self._open.discard(conn)
+        self._partial.pop(conn, None)
+        self._loop.remove_reader(conn.fileno())
+        conn.close()
+
+_READ_SIZE = 2 ** 16
+
+# Framed the same way as `Connection.send_bytes`, a signed
+# 32 bit length, or -1 followed by a 64 bit length for larger
+# messages, so either end can still use the `Connection`.
+_MAX_SHORT = 0x7fffffff
+
+def _frame(message: Any) -> bytes:
+    payload = bytes(ForkingPickler.dumps(message))
+    if len(payload) > _MAX_SHORT:
+        return struct.pack('!iQ', -1, len(payload)) + payload
+    return struct.pack('!i', len(payload)) + payload
+
+def _unframe(buffer: bytearray) -> List[Any]:
+    """
+    Removes & returns the complete messages at the start of
+    the buffer, leaving any partial message after them.
+    """
+    messages = []
+    while len(buffer) >= 4:
+        (size,) = struct.unpack_from('!i', buffer)
+        start = 4
+        if size == -1:
+            if len(buffer) < 12:
+                break
+            (size,) = struct.unpack_from('!Q', buffer, 4)
+            start = 12
+        if len(buffer) < start + size:
+            break
+        messages.append(ForkingPickler.loads(buffer[start:start + size]))
+        del buffer[:start + size]
+    return messages
@@ -0,0 +1,82 @@
+import asyncio
+from multiprocessing import Process
+from unittest import IsolatedAsyncioTestCase
+
+from ..channel import IpcReceiver, IpcSender, ipc_channel
+
+def _echo(recv: IpcReceiver[int], send: IpcSender[int]) -> None:
+    async def main():
+        # the child inherits the parent's end of this channel
+        # when forked, so it won't see it close
+        while (message := await recv.get()) != 'close':
+            send.send(message * 2)
+        send.close()
+    asyncio.run(main())
+
+class IpcChannelTestCase(IsolatedAsyncioTestCase):
+    async def test_batches_are_flushed_on_close(self):
+        recv, send = ipc_channel(batch_size=4)
+        for i in range(6):
+            send.send(i)
+        send.close()
+
+        self.assertEqual([await recv.get() for _ in range(7)], [0, 1, 2, 3, 4, 5, None])
+
+    async def test_merged_receivers(self):
+        recv_a, send_a = ipc_channel()
+        recv_b, send_b = ipc_channel()
+        recv_a.merge(recv_b)
+
+        send_a.send('a')
+        send_b.send('b')
+        send_a.close()
+        send_b.close()
+
+        self.assertEqual({await recv_a.get(), await recv_a.get()}, {'a', 'b'})
+        self.assertIsNone(await recv_a.get())
+
+    async def test_child_process(self):
+        child_recv, send = ipc_channel()
+        recv, child_send = ipc_channel(batch_size=3)
+        process = Process(target=_echo, args=(child_recv, child_send))
+        process.start()
+        child_recv.close()
+        child_send.close()
+
+        for i in range(5):
+            send.send(i)
+        send.send('close')
+        send.close()
+
+        received = []
+        while (message := await asyncio.wait_for(recv.get(), timeout=5)) is not None:
+            received.append(message)
+        await asyncio.to_thread(process.join)
+
+        self.assertEqual(received, [0, 2, 4, 6, 8])
+        self.assertEqual(process.exitcode, 0)
+
+    async def test_send_does_not_block_on_a_full_pipe(self):
+        recv, send = ipc_channel()
+        messages = [str(i) * 2 ** 12 for i in range(256)]
+
+        # far more than the pipe holds, with nothing reading it
+        # yet, so a blocking send would never return
+        for message in messages:
+            send.send(message)
+
+        received = [await asyncio.wait_for(recv.get(), timeout=5) for _ in messages]
+        send.close()
+
+        self.assertEqual(received, messages)
+        self.assertIsNone(await recv.get())
+
+    async def test_large_message(self):
+        recv, send = ipc_channel()
+        message = list(range(2 ** 18))
+        send.send(message)
+        send.send('after')
+
+        self.assertEqual(await asyncio.wait_for(recv.get(), timeout=5), message)
+        self.assertEqual(await recv.get(), 'after')
+        send.close()